@@ -4,10 +4,11 @@ from agents.editor import EditorAgent
 from agents.fact_checker import FactCheckerAgent
 from agents.citation_validator import CitationValidatorAgent
 from config.models import ModelFactory
+from config.speed_settings import ENABLE_HEDGING, HEDGE_FALLBACKS, ENABLE_CASCADE, CASCADE_ROLES
 
 class AgentFactory:
     @staticmethod
-    def create_agents(model_distribution=None):
+    def create_agents(model_distribution=None, temperature=None, cascade=ENABLE_CASCADE):
         if model_distribution is None:
             model_distribution = {
                 "researcher": "gemini",
@@ -17,10 +18,22 @@ class AgentFactory:
                 "citation_validator": "gemini"
             }
         
-        return {
-            "researcher": ResearcherAgent(ModelFactory.get_model(model_distribution["researcher"])),
-            "reviewer": ReviewerAgent(ModelFactory.get_model(model_distribution["reviewer"])),
-            "editor": EditorAgent(ModelFactory.get_model(model_distribution["editor"])),
-            "fact_checker": FactCheckerAgent(ModelFactory.get_model(model_distribution["fact_checker"])),
-            "citation_validator": CitationValidatorAgent(ModelFactory.get_model(model_distribution["citation_validator"]))
+        agents = {
+            "researcher": ResearcherAgent(ModelFactory.get_model(model_distribution["researcher"], temperature)),
+            "reviewer": ReviewerAgent(ModelFactory.get_model(model_distribution["reviewer"], temperature)),
+            "editor": EditorAgent(ModelFactory.get_model(model_distribution["editor"], temperature)),
+            "fact_checker": FactCheckerAgent(ModelFactory.get_model(model_distribution["fact_checker"], temperature)),
+            "citation_validator": CitationValidatorAgent(ModelFactory.get_model(model_distribution["citation_validator"], temperature))
         }
+        
+        if ENABLE_HEDGING:
+            for role, agent in agents.items():
+                fallback_type = HEDGE_FALLBACKS.get(model_distribution[role])
+                if fallback_type and ModelFactory.is_configured(fallback_type):
+                    agent.fallback_model = ModelFactory.get_model(fallback_type, temperature)
+        
+        if cascade:
+            for role in CASCADE_ROLES:
+                agents[role].cascade_model = ModelFactory.get_fast_model(model_distribution[role], temperature)
+        
+        return agents
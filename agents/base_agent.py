@@ -1,51 +1,368 @@
-from typing import Dict, List, Generator
-from langchain_core.messages import HumanMessage, SystemMessage
+import contextvars
+import time
+from typing import AsyncGenerator, Dict, List, Generator, Optional
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from agents.response_cache import get_response_cache
+from agents.hedging import hedged_invoke, ahedged_invoke, deadline_stream, adeadline_stream
+from agents.memory import AgentMemory
+from agents.cascade import accepts, cascade_stats
+from agents.structured import JsonExtractor, json_mode_rejected, failed_generation
+from config.speed_settings import AGENT_TIMEOUT, CASCADE_TIMEOUT, ENABLE_STRUCTURED_OUTPUT
+from workflow.metrics import record_llm_call
+
+def _token_usage(message) -> tuple:
+    """(prompt_tokens, completion_tokens) from a response or chunk, 0 if unreported"""
+    usage = getattr(message, "usage_metadata", None) or {}
+    if usage:
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    token_usage = (getattr(message, "response_metadata", None) or {}).get("token_usage", {})
+    return token_usage.get("prompt_tokens", 0), token_usage.get("completion_tokens", 0)
+
+# Receives (agent name, chunk) for every chunk while a caller is watching tokens
+_token_listener = contextvars.ContextVar("token_listener", default=None)
+
+def set_token_listener(listener):
+    """Stream agent calls in this context to listener; returns a token for reset_token_listener"""
+    return _token_listener.set(listener)
+
+def reset_token_listener(token):
+    _token_listener.reset(token)
+
+# Agent name -> AgentMemory of the session using shared agents in this context
+_session_memories = contextvars.ContextVar("session_memories", default=None)
+
+def set_session_memories(memories: Dict):
+    """Record agent calls in this context to memories instead of the agents' own; returns a reset token"""
+    return _session_memories.set(memories)
+
+def reset_session_memories(token):
+    _session_memories.reset(token)
 
 class BaseAgent:
-    def __init__(self, name: str, role: str, model, system_prompt: str):
+    def __init__(self, name: str, role: str, model, system_prompt: str, cache=None,
+                 fallback_model=None, timeout: float = AGENT_TIMEOUT, confidence_key: str = None,
+                 output_schema: Dict = None):
         self.name = name
         self.role = role
         self.model = model
+        self.fallback_model = fallback_model  # other provider raced by hedged requests
+        self.cascade_model = None  # fast model tried first; the reply's confidence_key decides escalation
+        self.cascade_timeout = CASCADE_TIMEOUT  # seconds the fast model gets before the full model answers
+        self.confidence_key = confidence_key
+        self.output_schema = output_schema  # JSON schema of the reply; see agents.structured
+        self._json_models = {}  # id(model) -> (model, JSON-mode binding)
+        self.timeout = timeout  # seconds before invoke raises TimeoutError
         self.system_prompt = system_prompt
-        self.memory: List[Dict] = []
+        self.cache = cache if cache is not None else get_response_cache()
+        self.memory = AgentMemory()  # bounded; older calls spill to disk; see set_session_memories
     
-    def invoke(self, input_text: str, context: Dict = None) -> str:
-        messages = [
+    def _build_messages(self, input_text: str) -> List:
+        return [
             SystemMessage(content=self.system_prompt),
             HumanMessage(content=input_text)
         ]
-        response = self.model.invoke(messages)
-        
-        self.memory.append({
+    
+    def _cache_lookup(self, input_text: str, model=None):
+        if not self.cache:
+            return None, None
+        key = self.cache.make_key(self._structured(model or self.model), self.system_prompt, input_text)
+        return key, self.cache.get(key)
+    
+    def _structured(self, model):
+        """model in JSON mode when this agent has an output schema"""
+        if model is None or self.output_schema is None or not ENABLE_STRUCTURED_OUTPUT:
+            return model
+        entry = self._json_models.get(id(model))
+        if entry is None or entry[0] is not model:
+            from config.models import ModelFactory
+            entry = (model, ModelFactory.json_mode(model, self.output_schema))
+            self._json_models[id(model)] = entry
+        return entry[1]
+    
+    def _memory(self) -> AgentMemory:
+        memories = _session_memories.get()
+        if memories is None:
+            return self.memory
+        return memories.get(self.name) or memories.setdefault(self.name, AgentMemory())
+    
+    def _remember(self, input_text: str, output: str, context: Dict):
+        self._memory().append({
             "input": input_text,
-            "output": response.content,
+            "output": output,
             "context": context
         })
-        
-        return response.content
     
-    def stream(self, input_text: str, context: Dict = None) -> Generator[str, None, None]:
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=input_text)
-        ]
+    def _hedged(self, model, fallback_model, messages: List, timeout: float):
+        """hedged_invoke, in JSON mode when the agent has a schema.
         
-        full_response = ""
-        for chunk in self.model.stream(messages):
+        A JSON-mode call the provider refuses comes back as the reply it
+        rejected, for the tolerant parser to repair, or else is asked again
+        as free text.
+        """
+        structured = self._structured(model)
+        try:
+            return hedged_invoke(self.name, structured, messages, timeout, self._structured(fallback_model))
+        except Exception as e:
+            if structured is model or not json_mode_rejected(e):
+                raise
+            rejected = failed_generation(e)
+            if rejected:
+                return AIMessage(content=rejected)
+            return hedged_invoke(self.name, model, messages, timeout, fallback_model)
+    
+    async def _ahedged(self, model, fallback_model, messages: List, timeout: float):
+        structured = self._structured(model)
+        try:
+            return await ahedged_invoke(self.name, structured, messages, timeout,
+                                        self._structured(fallback_model))
+        except Exception as e:
+            if structured is model or not json_mode_rejected(e):
+                raise
+            rejected = failed_generation(e)
+            if rejected:
+                return AIMessage(content=rejected)
+            return await ahedged_invoke(self.name, model, messages, timeout, fallback_model)
+    
+    def _call(self, model, fallback_model, input_text: str, timeout: float = None) -> str:
+        key, cached = self._cache_lookup(input_text, model)
+        if cached is not None:
+            record_llm_call(0.0, cached=True)
+            return "".join(cached)
+        start_time = time.time()
+        response = self._hedged(model, fallback_model, self._build_messages(input_text), timeout or self.timeout)
+        content = response.content
+        latency = time.time() - start_time
+        prompt_tokens, completion_tokens = _token_usage(response)
+        record_llm_call(latency, prompt_tokens, completion_tokens)
+        if self.cache:
+            self.cache.put(key, [content], latency, prompt_tokens + completion_tokens)
+        return content
+    
+    async def _acall(self, model, fallback_model, input_text: str, timeout: float = None) -> str:
+        key, cached = self._cache_lookup(input_text, model)
+        if cached is not None:
+            record_llm_call(0.0, cached=True)
+            return "".join(cached)
+        start_time = time.time()
+        response = await self._ahedged(model, fallback_model, self._build_messages(input_text),
+                                       timeout or self.timeout)
+        content = response.content
+        latency = time.time() - start_time
+        prompt_tokens, completion_tokens = _token_usage(response)
+        record_llm_call(latency, prompt_tokens, completion_tokens)
+        if self.cache:
+            self.cache.put(key, [content], latency, prompt_tokens + completion_tokens)
+        return content
+    
+    def _read_stream(self, stream, chunks: List, usage: List) -> Generator[str, None, None]:
+        """Yield a model stream's text, collecting it in chunks and its token usage in usage"""
+        # Stop reading once the reply's JSON object closes; anything after it is discarded anyway
+        extractor = JsonExtractor() if self.output_schema is not None else None
+        for chunk in stream:
             if hasattr(chunk, 'content'):
-                full_response += chunk.content
+                chunks.append(chunk.content)
+                chunk_prompt, chunk_completion = _token_usage(chunk)
+                usage[0] += chunk_prompt
+                usage[1] += chunk_completion
                 yield chunk.content
+                if extractor is not None and extractor.feed(chunk.content):
+                    stream.close()
+                    break
+    
+    async def _aread_stream(self, stream, chunks: List, usage: List) -> AsyncGenerator[str, None]:
+        extractor = JsonExtractor() if self.output_schema is not None else None
+        async for chunk in stream:
+            if hasattr(chunk, 'content'):
+                chunks.append(chunk.content)
+                chunk_prompt, chunk_completion = _token_usage(chunk)
+                usage[0] += chunk_prompt
+                usage[1] += chunk_completion
+                yield chunk.content
+                if extractor is not None and extractor.feed(chunk.content):
+                    await stream.aclose()
+                    break
+    
+    def _stream_call(self, model, input_text: str, timeout: float = None) -> Generator[str, None, None]:
+        key, cached = self._cache_lookup(input_text, model)
+        if cached is not None:
+            record_llm_call(0.0, cached=True)
+            yield from cached
+            return
+        start_time = time.time()
+        chunks = []
+        usage = [0, 0]  # prompt, completion tokens
+        timeout = timeout or self.timeout
+        messages = self._build_messages(input_text)
+        structured = self._structured(model)
+        try:
+            yield from self._read_stream(deadline_stream(self.name, structured, messages, timeout),
+                                         chunks, usage)
+        except Exception as e:
+            if structured is model or not json_mode_rejected(e):
+                raise
+            # A reply refused after it streamed is kept for the tolerant parser; with none, ask again
+            if not chunks:
+                rejected = failed_generation(e)
+                if rejected:
+                    chunks.append(rejected)
+                    yield rejected
+                else:
+                    yield from self._read_stream(deadline_stream(self.name, model, messages, timeout),
+                                                 chunks, usage)
+        prompt_tokens, completion_tokens = usage
+        # Usage arrives with the last chunk; a stream cut short is counted by chunks
+        completion_tokens = completion_tokens or len(chunks)
+        latency = time.time() - start_time
+        record_llm_call(latency, prompt_tokens, completion_tokens)
+        if self.cache:
+            self.cache.put(key, chunks, latency, prompt_tokens + completion_tokens)
+    
+    async def _astream_call(self, model, input_text: str, timeout: float = None) -> AsyncGenerator[str, None]:
+        key, cached = self._cache_lookup(input_text, model)
+        if cached is not None:
+            record_llm_call(0.0, cached=True)
+            for chunk in cached:
+                yield chunk
+            return
+        start_time = time.time()
+        chunks = []
+        usage = [0, 0]
+        timeout = timeout or self.timeout
+        messages = self._build_messages(input_text)
+        structured = self._structured(model)
+        try:
+            async for chunk in self._aread_stream(adeadline_stream(self.name, structured, messages, timeout),
+                                                  chunks, usage):
+                yield chunk
+        except Exception as e:
+            if structured is model or not json_mode_rejected(e):
+                raise
+            if not chunks:
+                rejected = failed_generation(e)
+                if rejected:
+                    chunks.append(rejected)
+                    yield rejected
+                else:
+                    async for chunk in self._aread_stream(adeadline_stream(self.name, model, messages, timeout),
+                                                          chunks, usage):
+                        yield chunk
+        prompt_tokens, completion_tokens = usage
+        completion_tokens = completion_tokens or len(chunks)
+        latency = time.time() - start_time
+        record_llm_call(latency, prompt_tokens, completion_tokens)
+        if self.cache:
+            self.cache.put(key, chunks, latency, prompt_tokens + completion_tokens)
+    
+    def _accepts(self, output: Optional[str], latency: float) -> bool:
+        """Record a fast-model attempt (output None if it failed); False when the full model has to answer"""
+        accepted = output is not None and accepts(output, self.confidence_key)
+        cascade_stats.record_attempt(self.name, latency, escalated=not accepted, failed=output is None)
+        return accepted
+    
+    def invoke(self, input_text: str, context: Dict = None) -> str:
+        listener = _token_listener.get()
+        if listener is not None:
+            chunks = []
+            for chunk in self.stream(input_text, context):
+                listener(self.name, chunk)
+                chunks.append(chunk)
+            return "".join(chunks)
         
-        self.memory.append({
-            "input": input_text,
-            "output": full_response,
-            "context": context
-        })
+        content = None
+        if self.cascade_model is not None:
+            start_time = time.time()
+            try:
+                content = self._call(self.cascade_model, None, input_text, self.cascade_timeout)
+            except Exception:
+                content = None  # a fast-model timeout or provider error escalates like an unsure reply
+            if not self._accepts(content, time.time() - start_time):
+                content = None
+        if content is None:
+            start_time = time.time()
+            content = self._call(self.model, self.fallback_model, input_text)
+            if self.cascade_model is not None:
+                cascade_stats.record_escalation(self.name, time.time() - start_time)
+        
+        self._remember(input_text, content, context)
+        return content
+    
+    async def ainvoke(self, input_text: str, context: Dict = None) -> str:
+        listener = _token_listener.get()
+        if listener is not None:
+            chunks = []
+            async for chunk in self.astream(input_text, context):
+                listener(self.name, chunk)
+                chunks.append(chunk)
+            return "".join(chunks)
+        
+        content = None
+        if self.cascade_model is not None:
+            start_time = time.time()
+            try:
+                content = await self._acall(self.cascade_model, None, input_text, self.cascade_timeout)
+            except Exception:
+                content = None
+            if not self._accepts(content, time.time() - start_time):
+                content = None
+        if content is None:
+            start_time = time.time()
+            content = await self._acall(self.model, self.fallback_model, input_text)
+            if self.cascade_model is not None:
+                cascade_stats.record_escalation(self.name, time.time() - start_time)
         
+        self._remember(input_text, content, context)
+        return content
+    
+    def stream(self, input_text: str, context: Dict = None) -> Generator[str, None, None]:
+        chunks = []
+        if self.cascade_model is not None:
+            # The fast reply is held back until it is accepted, so an escalation never shows twice
+            start_time = time.time()
+            try:
+                attempt = list(self._stream_call(self.cascade_model, input_text, self.cascade_timeout))
+            except Exception:
+                attempt = None
+            if self._accepts(None if attempt is None else "".join(attempt), time.time() - start_time):
+                chunks = attempt
+                yield from attempt
+        if not chunks:
+            start_time = time.time()
+            for chunk in self._stream_call(self.model, input_text):
+                chunks.append(chunk)
+                yield chunk
+            if self.cascade_model is not None:
+                cascade_stats.record_escalation(self.name, time.time() - start_time)
+        
+        full_response = "".join(chunks)
+        self._remember(input_text, full_response, context)
         return full_response
     
-    def get_memory(self) -> List[Dict]:
-        return self.memory
+    async def astream(self, input_text: str, context: Dict = None) -> AsyncGenerator[str, None]:
+        chunks = []
+        if self.cascade_model is not None:
+            start_time = time.time()
+            try:
+                attempt = [chunk async for chunk in self._astream_call(self.cascade_model, input_text,
+                                                                       self.cascade_timeout)]
+            except Exception:
+                attempt = None
+            if self._accepts(None if attempt is None else "".join(attempt), time.time() - start_time):
+                chunks = attempt
+                for chunk in attempt:
+                    yield chunk
+        if not chunks:
+            start_time = time.time()
+            async for chunk in self._astream_call(self.model, input_text):
+                chunks.append(chunk)
+                yield chunk
+            if self.cascade_model is not None:
+                cascade_stats.record_escalation(self.name, time.time() - start_time)
+        
+        self._remember(input_text, "".join(chunks), context)
+    
+    def get_memory(self) -> AgentMemory:
+        """Call history, oldest first; len() is free and iterating reads spilled calls back lazily"""
+        return self._memory()
     
     def clear_memory(self):
-        self.memory = []
+        self._memory().clear()
@@ -0,0 +1,81 @@
+import re
+import threading
+from typing import Dict, Optional
+
+from agents.structured import extract_json
+from config.speed_settings import CASCADE_MIN_CONFIDENCE
+
+def parse_confidence(output: str, key: str) -> Optional[float]:
+    """The 0-1 value of key in an agent's JSON reply, or None if it can't be read"""
+    value = (extract_json(output) or {}).get(key)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value) if 0 <= value <= 1 else None
+    # Prose replies such as "Score: 0.8"
+    match = re.search(rf"\b{re.escape(key)}\b[\"']?\s*[:=]\s*([01](?:\.\d+)?|\.\d+)", output, re.IGNORECASE)
+    return float(match.group(1)) if match else None
+
+def accepts(output: str, key: str, min_confidence: float = CASCADE_MIN_CONFIDENCE) -> bool:
+    """Whether a fast-model reply is good enough to skip the full model"""
+    confidence = parse_confidence(output, key)
+    return confidence is not None and confidence >= min_confidence
+
+class CascadeStats:
+    """Per-agent counts of fast-model answers and escalations to the full model"""
+    
+    def __init__(self):
+        self._agents: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+    
+    def _agent(self, name: str) -> Dict:
+        return self._agents.setdefault(name, {
+            "attempts": 0, "escalations": 0, "failures": 0, "fast_latency": 0.0, "full_latency": 0.0
+        })
+    
+    def record_attempt(self, name: str, latency: float, escalated: bool, failed: bool = False):
+        """failed: the fast model raised (timeout, rate limit, provider error) and the call escalated"""
+        with self._lock:
+            agent = self._agent(name)
+            agent["attempts"] += 1
+            agent["escalations"] += escalated
+            agent["failures"] += failed
+            agent["fast_latency"] += latency
+    
+    def record_escalation(self, name: str, latency: float):
+        with self._lock:
+            self._agent(name)["full_latency"] += latency
+    
+    def get_stats(self) -> Dict:
+        """Escalation rate and latency saved, overall and per agent.
+        
+        Latency saved compares the answers the fast model kept against the
+        full model's mean latency on escalated calls, minus the time spent
+        on fast attempts that were escalated anyway.
+        """
+        with self._lock:
+            agents = {name: dict(agent) for name, agent in self._agents.items()}
+        for agent in agents.values():
+            accepted = agent["attempts"] - agent["escalations"]
+            full_mean = agent["full_latency"] / agent["escalations"] if agent["escalations"] else None
+            agent["escalation_rate"] = round(agent["escalations"] / agent["attempts"], 3) if agent["attempts"] else 0.0
+            agent["latency_saved"] = round(accepted * full_mean - agent["fast_latency"], 3) if full_mean else 0.0
+            agent["fast_latency"] = round(agent["fast_latency"], 3)
+            agent["full_latency"] = round(agent["full_latency"], 3)
+        attempts = sum(agent["attempts"] for agent in agents.values())
+        escalations = sum(agent["escalations"] for agent in agents.values())
+        return {
+            "attempts": attempts,
+            "escalations": escalations,
+            "escalation_rate": round(escalations / attempts, 3) if attempts else 0.0,
+            "failures": sum(agent["failures"] for agent in agents.values()),
+            "latency_saved": round(sum(agent["latency_saved"] for agent in agents.values()), 3),
+            "agents": agents
+        }
+    
+    def clear(self):
+        with self._lock:
+            self._agents.clear()
+
+cascade_stats = CascadeStats()
+
+def get_cascade_stats() -> Dict:
+    return cascade_stats.get_stats()
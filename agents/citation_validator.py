@@ -1,6 +1,9 @@
 from agents.base_agent import BaseAgent
+from agents.structured import object_schema
 
 class CitationValidatorAgent(BaseAgent):
+    OUTPUT_SCHEMA = object_schema(scores=("score",), lists=("missing_citations", "invalid_formats"))
+    
     def __init__(self, model):
         system_prompt = """You are a Citation Validator Agent in an AI research lab.
 Your role: Ensure proper citation and source attribution.
@@ -9,4 +12,5 @@ Your role: Ensure proper citation and source attribution.
 - Check source relevance
 - Track provenance
 Output format: JSON with {missing_citations: [], invalid_formats: [], score: 0-1}"""
-        super().__init__("CitationValidator", "Source Validation", model, system_prompt)
+        super().__init__("CitationValidator", "Source Validation", model, system_prompt, confidence_key="score",
+                         output_schema=self.OUTPUT_SCHEMA)
@@ -1,6 +1,9 @@
 from agents.base_agent import BaseAgent
+from agents.structured import object_schema
 
 class FactCheckerAgent(BaseAgent):
+    OUTPUT_SCHEMA = object_schema(scores=("confidence",), lists=("verified", "flagged"))
+    
     def __init__(self, model):
         system_prompt = """You are a Fact-Checker Agent in an AI research lab.
 Your role: Verify factual accuracy and identify unsupported claims.
@@ -9,4 +12,5 @@ Your role: Verify factual accuracy and identify unsupported claims.
 - Assess evidence quality
 - Detect potential biases
 Output format: JSON with {verified: [], flagged: [], confidence: 0-1}"""
-        super().__init__("FactChecker", "Verification", model, system_prompt)
+        super().__init__("FactChecker", "Verification", model, system_prompt, confidence_key="confidence",
+                         output_schema=self.OUTPUT_SCHEMA)
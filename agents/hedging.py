@@ -0,0 +1,244 @@
+import asyncio
+import contextvars
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Optional
+
+from config.speed_settings import (
+    HEDGE_PERCENTILE, HEDGE_MIN_SAMPLES, HEDGE_WINDOW, HEDGE_MAX_WORKERS
+)
+
+class LatencyTracker:
+    """Recent successful call latencies per model, used to pick the hedge delay"""
+    
+    def __init__(self, window: int = HEDGE_WINDOW, min_samples: int = HEDGE_MIN_SAMPLES):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, key: str, latency: float):
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(latency)
+    
+    def percentile(self, key: str, p: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(int(p * len(samples)), len(samples) - 1)]
+
+latency_tracker = LatencyTracker()
+_stats = {"calls": 0, "hedges_fired": 0, "hedges_won": 0, "timeouts": 0, "abandoned": 0}
+_stats_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_WORKERS, thread_name_prefix="agent-call")
+
+def _count(name: str):
+    with _stats_lock:
+        _stats[name] += 1
+
+def get_hedge_stats() -> Dict:
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["hedge_rate"] = round(stats["hedges_fired"] / stats["calls"], 3) if stats["calls"] else 0.0
+    stats["win_rate"] = round(stats["hedges_won"] / stats["hedges_fired"], 3) if stats["hedges_fired"] else 0.0
+    return stats
+
+def model_key(model) -> str:
+    return f"{type(model).__name__}:{getattr(model, 'model', None) or getattr(model, 'model_name', None)}"
+
+def _hedge_delay(primary, fallback, timeout: Optional[float]) -> Optional[float]:
+    if fallback is None:
+        return None
+    delay = latency_tracker.percentile(model_key(primary), HEDGE_PERCENTILE)
+    if delay is None or (timeout and delay >= timeout):
+        return None
+    return delay
+
+def _timed_submit(model, messages, started: threading.Event = None):
+    """Run model.invoke on the pool in the caller's context; started is set when a worker picks it up"""
+    start_time = []
+    
+    def timed():
+        start_time.append(time.time())
+        if started is not None:
+            started.set()
+        return model.invoke(messages)
+    
+    future = _executor.submit(contextvars.copy_context().run, timed)
+    
+    def on_done(f):
+        # Late answers still count, so a lost race doesn't bias the percentile low
+        if not f.cancelled() and f.exception() is None:
+            latency_tracker.record(model_key(model), time.time() - start_time[0])
+    
+    future.add_done_callback(on_done)
+    return future
+
+def _abandon(futures):
+    """Drop calls nobody waits for: queued ones are cancelled, running ones end at the client's request timeout"""
+    for future in futures:
+        if not future.cancel() and not future.done():
+            _count("abandoned")
+
+def hedged_invoke(name: str, primary, messages, timeout: Optional[float] = None, fallback=None):
+    """Invoke primary within timeout seconds, racing fallback if primary is unusually slow.
+    
+    The hedge fires once primary has run longer than HEDGE_PERCENTILE of its
+    recent latencies; whichever model answers first wins. Raises TimeoutError
+    when neither answers before the deadline. Time spent queued for a pool
+    thread doesn't count against the hedge delay or the deadline. Threads
+    can't be interrupted, so a call given up on keeps its thread until the
+    provider client's MODEL_REQUEST_TIMEOUT ends it.
+    """
+    _count("calls")
+    if not timeout and fallback is None:
+        start_time = time.time()
+        response = primary.invoke(messages)
+        latency_tracker.record(model_key(primary), time.time() - start_time)
+        return response
+    
+    started = threading.Event()
+    futures = {_timed_submit(primary, messages, started): primary}
+    started.wait()
+    deadline = time.time() + timeout if timeout else None
+    delay = _hedge_delay(primary, fallback, timeout)
+    if delay is not None:
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            _count("hedges_fired")
+            futures[_timed_submit(fallback, messages)] = fallback
+    
+    pending = set(futures)
+    error = None
+    try:
+        while pending:
+            remaining = deadline - time.time() if deadline else None
+            if remaining is not None and remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if futures[future] is not primary:
+                        _count("hedges_won")
+                    return future.result()
+                error = future.exception()
+    finally:
+        _abandon(pending)
+    
+    if error is not None and not pending:
+        raise error
+    _count("timeouts")
+    raise TimeoutError(f"{name} did not answer within {timeout}s")
+
+async def ahedged_invoke(name: str, primary, messages, timeout: Optional[float] = None, fallback=None):
+    """Async counterpart of hedged_invoke; the losing request is cancelled"""
+    _count("calls")
+    
+    async def timed(model):
+        start_time = time.time()
+        response = await model.ainvoke(messages)
+        latency_tracker.record(model_key(model), time.time() - start_time)
+        return response
+    
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout if timeout else None
+    tasks = {asyncio.ensure_future(timed(primary)): primary}
+    delay = _hedge_delay(primary, fallback, timeout)
+    if delay is not None:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            _count("hedges_fired")
+            tasks[asyncio.ensure_future(timed(fallback))] = fallback
+    
+    pending = set(tasks)
+    error = None
+    try:
+        while pending:
+            remaining = deadline - loop.time() if deadline else None
+            if remaining is not None and remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if tasks[task] is not primary:
+                        _count("hedges_won")
+                    return task.result()
+                error = task.exception()
+    finally:
+        for task in pending:
+            task.cancel()
+    
+    if error is not None and not pending:
+        raise error
+    _count("timeouts")
+    raise TimeoutError(f"{name} did not answer within {timeout}s")
+
+def deadline_stream(name: str, model, messages, timeout: Optional[float] = None):
+    """Yield model's streamed chunks, raising TimeoutError once timeout seconds pass without the reply finishing.
+    
+    Streams are not hedged: chunks may already be on screen when the
+    primary turns out slow. The model is read on its own thread so a stalled
+    stream can't hold the caller past the deadline.
+    """
+    _count("calls")
+    if not timeout:
+        yield from model.stream(messages)
+        return
+    
+    chunks = queue.Queue()
+    stop = threading.Event()
+    
+    def produce():
+        try:
+            for chunk in model.stream(messages):
+                if stop.is_set():
+                    return
+                chunks.put(("chunk", chunk))
+            chunks.put(("done", None))
+        except Exception as e:
+            chunks.put(("error", e))
+    
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(produce,), name="agent-stream", daemon=True).start()
+    deadline = time.time() + timeout
+    try:
+        while True:
+            try:
+                # Chunks that arrived before the deadline are still delivered
+                kind, item = chunks.get(timeout=max(deadline - time.time(), 0))
+            except queue.Empty:
+                _count("timeouts")
+                raise TimeoutError(f"{name} did not finish streaming within {timeout}s")
+            if kind == "done":
+                return
+            if kind == "error":
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+async def adeadline_stream(name: str, model, messages, timeout: Optional[float] = None):
+    """Async counterpart of deadline_stream; the model's stream is cancelled at the deadline"""
+    _count("calls")
+    stream = model.astream(messages)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout if timeout else None
+    try:
+        while True:
+            remaining = deadline - loop.time() if deadline else None
+            try:
+                if remaining is not None and remaining <= 0:
+                    raise asyncio.TimeoutError
+                chunk = await asyncio.wait_for(stream.__anext__(), remaining)
+            except StopAsyncIteration:
+                return
+            except asyncio.TimeoutError:
+                _count("timeouts")
+                raise TimeoutError(f"{name} did not finish streaming within {timeout}s") from None
+            yield chunk
+    finally:
+        await stream.aclose()
@@ -0,0 +1,98 @@
+import json
+import os
+import tempfile
+import threading
+import weakref
+from collections import deque
+from typing import Dict, Iterator, List
+
+from config.speed_settings import MEMORY_MAX_ENTRIES, MEMORY_MAX_BYTES, MEMORY_SPILL_DIR
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+class AgentMemory:
+    """Agent call history: recent entries in RAM, older ones spilled to a JSONL log.
+    
+    The in-memory ring holds at most max_entries entries and max_bytes of
+    serialized data; whatever falls out is appended to a per-agent file that
+    is only read back when the full history is requested. The file is
+    deleted on clear() or when the memory is garbage collected.
+    """
+    
+    def __init__(self, max_entries: int = MEMORY_MAX_ENTRIES, max_bytes: int = MEMORY_MAX_BYTES,
+                 spill_dir: str = MEMORY_SPILL_DIR):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self._recent = deque()  # (entry, serialized line)
+        self._bytes = 0
+        self._spilled = 0
+        self._path = None
+        self._finalizer = None
+        self._lock = threading.Lock()
+    
+    def append(self, entry: Dict):
+        line = json.dumps(entry, separators=(",", ":"), default=str)
+        with self._lock:
+            self._recent.append((entry, line))
+            self._bytes += len(line)
+            overflow = []
+            while len(self._recent) > 1 and (
+                len(self._recent) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, old_line = self._recent.popleft()
+                self._bytes -= len(old_line)
+                overflow.append(old_line)
+            if overflow:
+                self._spill(overflow)
+    
+    def _spill(self, lines: List[str]):
+        if self._path is None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            fd, self._path = tempfile.mkstemp(prefix="memory-", suffix=".jsonl", dir=self.spill_dir)
+            os.close(fd)
+            self._finalizer = weakref.finalize(self, _remove, self._path)
+        with open(self._path, "a", encoding="utf-8") as log:
+            log.write("\n".join(lines) + "\n")
+        self._spilled += len(lines)
+    
+    def __len__(self) -> int:
+        return self._spilled + len(self._recent)
+    
+    def __iter__(self) -> Iterator[Dict]:
+        """Oldest first; spilled entries are read from disk on demand"""
+        with self._lock:
+            path, spilled = self._path, self._spilled
+            recent = [entry for entry, _ in self._recent]
+        if path and spilled:
+            with open(path, encoding="utf-8") as log:
+                for _, line in zip(range(spilled), log):
+                    yield json.loads(line)
+        yield from recent
+    
+    def recent(self) -> List[Dict]:
+        with self._lock:
+            return [entry for entry, _ in self._recent]
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": self._spilled + len(self._recent),
+                "in_memory": len(self._recent),
+                "in_memory_bytes": self._bytes,
+                "spilled": self._spilled
+            }
+    
+    def clear(self):
+        with self._lock:
+            self._recent.clear()
+            self._bytes = 0
+            self._spilled = 0
+            if self._finalizer is not None:
+                self._finalizer()
+            self._path = None
+            self._finalizer = None
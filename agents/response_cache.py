@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from config.speed_settings import (
+    ENABLE_RESPONSE_CACHE, RESPONSE_CACHE_PATH, RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL
+)
+
+class ResponseCache:
+    """On-disk LLM response cache with LRU, TTL and size-cap eviction.
+    
+    Responses are stored as the list of chunks the model produced, so a
+    streamed hit can be replayed chunk by chunk.
+    """
+    
+    def __init__(self, path: str = RESPONSE_CACHE_PATH, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+                 max_bytes: int = RESPONSE_CACHE_MAX_BYTES, ttl: float = RESPONSE_CACHE_TTL):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "tokens_saved": 0, "latency_saved": 0.0}
+        
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                chunks TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL,
+                latency REAL NOT NULL,
+                tokens INTEGER NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed)")
+    
+    @staticmethod
+    def make_key(model, system_prompt: str, user_prompt: str) -> str:
+        # A model.bind(...) binding (JSON mode, max_tokens) answers differently from the bare model
+        bound_kwargs = getattr(model, "kwargs", None) if hasattr(model, "bound") else None
+        model = getattr(model, "bound", model)
+        model_name = getattr(model, "model", None) or getattr(model, "model_name", None)
+        payload = json.dumps([
+            type(model).__name__,
+            str(model_name),
+            getattr(model, "temperature", None),
+            bound_kwargs,
+            system_prompt,
+            user_prompt
+        ], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[List[str]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT chunks, created, latency, tokens FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            
+            chunks, created, latency, tokens = row
+            if self.ttl and now - created > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.stats["misses"] += 1
+                return None
+            
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.stats["hits"] += 1
+            self.stats["tokens_saved"] += tokens
+            self.stats["latency_saved"] += latency
+        return json.loads(chunks)
+    
+    def put(self, key: str, chunks: List[str], latency: float = 0.0, tokens: int = 0):
+        payload = json.dumps(chunks)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now, latency, tokens)
+            )
+            self._evict(now)
+    
+    def _evict(self, now: float):
+        if self.ttl:
+            self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+        
+        # Least recently used entries beyond the entry cap
+        self._conn.execute(
+            """DELETE FROM responses WHERE key IN (
+                SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?
+            )""",
+            (self.max_entries,)
+        )
+        
+        # Least recently used entries beyond the byte cap
+        self._conn.execute(
+            """DELETE FROM responses WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(size) OVER (ORDER BY accessed DESC) AS running
+                    FROM responses
+                ) WHERE running > ?
+            )""",
+            (self.max_bytes,)
+        )
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["latency_saved"] = round(stats["latency_saved"], 3)
+        stats["entries"] = entries
+        stats["bytes"] = size
+        return stats
+    
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self.stats = {"hits": 0, "misses": 0, "tokens_saved": 0, "latency_saved": 0.0}
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide cache shared by all agents, or None when caching is disabled"""
+    global _default_cache
+    if not ENABLE_RESPONSE_CACHE:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+    return _default_cache
@@ -1,6 +1,9 @@
 from agents.base_agent import BaseAgent
+from agents.structured import object_schema
 
 class ReviewerAgent(BaseAgent):
+    OUTPUT_SCHEMA = object_schema(scores=("score",), lists=("issues", "suggestions"))
+    
     def __init__(self, model):
         system_prompt = """You are a Reviewer Agent in an AI research lab.
 Your role: Critically evaluate research content for quality and accuracy.
@@ -9,4 +12,5 @@ Your role: Critically evaluate research content for quality and accuracy.
 - Check claim validity
 - Provide constructive feedback with specific improvement suggestions
 Output format: JSON with {score: 0-1, issues: [], suggestions: []}"""
-        super().__init__("Reviewer", "Quality Assurance", model, system_prompt)
+        super().__init__("Reviewer", "Quality Assurance", model, system_prompt, confidence_key="score",
+                         output_schema=self.OUTPUT_SCHEMA)
@@ -0,0 +1,149 @@
+import json
+import re
+from typing import Dict, Iterable, Optional
+
+from config.speed_settings import STRUCTURED_MAX_ITEMS
+
+_CLOSERS = {"{": "}", "[": "]"}
+_BARE_KEY = re.compile(r'([{,]\s*)([A-Za-z_][\w-]*)\s*:')
+_TRAILING_COMMA = re.compile(r',\s*([}\]])')
+_SINGLE_QUOTED = re.compile(r"'((?:[^'\\]|\\.)*)'")
+_LITERALS = re.compile(r'\b(True|False|None)\b')
+
+def object_schema(scores: Iterable[str] = (), lists: Iterable[str] = (), max_items: int = STRUCTURED_MAX_ITEMS) -> Dict:
+    """Compact JSON schema: 0-1 number fields and short string lists, all required"""
+    properties = {name: {"type": "number", "minimum": 0, "maximum": 1} for name in scores}
+    properties.update({
+        name: {"type": "array", "items": {"type": "string"}, "maxItems": max_items} for name in lists
+    })
+    return {"type": "object", "properties": properties, "required": list(properties)}
+
+class JsonExtractor:
+    """Incrementally finds the first top-level JSON object in streamed text.
+    
+    Text before the opening brace (prose, code fences) is skipped and
+    `complete` turns true as soon as the object closes, so a caller can stop
+    reading the stream there. value() also repairs an object cut off mid-way.
+    """
+    
+    def __init__(self):
+        self._chars = []
+        self._stack = []  # closers still owed
+        self._quote = None  # quote char while inside a string
+        self._escape = False
+        self.complete = False
+    
+    def feed(self, chunk: str) -> bool:
+        """Consume chunk; returns whether the object is complete"""
+        for char in chunk:
+            if self.complete:
+                break
+            if not self._stack:
+                if char == "{":
+                    self._chars.append(char)
+                    self._stack.append("}")
+                continue
+            self._chars.append(char)
+            if self._quote:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == self._quote:
+                    self._quote = None
+            elif char in "\"'":
+                self._quote = char
+            elif char in _CLOSERS:
+                self._stack.append(_CLOSERS[char])
+            elif char in "}]" and char == self._stack[-1]:
+                self._stack.pop()
+                self.complete = not self._stack
+        return self.complete
+    
+    @property
+    def text(self) -> str:
+        return "".join(self._chars)
+    
+    def value(self) -> Optional[Dict]:
+        """The object parsed leniently, or None if there is nothing usable"""
+        if not self._chars:
+            return None
+        text = self.text
+        if self.complete:
+            return _loads(text)
+        # Truncated: close what is open, dropping trailing members until it parses
+        while text:
+            value = _loads(_close(text))
+            if value is not None:
+                return value
+            cut = text.rfind(",")
+            text = text[:cut] if cut > 0 else ""
+        return None
+
+def _close(text: str) -> str:
+    extractor = JsonExtractor()
+    extractor.feed(text)
+    closed = text + (extractor._quote or "")
+    closed = re.sub(r'[,:]\s*$', "", closed)
+    return closed + "".join(reversed(extractor._stack))
+
+def _loads(text: str) -> Optional[Dict]:
+    """json.loads, then again after fixing bare keys, trailing commas, Python literals and single quotes"""
+    attempts = [text]
+    fixed = _TRAILING_COMMA.sub(r"\1", _BARE_KEY.sub(r'\1"\2":', text))
+    fixed = _LITERALS.sub(lambda m: {"True": "true", "False": "false", "None": "null"}[m.group(1)], fixed)
+    attempts.append(fixed)
+    attempts.append(_SINGLE_QUOTED.sub(lambda m: json.dumps(m.group(1).replace("\\'", "'")), fixed))
+    for attempt in attempts:
+        try:
+            value = json.loads(attempt)
+        except ValueError:
+            continue
+        return value if isinstance(value, dict) else None
+    return None
+
+def extract_json(text: str) -> Optional[Dict]:
+    """First JSON object in text, tolerating prose, fences, truncation and loose syntax"""
+    extractor = JsonExtractor()
+    extractor.feed(text)
+    return extractor.value()
+
+def coerce(data: Dict, schema: Dict) -> Dict:
+    """data reduced to schema's fields: numbers clamped to range (None if missing), lists of strings"""
+    result = {}
+    for name, spec in schema["properties"].items():
+        value = data.get(name)
+        if spec["type"] == "number":
+            try:
+                value = float(value) if not isinstance(value, bool) else None
+            except (TypeError, ValueError):
+                value = None
+            if value is not None:
+                value = float(min(max(value, spec.get("minimum", value)), spec.get("maximum", value)))
+        elif spec["type"] == "array":
+            if isinstance(value, (str, dict)):
+                value = [value]
+            elif value is not None and not isinstance(value, (list, tuple)):
+                value = [str(value)]  # a bare number or flag, e.g. "issues": 3
+            value = [item if isinstance(item, str) else json.dumps(item) for item in value or []]
+            value = value[:spec.get("maxItems", len(value))]
+        result[name] = value
+    return result
+
+def json_mode_rejected(error: Exception) -> bool:
+    """Whether a provider refused a JSON-mode call (HTTP 400, e.g. Groq's json_validate_failed)"""
+    return getattr(error, "status_code", None) == 400 or "json_validate_failed" in str(error)
+
+def failed_generation(error: Exception) -> str:
+    """The reply a provider rejected as invalid JSON when it sends it back (Groq does); empty otherwise"""
+    body = getattr(error, "body", None)
+    if isinstance(body, dict):
+        body = body.get("error", body)
+        if isinstance(body, dict):
+            return body.get("failed_generation") or ""
+    return ""
+
+def parse_structured(text: str, schema: Dict) -> Optional[Dict]:
+    """Typed result of an agent reply, or None when no JSON object can be recovered"""
+    data = extract_json(text)
+    return coerce(data, schema) if data is not None else None
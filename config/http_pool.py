@@ -0,0 +1,67 @@
+import asyncio
+import threading
+import weakref
+
+import httpx
+
+class LoopLocalAsyncClient(httpx.AsyncClient):
+    """httpx.AsyncClient that keeps one connection pool per event loop.
+    
+    Async connections belong to the loop that opened them, so one pooled
+    client shared by every asyncio.run() fails once its first loop closes.
+    SDKs build requests on this object; send() runs them on a client owned
+    by the running loop, created on first use and dropped with its loop.
+    """
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._client_kwargs = kwargs
+        self._loop_clients = weakref.WeakKeyDictionary()  # event loop -> httpx.AsyncClient
+        self._loop_clients_lock = threading.Lock()
+    
+    def _loop_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._loop_clients_lock:
+            # Connections of a closed loop can't be used or closed any more
+            for closed in [l for l in self._loop_clients if l.is_closed()]:
+                del self._loop_clients[closed]
+            client = self._loop_clients.get(loop)
+            if client is None:
+                client = httpx.AsyncClient(**self._client_kwargs)
+                self._loop_clients[loop] = client
+            return client
+    
+    async def send(self, request, **kwargs):
+        return await self._loop_client().send(request, **kwargs)
+    
+    def loop_clients(self) -> list:
+        """Pools of the loops still open"""
+        with self._loop_clients_lock:
+            return [client for loop, client in self._loop_clients.items() if not loop.is_closed()]
+    
+    async def aclose(self):
+        """Close the running loop's pool; see close_all for every loop's"""
+        with self._loop_clients_lock:
+            client = self._loop_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+        await super().aclose()
+    
+    def close_all(self):
+        """Close every loop's pool from synchronous code, each on its own loop"""
+        with self._loop_clients_lock:
+            clients = list(self._loop_clients.items())
+            self._loop_clients.clear()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        for loop, client in clients:
+            if loop.is_closed():
+                continue
+            if loop is running:
+                loop.create_task(client.aclose())
+            elif loop.is_running():
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            else:
+                loop.run_until_complete(client.aclose())
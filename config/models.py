@@ -1,24 +1,163 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_groq import ChatGroq
-from config.settings import GOOGLE_API_KEY, GROQ_API_KEY, GEMINI_MODEL, GROQ_MODEL, TEMPERATURE
+import json
+import threading
+from config import settings
+from config.settings import GOOGLE_API_KEY, GROQ_API_KEY, GEMINI_MODEL, GROQ_MODEL, STUB_MODEL
+from config.speed_settings import (
+    MODEL_POOL_MAX_CONNECTIONS, MODEL_POOL_MAX_KEEPALIVE, MODEL_REQUEST_TIMEOUT,
+    FAST_GEMINI_MODEL, FAST_GROQ_MODEL, FAST_STUB_MODEL,
+    STRUCTURED_MAX_TOKENS, STRUCTURED_GEMINI_THINKING_BUDGET, STRUCTURED_GROQ_REASONING_EFFORT
+)
+
+def _live_connections(http_client) -> int:
+    pool = getattr(getattr(http_client, "_transport", None), "_pool", None)
+    return len(getattr(pool, "connections", []))
 
 class ModelFactory:
+    """Process-wide registry of chat clients.
+    
+    Clients are memoized by (provider, model, temperature, options), so every
+    agent asking for the same configuration shares one client and its HTTP
+    connection pool. Groq clients additionally share one httpx pool.
+    
+    Provider SDKs are imported on first use, so importing this module only
+    pays for the provider that is actually used.
+    """
+    _clients = {}
+    _http_clients = {}
+    _lock = threading.Lock()
+    
     @staticmethod
-    def get_gemini():
-        return ChatGoogleGenerativeAI(
-            model=GEMINI_MODEL,
-            google_api_key=GOOGLE_API_KEY,
-            temperature=TEMPERATURE
-        )
+    def get_gemini(model=GEMINI_MODEL, temperature=None, **options):
+        return ModelFactory._get_client("gemini", model, temperature, options)
+    
+    @staticmethod
+    def get_groq(model=GROQ_MODEL, temperature=None, **options):
+        return ModelFactory._get_client("groq", model, temperature, options)
+    
+    @staticmethod
+    def get_stub(model=STUB_MODEL, temperature=None, **options):
+        """Offline model; options such as latency or failure_rate go to StubChatModel"""
+        return ModelFactory._get_client("stub", model, temperature, options)
+    
+    @staticmethod
+    def get_model(model_type="gemini", temperature=None, **options):
+        if model_type == "gemini":
+            return ModelFactory.get_gemini(temperature=temperature, **options)
+        if model_type == "stub":
+            return ModelFactory.get_stub(temperature=temperature, **options)
+        return ModelFactory.get_groq(temperature=temperature, **options)
     
     @staticmethod
-    def get_groq():
+    def get_fast_model(model_type="gemini", temperature=None, **options):
+        """Smaller, quicker model from the same provider, the first stage of a cascade"""
+        if model_type == "gemini":
+            return ModelFactory.get_gemini(FAST_GEMINI_MODEL, temperature, **options)
+        if model_type == "stub":
+            return ModelFactory.get_stub(FAST_STUB_MODEL, temperature, **options)
+        return ModelFactory.get_groq(FAST_GROQ_MODEL, temperature, **options)
+    
+    @staticmethod
+    def json_mode(model, schema: dict):
+        """model bound to reply with one JSON object.
+        
+        Gemini gets the schema as a native response schema. Groq (and the
+        stub) get JSON mode, with the schema described by the system prompt.
+        Reasoning tokens count toward the completion cap, so reasoning models
+        think as little as their provider allows.
+        """
+        if type(model).__name__ == "ChatGoogleGenerativeAI":
+            return model.bind(
+                response_mime_type="application/json",
+                response_schema=schema,
+                max_output_tokens=STRUCTURED_MAX_TOKENS,
+                thinking_budget=STRUCTURED_GEMINI_THINKING_BUDGET
+            )
+        options = {}
+        if str(getattr(model, "model_name", "")).startswith("openai/gpt-oss"):
+            options["reasoning_effort"] = STRUCTURED_GROQ_REASONING_EFFORT
+        return model.bind(response_format={"type": "json_object"}, max_tokens=STRUCTURED_MAX_TOKENS, **options)
+    
+    @staticmethod
+    def is_configured(model_type) -> bool:
+        """Whether a client for model_type can be built (its API key is set)"""
+        if model_type == "stub":
+            return True
+        return bool(GOOGLE_API_KEY if model_type == "gemini" else GROQ_API_KEY)
+    
+    @staticmethod
+    def _get_client(provider, model, temperature, options):
+        if temperature is None:
+            temperature = settings.TEMPERATURE
+        key = (provider, model, temperature, json.dumps(options, sort_keys=True, default=str))
+        
+        with ModelFactory._lock:
+            client = ModelFactory._clients.get(key)
+            if client is None:
+                client = ModelFactory._build_client(provider, model, temperature, options)
+                ModelFactory._clients[key] = client
+        return client
+    
+    @staticmethod
+    def _build_client(provider, model, temperature, options):
+        # Hedged and deadline-bound calls run on threads that can't be interrupted; this ends them
+        options = {"timeout": MODEL_REQUEST_TIMEOUT, **options}
+        if provider == "gemini":
+            from langchain_google_genai import ChatGoogleGenerativeAI
+            return ChatGoogleGenerativeAI(
+                model=model,
+                google_api_key=GOOGLE_API_KEY,
+                temperature=temperature,
+                **options
+            )
+        
+        if provider == "stub":
+            from config.stub_model import StubChatModel
+            return StubChatModel(model=model, temperature=temperature, **options)
+        
+        import httpx
+        from langchain_groq import ChatGroq
+        from config.http_pool import LoopLocalAsyncClient
+        if "groq" not in ModelFactory._http_clients:
+            limits = httpx.Limits(
+                max_connections=MODEL_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=MODEL_POOL_MAX_KEEPALIVE
+            )
+            # Async connections can't outlive their event loop, so that pool is kept per loop
+            ModelFactory._http_clients["groq"] = (httpx.Client(limits=limits), LoopLocalAsyncClient(limits=limits))
+        http_client, http_async_client = ModelFactory._http_clients["groq"]
         return ChatGroq(
-            model=GROQ_MODEL,
+            model=model,
             groq_api_key=GROQ_API_KEY,
-            temperature=TEMPERATURE
+            temperature=temperature,
+            http_client=http_client,
+            http_async_client=http_async_client,
+            **options
         )
     
     @staticmethod
-    def get_model(model_type="gemini"):
-        return ModelFactory.get_gemini() if model_type == "gemini" else ModelFactory.get_groq()
+    def pool_stats() -> dict:
+        with ModelFactory._lock:
+            by_provider = {}
+            for provider, *_ in ModelFactory._clients:
+                by_provider[provider] = by_provider.get(provider, 0) + 1
+            connections = {
+                provider: _live_connections(http_client) + sum(
+                    _live_connections(c) for c in http_async_client.loop_clients()
+                )
+                for provider, (http_client, http_async_client) in ModelFactory._http_clients.items()
+            }
+            return {
+                "clients": len(ModelFactory._clients),
+                "clients_by_provider": by_provider,
+                "shared_http_pools": len(ModelFactory._http_clients),
+                "live_connections": connections
+            }
+    
+    @staticmethod
+    def clear_pool():
+        with ModelFactory._lock:
+            for http_client, http_async_client in ModelFactory._http_clients.values():
+                http_client.close()
+                http_async_client.close_all()
+            ModelFactory._clients.clear()
+            ModelFactory._http_clients.clear()
@@ -10,6 +10,7 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 # Model Settings
 GEMINI_MODEL = "gemini-2.5-flash"
 GROQ_MODEL = "openai/gpt-oss-20b"
+STUB_MODEL = "stub-chat"  # Offline model for tests and benchmarks
 
 # Agent Parameters
 MAX_ITERATIONS = 2
@@ -1,15 +1,113 @@
 # Speed optimization settings
+import os
 
 # Faster model alternatives
-FAST_GEMINI_MODEL = "gemini-2.0-flash-exp"  # Already fast
+FAST_GEMINI_MODEL = "gemini-2.5-flash-lite"  # Smaller sibling of GEMINI_MODEL
 FAST_GROQ_MODEL = "llama-3.1-8b-instant"  # Faster than mixtral
+FAST_STUB_MODEL = "stub-chat-fast"  # Offline counterpart for cascade tests
+
+# Model cascade
+ENABLE_CASCADE = False  # Try the fast model first for CASCADE_ROLES (the dashboard's Fast Mode turns it on)
+CASCADE_ROLES = ["reviewer", "fact_checker", "citation_validator"]
+CASCADE_MIN_CONFIDENCE = 0.6  # escalate to the full model below this score/confidence or when unparseable
+CASCADE_TIMEOUT = 5  # seconds the fast model gets (instead of AGENT_TIMEOUT) before escalating
 
 # Reduced complexity
-MAX_PROMPT_LENGTH = 500  # Truncate long prompts
+MAX_PROMPT_LENGTH = 125  # Token budget for document context in an agent prompt (the old 500-character cut)
 MAX_RESPONSE_LENGTH = 1000  # Limit response size
 
 # Parallel processing
-ENABLE_PARALLEL = False  # Set True for parallel agent execution (experimental)
+ENABLE_PARALLEL = True  # Run review, fact_check and citation as one concurrent superstep
+MAX_CONCURRENCY = 3  # Upper bound on nodes executing at the same time
+
+# Structured output
+ENABLE_STRUCTURED_OUTPUT = True  # Reviewer and checkers answer in the provider's JSON mode
+STRUCTURED_MAX_ITEMS = 5  # entries allowed per list field in their schemas
+STRUCTURED_MAX_TOKENS = 1024  # completion cap for JSON replies, reasoning tokens included; cut-off objects are repaired
+STRUCTURED_GEMINI_THINKING_BUDGET = 0  # thinking tokens for Gemini JSON replies (0 = off on 2.5 Flash models)
+STRUCTURED_GROQ_REASONING_EFFORT = "low"  # gpt-oss reasoning for JSON replies; other Groq models don't take it
+
+# Refinement loop
+EARLY_EXIT_MARGIN = 0.1  # finalize once the local quality score clears the threshold by this much, None = off
 
 # Timeout settings
 AGENT_TIMEOUT = 30  # seconds per agent
+MODEL_REQUEST_TIMEOUT = AGENT_TIMEOUT  # seconds a provider client lets one request run; ends calls a deadline gave up on
+
+# Response cache
+ENABLE_RESPONSE_CACHE = True  # Reuse answers for identical (model, prompts, temperature)
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH", ".cache/llm_responses.sqlite")
+RESPONSE_CACHE_MAX_ENTRIES = 5000  # LRU eviction beyond this many responses
+RESPONSE_CACHE_MAX_BYTES = 50 * 1024 * 1024  # LRU eviction beyond this payload size
+RESPONSE_CACHE_TTL = 24 * 60 * 60  # seconds before a cached response expires
+
+# Agent memory
+MEMORY_MAX_ENTRIES = 50  # calls kept in RAM per agent, older ones spill to disk
+MEMORY_MAX_BYTES = 256 * 1024  # serialized history kept in RAM per agent
+MEMORY_SPILL_DIR = os.getenv("MEMORY_SPILL_DIR", ".cache/agent_memory")
+
+# Checkpoints
+ENABLE_CHECKPOINTS = True  # Save each completed node so failed or stopped runs can resume
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", ".cache/checkpoints.sqlite")
+CHECKPOINT_TTL = 7 * 24 * 60 * 60  # seconds an unfinished run stays resumable
+
+# Fact validation
+REFERENCE_INDEX_CACHE_SIZE = 32  # reference texts whose BM25 index is kept in memory
+BM25_K1 = 1.5  # term-frequency saturation
+BM25_B = 0.75  # passage length normalization
+
+# Local corpus
+CORPUS_INDEX_DIR = os.getenv("CORPUS_INDEX_DIR", ".cache/corpus_index")  # built by `python main.py index`
+CORPUS_PASSAGE_WORDS = 120  # words per indexed passage
+CORPUS_TOP_K = 3  # passages returned per lookup
+CORPUS_IN_RESEARCH = True  # Inject retrieved passages into the researcher prompt
+
+# Retrieval cache
+ENABLE_RETRIEVAL_CACHE = True  # Serve near-duplicate topics from earlier retrievals
+RETRIEVAL_CACHE_THRESHOLD = 1.0  # Jaccard similarity of normalized topic words; below 1.0 other subjects match
+RETRIEVAL_CACHE_MAX_ENTRIES = 1000  # LRU eviction beyond this many topics
+RETRIEVAL_CACHE_TTL = 24 * 60 * 60  # seconds before a cached retrieval expires
+RETRIEVAL_CACHE_PERMUTATIONS = 64  # MinHash signature length
+
+# Citations
+CITATION_CACHE_SIZE = 4096  # paragraphs whose extracted citations are remembered by content hash
+CITATION_GRAPH_PATH = os.getenv("CITATION_GRAPH_PATH", "")  # JSONL provenance log kept across runs, empty = in memory
+CITATION_GRAPH_MAX_EDGES = 50000  # claim/source edges kept in memory; the least recently tracked go first
+
+# Batch runs
+BATCH_CONCURRENCY = 8  # research runs in flight at once during run_batch
+
+# Tool offload
+ENABLE_TOOL_OFFLOAD = False  # Run ToolManager's text analyses in worker processes (for many concurrent runs)
+TOOL_OFFLOAD_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))  # worker processes
+TOOL_BATCH_SIZE = 16  # analyses sent to a worker in one task
+TOOL_BATCH_WINDOW = 0.005  # seconds a call waits for others to join its batch
+
+# Shared UI agents
+SHARED_AGENT_CONFIGS = 8  # agent sets (and runners) kept per server process, one per distinct UI configuration
+
+# Shared model client pool
+MODEL_POOL_MAX_CONNECTIONS = 20  # HTTP connections per provider pool
+MODEL_POOL_MAX_KEEPALIVE = 10  # idle connections kept open for reuse
+
+# Hedged requests
+ENABLE_HEDGING = True  # Race the other provider when the primary is unusually slow
+HEDGE_FALLBACKS = {"gemini": "groq", "groq": "gemini"}  # provider used for the hedge
+HEDGE_PERCENTILE = 0.95  # hedge once a call outlives this share of recent latencies
+HEDGE_MIN_SAMPLES = 10  # latencies needed before hedging starts
+HEDGE_WINDOW = 100  # recent latencies kept per model
+HEDGE_MAX_WORKERS = 64  # threads available to deadline-bound sync calls
+
+# Prompt budgets
+PROMPT_BUDGETS = {  # tokens of research content each agent sees, about a quarter of the old character cuts
+    "researcher": 400,  # retrieved corpus passages
+    "reviewer": MAX_PROMPT_LENGTH,
+    "fact_checker": 100,
+    "citation_validator": 100,
+    "editor": MAX_PROMPT_LENGTH
+}
+FEEDBACK_BUDGET = 50  # tokens of review feedback passed to the editor (the old 200-character cut)
+PROMPT_CHUNK_TOKENS = 40  # chunk size when a section has to be trimmed
+CHARS_PER_TOKEN = {"gemini": 4.0, "llama": 3.7, "default": 4.0}  # estimate without tiktoken
+TOKEN_COUNT_CACHE_SIZE = 10000  # token counts remembered by text hash
+FIT_CACHE_SIZE = 256  # fitted prompt contexts remembered per (text, budget, model family)
@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+from config.settings import RESEARCH_SECTIONS
+
+STUB_DISTRIBUTION = {
+    role: "stub" for role in ["researcher", "reviewer", "editor", "fact_checker", "citation_validator"]
+}
+_SCHEMA_PATTERN = re.compile(r"JSON with \{(.*?)\}")
+_TOKEN_PATTERN = re.compile(r"\S+\s*")
+_SECTION_PATTERN = re.compile(r"\bthe (\w+) section\b", re.IGNORECASE)
+_WORDS = [
+    "analysis", "evidence", "systems", "results", "models", "approach", "data",
+    "significant", "improves", "suggests", "framework", "studies", "performance",
+    "clinical", "adoption", "challenges", "accuracy", "outcomes", "methods", "research"
+]
+
+class StubJsonRejected(RuntimeError):
+    """A JSON-mode reply refused like Groq's 400 json_validate_failed, with the reply as failed_generation"""
+    status_code = 400
+    
+    def __init__(self, failed_generation: str):
+        super().__init__("Stub model rejected its JSON reply (json_validate_failed)")
+        self.body = {"error": {"code": "json_validate_failed", "failed_generation": failed_generation}}
+
+class StubChatModel(BaseChatModel):
+    """Offline chat model for tests and benchmarks.
+    
+    Replies are generated locally and deterministically from the prompt:
+    agents whose system prompt asks for "JSON with {...}" get a JSON object
+    with those keys (wrapped in json_prose_tokens of prose unless the call
+    asks for JSON mode), all others get research text with one heading per
+    RESEARCH_SECTIONS entry (only the one named when asked for "the X
+    section"). Latency, token rate, jitter, failures and request timeouts are
+    simulated so the pipeline can be measured without network access.
+    """
+    model: str = "stub-chat"
+    temperature: float = 0.0
+    latency: float = 0.0  # seconds before the first token
+    token_rate: float = 0.0  # tokens per second after the first, 0 = instant
+    jitter: float = 0.0  # +/- fraction applied to latency
+    failure_rate: float = 0.0  # probability that a call raises
+    response_tokens: int = 120  # length of free-text replies
+    json_prose_tokens: int = 0  # prose around JSON replies outside JSON mode, as chat models tend to add
+    json_reject_rate: float = 0.0  # probability that a JSON-mode call raises StubJsonRejected
+    json_reject_echo: bool = True  # send the rejected reply, cut off mid-object, back with the error
+    timeout: Optional[float] = None  # seconds before a call raises TimeoutError, like a client's request timeout
+    seed: Optional[int] = None
+    
+    _rng: random.Random = PrivateAttr(default_factory=random.Random)
+    
+    def model_post_init(self, __context: Any) -> None:
+        super().model_post_init(__context)
+        if self.seed is not None:
+            self._rng.seed(self.seed)
+    
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+    
+    def _reply(self, messages: List[BaseMessage], json_mode: bool = False) -> str:
+        system = next((m.content for m in messages if isinstance(m, SystemMessage)), "")
+        prompt = messages[-1].content if messages else ""
+        rng = random.Random(hashlib.sha256(f"{system}\n{prompt}".encode("utf-8")).hexdigest())
+        
+        schema = _SCHEMA_PATTERN.search(system)
+        if schema:
+            reply = {}
+            for field in schema.group(1).split(","):
+                name, _, kind = field.partition(":")
+                reply[name.strip()] = [] if kind.strip() == "[]" else round(rng.uniform(0.5, 0.95), 2)
+            reply = json.dumps(reply)
+            if self.json_prose_tokens and not json_mode:
+                words = [rng.choice(_WORDS) for _ in range(self.json_prose_tokens)]
+                half = len(words) // 2
+                reply = (f"Here is my assessment: {' '.join(words[:half])}.\n\n```json\n{reply}\n```\n\n"
+                         f"{' '.join(words[half:]).capitalize()}.")
+            return reply
+        
+        words_per_section = max(self.response_tokens // len(RESEARCH_SECTIONS), 1)
+        requested = _SECTION_PATTERN.search(prompt)
+        names = RESEARCH_SECTIONS
+        if requested and requested.group(1).lower() in RESEARCH_SECTIONS:
+            names = [requested.group(1).lower()]
+        sections = []
+        for section in names:
+            words = [rng.choice(_WORDS) for _ in range(words_per_section)]
+            sentences = [" ".join(words[i:i + 12]).capitalize() + "." for i in range(0, len(words), 12)]
+            sections.append(f"## {section.title()}\n" + " ".join(sentences))
+        return "\n\n".join(sections)
+    
+    def _plan(self, messages: List[BaseMessage], kwargs: Dict):
+        if self.failure_rate and self._rng.random() < self.failure_rate:
+            raise RuntimeError("Stub model injected failure")
+        json_mode = "response_format" in kwargs or "response_mime_type" in kwargs
+        text = self._reply(messages, json_mode)
+        if json_mode and self.json_reject_rate and self._rng.random() < self.json_reject_rate:
+            raise StubJsonRejected(text[:len(text) * 2 // 3] if self.json_reject_echo else "")
+        tokens = _TOKEN_PATTERN.findall(text)
+        delay = max(0.0, self.latency * (1 + self._rng.uniform(-self.jitter, self.jitter)))
+        per_token = 1 / self.token_rate if self.token_rate else 0.0
+        usage = {
+            "input_tokens": sum(len(str(m.content).split()) for m in messages),
+            "output_tokens": len(tokens),
+        }
+        usage["total_tokens"] = usage["input_tokens"] + usage["output_tokens"]
+        return text, tokens, delay, per_token, usage
+    
+    def _timed_out(self, seconds: float) -> bool:
+        return self.timeout is not None and seconds > self.timeout
+    
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        text, tokens, delay, per_token, usage = self._plan(messages, kwargs)
+        if self._timed_out(delay + per_token * len(tokens)):
+            time.sleep(self.timeout)
+            raise TimeoutError("Stub model request timed out")
+        if delay or per_token:
+            time.sleep(delay + per_token * len(tokens))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text, usage_metadata=usage))])
+    
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs: Any) -> ChatResult:
+        text, tokens, delay, per_token, usage = self._plan(messages, kwargs)
+        if self._timed_out(delay + per_token * len(tokens)):
+            await asyncio.sleep(self.timeout)
+            raise TimeoutError("Stub model request timed out")
+        if delay or per_token:
+            await asyncio.sleep(delay + per_token * len(tokens))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text, usage_metadata=usage))])
+    
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        text, tokens, delay, per_token, usage = self._plan(messages, kwargs)
+        if delay:
+            time.sleep(delay)
+        for index, token in enumerate(tokens):
+            if per_token:
+                time.sleep(per_token)
+            chunk = self._chunk(token, usage if index == len(tokens) - 1 else None)
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+    
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        text, tokens, delay, per_token, usage = self._plan(messages, kwargs)
+        if delay:
+            await asyncio.sleep(delay)
+        for index, token in enumerate(tokens):
+            if per_token:
+                await asyncio.sleep(per_token)
+            chunk = self._chunk(token, usage if index == len(tokens) - 1 else None)
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+    
+    @staticmethod
+    def _chunk(token: str, usage: Optional[Dict]) -> ChatGenerationChunk:
+        return ChatGenerationChunk(message=AIMessageChunk(content=token, usage_metadata=usage))
+
+
+def make_stub_agents(fast_options: Optional[Dict] = None, **options) -> Dict:
+    """All five agents on stub models, with the response cache off so every call reaches the model.
+    
+    options configure each agent's StubChatModel; fast_options, when given,
+    add a fast stub model for the cascade roles to try first.
+    """
+    from agents.agent_factory import AgentFactory
+    from config.models import ModelFactory
+    from config.speed_settings import CASCADE_ROLES
+    agents = AgentFactory.create_agents(STUB_DISTRIBUTION, cascade=False)
+    for role, agent in agents.items():
+        agent.model = ModelFactory.get_model("stub", **options)
+        agent.cache = None
+        if fast_options is not None and role in CASCADE_ROLES:
+            agent.cascade_model = ModelFactory.get_fast_model("stub", **fast_options)
+    return agents
@@ -2,7 +2,43 @@
 AI Research Lab Simulator
 Multi-agent LLM research pipeline using LangGraph and Streamlit
 """
+import argparse
+import time
+from config.speed_settings import BATCH_CONCURRENCY, CORPUS_INDEX_DIR
+
+def main():
+    parser = argparse.ArgumentParser(description="AI Research Lab Simulator")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    batch_parser = subparsers.add_parser("batch", help="Research many topics and write results as JSONL")
+    batch_parser.add_argument("topics", help="Topic file: .jsonl with topic/title fields, or one topic per line")
+    batch_parser.add_argument("output", help="JSONL file receiving one record per finished topic")
+    batch_parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY)
+    
+    index_parser = subparsers.add_parser("index", help="Build the local corpus index used for retrieval")
+    index_parser.add_argument("corpus", help="Directory of .txt/.md documents")
+    index_parser.add_argument("--output", default=CORPUS_INDEX_DIR, help="Index directory")
+    
+    args = parser.parse_args()
+    
+    if args.command == "batch":
+        from workflow.runner import WorkflowRunner
+        summary = WorkflowRunner().run_batch(args.topics, args.output, concurrency=args.concurrency)
+        print(f"Completed: {summary['completed']}  Failed: {summary['failed']}  Elapsed: {summary['elapsed']}s")
+        print(f"Throughput: {summary['topics_per_min']} topics/min")
+        print(f"Latency p50: {summary['latency_p50']}s  p90: {summary['latency_p90']}s  "
+              f"p99: {summary['latency_p99']}s  max: {summary['latency_max']}s")
+    elif args.command == "index":
+        from tools.corpus import build_corpus_index
+        start_time = time.perf_counter()
+        meta = build_corpus_index(args.corpus, args.output)
+        print(f"Indexed {meta['documents']} documents, {meta['passages']} passages, "
+              f"{meta['tokens']} terms in {time.perf_counter() - start_time:.1f}s -> {args.output}")
+    else:
+        print("AI Research Lab Simulator")
+        print("Run 'streamlit run ui/app.py' to start the interface")
+        print("Run 'python main.py batch topics.jsonl results.jsonl' for batch research")
+        print("Run 'python main.py index docs/' to build the local retrieval corpus")
 
 if __name__ == "__main__":
-    print("AI Research Lab Simulator")
-    print("Run 'streamlit run ui/app.py' to start the interface")
\ No newline at end of file
+    main()
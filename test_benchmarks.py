@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""Benchmark pipeline overhead and concurrency scaling offline (stub model)"""
+import io
+import time
+from config.models import ModelFactory
+from config.stub_model import make_stub_agents
+from workflow.runner import WorkflowRunner
+from workflow import nodes
+from workflow.metrics import timed_node
+from workflow import prompt_budget
+from workflow.prompt_budget import fit_text, count_tokens
+from config.speed_settings import PROMPT_BUDGETS, FEEDBACK_BUDGET, MAX_PROMPT_LENGTH
+
+NODE_CALLS = 200  # calls per node for the overhead table
+WORKER_COUNTS = [1, 4, 16, 64]
+RUNS_PER_WORKER = 4  # batch size = workers * RUNS_PER_WORKER
+STUB_LATENCY = 0.05  # seconds per simulated LLM call in the scaling test
+CHARACTER_CUTS = {"reviewer": 500, "fact_checker": 400, "citation_validator": 400, "editor": 500, "feedback": 200}
+
+
+def node_overhead():
+    """Microseconds per node call with a zero-latency model: pure framework cost"""
+    agents = make_stub_agents()
+    state = WorkflowRunner(agents=agents, checkpoint=False).run("AI in Healthcare")
+    timings = {}
+    for name in ["research", "review", "fact_check", "citation", "editor", "finalize"]:
+        node = getattr(nodes, f"{name}_node")
+        start_time = time.perf_counter()
+        for _ in range(NODE_CALLS):
+            node(state, agents)
+        timings[name] = (time.perf_counter() - start_time) / NODE_CALLS * 1e6
+        for agent in agents.values():
+            agent.clear_memory()
+    return timings
+
+
+def graph_overhead(runs: int = 50, checkpoint: bool = False) -> float:
+    """Milliseconds per full workflow run with a zero-latency model"""
+    runner = WorkflowRunner(agents=make_stub_agents(), checkpoint=checkpoint)
+    start_time = time.perf_counter()
+    for i in range(runs):
+        runner.run(f"Topic {i}")
+    return (time.perf_counter() - start_time) / runs * 1000
+
+
+def editor_edits(token_rate: float = 400.0) -> dict:
+    """Editor latency and output tokens for a full rewrite vs a one-section edit"""
+    agents = make_stub_agents(token_rate=token_rate)
+    state = WorkflowRunner._initial_state("AI in Healthcare")
+    state.update(nodes.research_node(state, agents))
+    results = {}
+    for label, feedback in [("full", "Improve overall clarity."), ("one section", "The findings need more evidence.")]:
+        state["review_feedback"] = feedback
+        start_time = time.perf_counter()
+        update = timed_node("editor", nodes.editor_node)(state, agents=agents)
+        results[label] = (time.perf_counter() - start_time, update["metrics"][0]["completion_tokens"])
+    return results
+
+
+def prompt_fitting(calls: int = 500) -> dict:
+    """Microseconds to fit a long document into a prompt budget, cold vs cached counts"""
+    model = ModelFactory.get_model("stub", response_tokens=2000)
+    document = model.invoke("Write it").content
+    fit_text("Warm up the splitter import. " * 200, 10, model)
+    timings = {}
+    for label in ["cold", "cached"]:
+        if label == "cold":
+            prompt_budget._counts.clear()
+            prompt_budget._fit.cache_clear()
+        start_time = time.perf_counter()
+        for _ in range(calls if label == "cached" else 1):
+            fit_text(document, MAX_PROMPT_LENGTH, model)
+        timings[label] = (time.perf_counter() - start_time) / (calls if label == "cached" else 1) * 1e6
+    return timings
+
+
+def prompt_sizes() -> dict:
+    """Tokens of context each agent gets: the previous character cut vs its token budget"""
+    model = ModelFactory.get_model("stub", response_tokens=2000)
+    document = model.invoke("Write it").content
+    budgets = dict(PROMPT_BUDGETS, feedback=FEEDBACK_BUDGET)
+    return {
+        role: (count_tokens(document[:chars], model), count_tokens(fit_text(document, budgets[role], model), model))
+        for role, chars in CHARACTER_CUTS.items()
+    }
+
+
+def first_output(latency: float = 0.3, token_rate: float = 100.0) -> dict:
+    """Seconds until the first node update vs the first streamed token"""
+    runner = WorkflowRunner(agents=make_stub_agents(latency=latency, token_rate=token_rate), checkpoint=False)
+    results = {}
+    for label, tokens in [("node update", False), ("token", True)]:
+        start_time = time.perf_counter()
+        events = runner.stream(f"First output {label}", tokens=tokens)
+        next(events)
+        results[label] = time.perf_counter() - start_time
+        events.close()
+    return results
+
+
+def scaling(workers: int, **stub_options) -> dict:
+    runner = WorkflowRunner(agents=make_stub_agents(latency=STUB_LATENCY, jitter=0.2, **stub_options), checkpoint=False)
+    topics = [f"Topic {i}" for i in range(workers * RUNS_PER_WORKER)]
+    return runner.run_batch(topics, io.StringIO(), concurrency=workers)
+
+
+print("Benchmarking pipeline overhead (offline stub model)...")
+print("=" * 60)
+
+print("\nPer-node framework overhead (zero model latency):")
+for name, micros in node_overhead().items():
+    print(f"  {name:<12} {micros:8.1f} us/call")
+print(f"  {'full run':<12} {graph_overhead():8.2f} ms/run")
+print(f"  {'checkpointed':<12} {graph_overhead(checkpoint=True):8.2f} ms/run")
+
+print("\nEditor rewrite vs section edit (400 tokens/sec):")
+for label, (seconds, tokens) in editor_edits().items():
+    print(f"  {label:<12} {seconds:6.3f} s {tokens:5d} output tokens")
+
+print(f"\nPrompt fitting (2000-token document into {MAX_PROMPT_LENGTH} tokens):")
+for label, micros in prompt_fitting().items():
+    print(f"  {label:<12} {micros:8.1f} us/call")
+
+print("\nPrompt context per agent (tokens of a 2000-token document):")
+print(f"  {'':<18} {'char cut':>8} {'budget':>7}")
+for role, (cut, budgeted) in prompt_sizes().items():
+    print(f"  {role:<18} {cut:8d} {budgeted:7d}")
+
+print("\nTime to first visible output (300 ms latency, 100 tokens/sec):")
+for label, seconds in first_output().items():
+    print(f"  {label:<12} {seconds:6.3f} s")
+
+print(f"\nConcurrency scaling ({STUB_LATENCY * 1000:.0f} ms +/-20% per LLM call):")
+print(f"  {'workers':>7} {'runs/sec':>9} {'p50 (s)':>8} {'p99 (s)':>8}")
+for workers in WORKER_COUNTS:
+    summary = scaling(workers)
+    runs_per_sec = summary["completed"] / summary["elapsed"] if summary["elapsed"] else 0.0
+    print(f"  {workers:>7} {runs_per_sec:>9.2f} {summary['latency_p50']:>8.3f} {summary['latency_p99']:>8.3f}")
+
+summary = scaling(16, failure_rate=0.02)
+print(f"\nFailure injection (2% per call, 16 workers): "
+      f"{summary['completed']} completed, {summary['failed']} failed")
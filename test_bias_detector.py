@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the single-pass BiasDetector against the previous substring scans"""
+import random
+import time
+from tools.bias_detector import BiasDetector, DEFAULT_LEXICONS
+
+TEXT_MB = 2
+LARGE_LEXICON = 2000  # extra terms for the large-lexicon run
+FILLER = ("the study shows that models improve accuracy in clinical settings while results "
+          "vary across hospitals and indicate benefits where data is limited so outcomes "
+          "depend on adoption of new diagnostic tools by staff with training").split()
+TERMS = "however nevertheless clearly although but always never certainly despite".split()
+TERM_RATE = 0.03  # share of words that are lexicon terms, roughly as in real prose
+
+
+class LegacyBiasDetector:
+    """The previous implementation: one substring scan per term, analyze scans twice"""
+    
+    def __init__(self, lexicons):
+        self.bias_keywords = lexicons["bias"]
+        self.contradiction_markers = lexicons["contradiction"]
+    
+    def detect_bias(self, text):
+        text_lower = text.lower()
+        return [f"Potential bias: '{k}'" for k in self.bias_keywords if k in text_lower]
+    
+    def detect_contradictions(self, text):
+        contradictions = []
+        for i, sentence in enumerate(text.split('.')):
+            for marker in self.contradiction_markers:
+                if marker in sentence.lower():
+                    contradictions.append({"sentence": sentence.strip(), "marker": marker, "position": i})
+        return contradictions
+    
+    def analyze(self, text):
+        return {
+            "biases": self.detect_bias(text),
+            "contradictions": self.detect_contradictions(text),
+            "bias_count": len(self.detect_bias(text)),
+            "contradiction_count": len(self.detect_contradictions(text))
+        }
+
+
+def make_text(megabytes: float) -> str:
+    rng = random.Random(7)
+    sentences = []
+    size = 0
+    while size < megabytes * 2**20:
+        words = [rng.choice(TERMS) if rng.random() < TERM_RATE else rng.choice(FILLER)
+                 for _ in range(rng.randint(6, 20))]
+        sentence = " ".join(words).capitalize() + "."
+        sentences.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(sentences)
+
+
+def throughput(detector, text: str) -> float:
+    start_time = time.perf_counter()
+    detector.analyze(text)
+    return len(text) / 2**20 / (time.perf_counter() - start_time)
+
+
+text = make_text(TEXT_MB)
+rng = random.Random(11)
+large = {
+    "bias": DEFAULT_LEXICONS["bias"] + [f"{rng.choice(FILLER)}{i}" for i in range(LARGE_LEXICON // 2)],
+    "contradiction": DEFAULT_LEXICONS["contradiction"] + [f"{rng.choice(FILLER)}x{i}" for i in range(LARGE_LEXICON // 2)]
+}
+
+print("Benchmarking bias detection...")
+print("=" * 50)
+print(f"Text: {len(text) / 2**20:.1f} MB")
+
+legacy, current = LegacyBiasDetector(DEFAULT_LEXICONS), BiasDetector()
+print(f"\nDefault lexicons ({sum(len(t) for t in DEFAULT_LEXICONS.values())} terms):")
+print(f"  previous     {throughput(legacy, text):8.2f} MB/s")
+print(f"  single-pass  {throughput(current, text):8.2f} MB/s")
+
+sample = text[:len(text) // 20]  # the previous implementation is too slow for the full text
+legacy, current = LegacyBiasDetector(large), BiasDetector(large)
+print(f"\nLarge lexicons ({sum(len(t) for t in large.values())} terms):")
+print(f"  previous     {throughput(legacy, sample):8.2f} MB/s")
+print(f"  single-pass  {throughput(current, text):8.2f} MB/s")
+
+check = "Nevertheless, the button works. It is always on."
+print(f"\nWord boundaries ({check!r}):")
+for label, detector in [("previous", LegacyBiasDetector(DEFAULT_LEXICONS)), ("single-pass", BiasDetector())]:
+    result = detector.analyze(check)
+    markers = [c["marker"] for c in result["contradictions"]]
+    print(f"  {label:<12} biases={result['biases']} markers={markers}")
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Measure the cheap-first model cascade: escalation rate and latency saved (stub model)"""
+import time
+from config.stub_model import make_stub_agents
+from agents.cascade import cascade_stats
+from config.speed_settings import CASCADE_MIN_CONFIDENCE
+from workflow.runner import WorkflowRunner
+
+TOPICS = 20
+FULL_LATENCY = 0.3  # simulated seconds per full-model call
+FAST_LATENCY = 0.05  # simulated seconds per fast-model call
+STALLED_LATENCY = 2.0  # a fast model that hangs; well past the full model's latency
+STALLED_TIMEOUT = 0.1  # cascade deadline for the stalled case, in place of CASCADE_TIMEOUT
+STALLED_TOPICS = 5
+RUN_CONFIG = {"max_iterations": 1}
+
+
+def measure(cascade: bool, fast_failure_rate: float = 0.0, fast_latency: float = FAST_LATENCY,
+            cascade_timeout: float = None, topics: int = TOPICS) -> float:
+    fast_options = {"latency": fast_latency, "failure_rate": fast_failure_rate} if cascade else None
+    agents = make_stub_agents(fast_options, latency=FULL_LATENCY)
+    if cascade_timeout is not None:
+        for agent in agents.values():
+            agent.cascade_timeout = cascade_timeout
+    runner = WorkflowRunner(agents=agents, checkpoint=False, run_config=RUN_CONFIG)
+    start_time = time.perf_counter()
+    for i in range(topics):
+        runner.run(f"Topic {i}")
+    return time.perf_counter() - start_time
+
+
+print("Benchmarking model cascade...")
+print("=" * 50)
+print(f"{TOPICS} topics; full model {FULL_LATENCY}s, fast model {FAST_LATENCY}s per call; "
+      f"escalate below {CASCADE_MIN_CONFIDENCE}")
+
+baseline = measure(cascade=False)
+cascade_stats.clear()
+cascaded = measure(cascade=True)
+stats = cascade_stats.get_stats()
+
+print(f"\nFull models only:  {baseline:6.2f}s")
+print(f"Cascade:           {cascaded:6.2f}s")
+print(f"\nEscalated {stats['escalations']}/{stats['attempts']} checks ({stats['escalation_rate']:.0%}), "
+      f"estimated {stats['latency_saved']:.2f}s of agent time saved")
+for name, agent in stats["agents"].items():
+    print(f"  {name:<18} escalated {agent['escalations']:3d}/{agent['attempts']:<3d} saved {agent['latency_saved']:6.2f}s")
+
+# A fast model that is down must not fail the run: every check escalates to the full model
+cascade_stats.clear()
+outage = measure(cascade=True, fast_failure_rate=1.0)
+stats = cascade_stats.get_stats()
+print(f"\nFast model failing every call: {outage:6.2f}s, escalated {stats['escalations']}/{stats['attempts']} "
+      f"({stats['failures']} failures), runs completed")
+
+# A fast model that stalls is given up on at the cascade deadline, not after AGENT_TIMEOUT
+cascade_stats.clear()
+stalled = measure(cascade=True, fast_latency=STALLED_LATENCY, cascade_timeout=STALLED_TIMEOUT,
+                  topics=STALLED_TOPICS)
+stats = cascade_stats.get_stats()
+print(f"Fast model stalling {STALLED_LATENCY}s with a {STALLED_TIMEOUT}s cascade deadline: "
+      f"{stalled / STALLED_TOPICS:.2f}s per topic (full models only: {baseline / TOPICS:.2f}s), "
+      f"escalated {stats['escalations']}/{stats['attempts']} ({stats['failures']} failures)")
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Benchmark CitationTracker on a document with thousands of citations across editor iterations"""
+import os
+import random
+import re
+import tempfile
+import time
+from tools.citation import CitationTracker
+
+PARAGRAPHS = 1500
+ITERATIONS = 5
+EDITED_PER_ITERATION = 3  # paragraphs the editor rewrites between iterations
+RUNS = 200
+RUN_PARAGRAPHS = 20  # paragraphs per run's document
+MAX_EDGES = 2000
+WORDS = ("models improve diagnostic accuracy in clinical settings while results vary across "
+         "hospitals and trials indicate benefits where data is limited").split()
+AUTHORS = ["Smith", "Jones", "Brown", "Garcia", "Chen", "Kumar", "Novak", "Okafor"]
+
+
+def legacy_extract(text):
+    """The previous extract_citations: three uncompiled patterns over the whole text"""
+    patterns = [
+        r'\[(\d+)\]',
+        r'\(([A-Za-z]+\s+\d{4})\)',
+        r'\(([A-Za-z]+\s+et\s+al\.\s+\d{4})\)'
+    ]
+    citations = []
+    for pattern in patterns:
+        citations.extend(re.findall(pattern, text))
+    return citations
+
+
+def citation(rng: random.Random) -> str:
+    kind = rng.randrange(3)
+    if kind == 0:
+        return f"[{rng.randint(1, 400)}]"
+    if kind == 1:
+        return f"({rng.choice(AUTHORS)} {rng.randint(1990, 2024)})"
+    return f"({rng.choice(AUTHORS)} et al. {rng.randint(1990, 2024)})"
+
+
+def paragraph(rng: random.Random) -> str:
+    sentences = []
+    for _ in range(rng.randint(3, 6)):
+        words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 18))).capitalize()
+        sentences.append(f"{words} {citation(rng)}.")
+    return " ".join(sentences)
+
+
+rng = random.Random(4)
+paragraphs = [paragraph(rng) for _ in range(PARAGRAPHS)]
+versions = []
+for _ in range(ITERATIONS):
+    versions.append("\n\n".join(paragraphs))
+    for i in rng.sample(range(PARAGRAPHS), EDITED_PER_ITERATION):
+        paragraphs[i] = paragraph(rng)
+
+print("Benchmarking citation tracking...")
+print("=" * 50)
+print(f"Document: {len(versions[0]) / 2**20:.2f} MB, {len(legacy_extract(versions[0]))} citations, "
+      f"{ITERATIONS} iterations editing {EDITED_PER_ITERATION} paragraphs each")
+
+start_time = time.perf_counter()
+legacy = [legacy_extract(text) for text in versions]
+legacy_time = time.perf_counter() - start_time
+
+tracker = CitationTracker()
+times = []
+current = []
+for text in versions:
+    start_time = time.perf_counter()
+    current.append(tracker.extract_citations(text))
+    tracker.track_document(text)
+    times.append(time.perf_counter() - start_time)
+
+print(f"\nPrevious extraction (per iteration):     {legacy_time / ITERATIONS * 1000:7.1f} ms")
+print(f"Extract + graph, first iteration:        {times[0] * 1000:7.1f} ms")
+print(f"Extract + graph, later iterations:       {sum(times[1:]) / (ITERATIONS - 1) * 1000:7.1f} ms")
+print(f"Same citations as before: {legacy == current}")
+
+graph = tracker.get_citation_graph()
+source = graph[1]["source"]
+start_time = time.perf_counter()
+claims = tracker.claims_for(source)
+lookup = time.perf_counter() - start_time
+print(f"\nProvenance graph: {len(graph)} edges; {len(claims)} claims cite {source!r} "
+      f"(lookup {lookup * 1e6:.0f} µs)")
+
+with tempfile.TemporaryDirectory() as workdir:
+    path = os.path.join(workdir, "citations.jsonl")
+    persistent = CitationTracker(path)
+    persistent.track_document(versions[-1])
+    persistent.close()
+    start_time = time.perf_counter()
+    reloaded = CitationTracker(path)
+    reload_time = time.perf_counter() - start_time
+    reloaded.close()
+    print(f"Reloaded {len(reloaded.get_citation_graph())} edges from JSONL in {reload_time * 1000:.1f} ms")
+    
+    # Edges evicted and tracked again are appended again; compaction keeps the file near max_edges
+    path = os.path.join(workdir, "bounded.jsonl")
+    bounded = CitationTracker(path, max_edges=2)
+    for _ in range(ITERATIONS):
+        for claim in ("First claim [1].", "Second claim [2].", "Third claim [3]."):
+            bounded.track_document(claim)
+    bounded.close()
+    with open(path, encoding="utf-8") as f:
+        log_lines = sum(1 for _ in f)
+    reloaded = CitationTracker(path, max_edges=2)
+    reloaded.close()
+    print(f"3 edges tracked {ITERATIONS} times with max_edges=2: {log_lines} JSONL lines, "
+          f"{len(reloaded.get_citation_graph())} edges reloaded")
+
+# What validate_citations returns: only the edges of the document it was given
+document_graph = tracker.get_citation_graph(tracker.track_document(versions[-1]))
+print(f"\nLatest document's edges: {len(document_graph)} of {len(graph)} in the graph")
+
+# A process-wide tracker over many runs' documents stays within max_edges
+runs = ["\n\n".join(paragraph(rng) for _ in range(RUN_PARAGRAPHS)) for _ in range(RUNS)]
+for label, max_edges in [("uncapped", RUNS * RUN_PARAGRAPHS * 6), (f"capped at {MAX_EDGES}", MAX_EDGES)]:
+    long_lived = CitationTracker(max_edges=max_edges)
+    for text in runs:
+        latest = long_lived.get_citation_graph(long_lived.track_document(text))
+    print(f"{RUNS} runs, {label:<16} {len(long_lived.get_citation_graph()):6d} edges kept, "
+          f"{long_lived.evictions:5d} evicted, {len(latest)} returned for the last run")
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the local corpus index: offline build, memory-mapped load, top-k lookup"""
+import os
+import random
+import statistics
+import tempfile
+import time
+from tools.corpus import build_corpus_index, CorpusIndex
+from tools.search import KnowledgeRetriever
+
+DOCUMENTS = 2000
+PARAGRAPHS = 8
+QUERIES = 500
+WORDS = ("artificial intelligence healthcare machine learning models patient outcomes diagnosis "
+         "accuracy clinical data imaging radiology treatment hospitals trials evidence adoption "
+         "privacy regulation costs workflow physicians nurses screening prediction risk").split()
+
+
+def paragraph(rng: random.Random) -> str:
+    topic = f"topic{rng.randrange(DOCUMENTS)}"
+    return " ".join(rng.choice(WORDS + [topic]) for _ in range(rng.randint(40, 90)))
+
+
+rng = random.Random(5)
+with tempfile.TemporaryDirectory() as workdir:
+    corpus_dir = os.path.join(workdir, "corpus")
+    index_dir = os.path.join(workdir, "index")
+    os.makedirs(corpus_dir)
+    for i in range(DOCUMENTS):
+        with open(os.path.join(corpus_dir, f"doc{i:05d}.md"), "w", encoding="utf-8") as f:
+            f.write("\n\n".join(paragraph(rng) for _ in range(PARAGRAPHS)))
+    
+    print("Benchmarking local corpus retrieval...")
+    print("=" * 50)
+    
+    start_time = time.perf_counter()
+    meta = build_corpus_index(corpus_dir, index_dir)
+    print(f"Built index: {meta['documents']} documents, {meta['passages']} passages "
+          f"in {time.perf_counter() - start_time:.2f}s")
+    
+    start_time = time.perf_counter()
+    index = CorpusIndex(index_dir)
+    print(f"Opened index (memory-mapped): {(time.perf_counter() - start_time) * 1000:.1f} ms")
+    
+    queries = [f"{rng.choice(WORDS)} {rng.choice(WORDS)} topic{rng.randrange(DOCUMENTS)}" for _ in range(QUERIES)]
+    latencies = []
+    for query in queries:
+        start_time = time.perf_counter()
+        index.search(query, k=3)
+        latencies.append((time.perf_counter() - start_time) * 1000)
+    latencies.sort()
+    print(f"\nTop-3 lookup over {QUERIES} queries:")
+    print(f"  p50 {statistics.median(latencies):6.2f} ms   p99 {latencies[int(len(latencies) * 0.99)]:6.2f} ms")
+    
+    retriever = KnowledgeRetriever(index_dir=index_dir)
+    print(f"\nKnowledgeRetriever.retrieve({queries[0]!r}):")
+    for line in retriever.retrieve(queries[0]).split("\n\n"):
+        print(f"  {line[:90]}")
+    print(f"Without an index the retriever falls back to the LLM: "
+          f"{KnowledgeRetriever(index_dir=os.path.join(workdir, 'missing')).search(queries[0]) == []}")
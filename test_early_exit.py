@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""Measure LLM rounds saved by the local-score early exit (stub model)"""
+import time
+from config.stub_model import make_stub_agents
+from workflow.runner import WorkflowRunner
+
+TOPICS = 30
+STUB_LATENCY = 0.02  # simulated seconds per LLM call
+RUN_CONFIG = {"max_iterations": 3, "convergence_threshold": 0.55}
+MARGIN = 0.05
+
+
+def measure(early_exit_margin) -> dict:
+    runner = WorkflowRunner(agents=make_stub_agents(latency=STUB_LATENCY), checkpoint=False,
+                            run_config={**RUN_CONFIG, "early_exit_margin": early_exit_margin})
+    start_time = time.perf_counter()
+    results = [runner.run(f"Topic {i}") for i in range(TOPICS)]
+    return {
+        "elapsed": time.perf_counter() - start_time,
+        "rounds": sum(1 for r in results for m in r["metrics"] if m["node"] == "review"),
+        "llm_calls": sum(m["llm_calls"] for r in results for m in r["metrics"])
+    }
+
+
+print("Benchmarking local-score early exit...")
+print("=" * 50)
+print(f"{TOPICS} topics, run config {RUN_CONFIG}, {STUB_LATENCY}s per LLM call")
+
+for label, margin in [("off", None), (f"margin {MARGIN}", MARGIN)]:
+    result = measure(margin)
+    print(f"\nEarly exit {label}:")
+    print(f"  review rounds {result['rounds']:4d}   LLM calls {result['llm_calls']:4d}   {result['elapsed']:.2f}s")
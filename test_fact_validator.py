@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Benchmark FactValidator against a large reference, with and without the shared index"""
+import random
+import time
+from tools.fact_validator import FactValidator, get_reference_index, _indexes
+
+REFERENCE_SENTENCES = 20000
+CLAIMS = 200
+WORDS = ("artificial intelligence healthcare machine learning models patient outcomes diagnosis "
+         "accuracy clinical data imaging radiology treatment hospitals trials evidence adoption "
+         "privacy regulation costs workflow physicians nurses screening prediction risk").split()
+
+
+def sentence(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))).capitalize()
+
+
+def legacy_validate(claims, reference):
+    """The previous cross_reference: rebuild the reference word set for every claim"""
+    validated = []
+    for claim in claims:
+        claim_words = set(claim.lower().split())
+        context_words = set(reference.lower().split())
+        if len(claim_words & context_words) > len(claim_words) * 0.3:
+            validated.append(claim)
+    return validated
+
+
+rng = random.Random(3)
+reference = ". ".join(sentence(rng) for _ in range(REFERENCE_SENTENCES)) + "."
+text = ". ".join(sentence(rng) for _ in range(CLAIMS)) + "."
+validator = FactValidator()
+claims = validator.extract_claims(text)
+
+print("Benchmarking fact validation...")
+print("=" * 50)
+print(f"Reference: {len(reference) / 2**20:.1f} MB, {REFERENCE_SENTENCES} sentences; {len(claims)} claims")
+
+start_time = time.perf_counter()
+legacy = legacy_validate(claims, reference)
+legacy_time = time.perf_counter() - start_time
+
+_indexes.clear()
+start_time = time.perf_counter()
+first = validator.validate_claims(text, reference)
+first_time = time.perf_counter() - start_time
+
+start_time = time.perf_counter()
+validator.validate_claims(text, reference)
+reuse_time = time.perf_counter() - start_time
+
+print(f"\nPrevious (word set per claim):   {legacy_time:7.3f}s")
+print(f"Indexed, first run (builds):     {first_time:7.3f}s")
+print(f"Indexed, later iteration/run:    {reuse_time:7.3f}s")
+print(f"Same validated claims: {legacy == first['validated']}")
+
+start_time = time.perf_counter()
+matches = get_reference_index(reference).search(claims[0], k=3)
+print(f"\nTop passages for one claim ({(time.perf_counter() - start_time) * 1000:.2f} ms):")
+for match in matches:
+    print(f"  {match['score']:7.3f}  {match['passage'][:70]}")
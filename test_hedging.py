@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""Show agent deadlines and hedged requests at work: a timeout, a hedge firing and a hedge winning (stub model)"""
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.messages import HumanMessage
+from config.stub_model import StubChatModel
+from config.speed_settings import HEDGE_MIN_SAMPLES, HEDGE_MAX_WORKERS
+from agents.base_agent import BaseAgent
+from agents.hedging import hedged_invoke, ahedged_invoke, get_hedge_stats
+
+FAST = 0.05  # simulated seconds for a healthy provider
+SLOW = 1.0  # simulated seconds for a stalled provider
+TIMEOUT = 0.3
+REQUEST_TIMEOUT = 0.5  # the stalled provider's client gives up here, freeing the thread
+MESSAGES = [HumanMessage(content="Review this draft")]
+
+
+def providers():
+    """A primary with a recorded history of fast answers that has just stalled, and a healthy fallback"""
+    primary = StubChatModel(model="stub-primary", latency=FAST)
+    fallback = StubChatModel(model="stub-fallback", latency=FAST)
+    for _ in range(HEDGE_MIN_SAMPLES):
+        hedged_invoke("Warmup", primary, MESSAGES, timeout=TIMEOUT)
+    primary.latency = SLOW
+    return primary, fallback
+
+
+def attempt(label: str, call):
+    before = get_hedge_stats()
+    start_time = time.perf_counter()
+    try:
+        call()
+        outcome = "answered"
+    except TimeoutError:
+        outcome = "TimeoutError"
+    elapsed = time.perf_counter() - start_time
+    after = get_hedge_stats()
+    delta = {key: after[key] - before[key] for key in ["calls", "hedges_fired", "hedges_won", "timeouts", "abandoned"]}
+    print(f"  {label:<34} {outcome:<13} {elapsed:6.3f}s  fired {delta['hedges_fired']} "
+          f"won {delta['hedges_won']} timeouts {delta['timeouts']} abandoned {delta['abandoned']}")
+
+
+async def hedge_and_cancel(primary, fallback):
+    await ahedged_invoke("Reviewer", primary, MESSAGES, TIMEOUT, fallback)
+    await asyncio.sleep(0.01)  # let the cancelled primary unwind, well before it would have answered
+    # Only this coroutine should be left: the losing primary request was cancelled
+    print(f"  {'async, losing request':<34} {len(asyncio.all_tasks()) - 1} task(s) still running")
+
+
+class ContextProbe(StubChatModel):
+    """Stub model that records a context variable as seen by the thread running the call"""
+    
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        seen.append(request_tag.get())
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+
+request_tag = contextvars.ContextVar("request_tag", default=None)
+seen = []
+
+
+def saturate(stalled, healthy):
+    """Abandon one stalled call per pool thread, then ask a healthy model queued behind them"""
+    with ThreadPoolExecutor(HEDGE_MAX_WORKERS) as callers:
+        list(callers.map(lambda _: attempt_quietly(stalled), range(HEDGE_MAX_WORKERS)))
+    hedged_invoke("Reviewer", healthy, MESSAGES, TIMEOUT)
+
+
+def attempt_quietly(model):
+    try:
+        hedged_invoke("Reviewer", model, MESSAGES, TIMEOUT)
+    except TimeoutError:
+        pass
+
+
+print("Testing deadlines and hedged requests...")
+print("=" * 50)
+print(f"Primary stalls at {SLOW}s after {HEDGE_MIN_SAMPLES} answers in {FAST}s; fallback answers in {FAST}s; "
+      f"timeout {TIMEOUT}s\n")
+
+primary, fallback = providers()
+attempt("sync, no fallback", lambda: hedged_invoke("Reviewer", primary, MESSAGES, TIMEOUT))
+attempt("sync, hedged", lambda: hedged_invoke("Reviewer", primary, MESSAGES, TIMEOUT, fallback))
+attempt("async, no fallback", lambda: asyncio.run(ahedged_invoke("Reviewer", primary, MESSAGES, TIMEOUT)))
+attempt("async, hedged", lambda: asyncio.run(hedge_and_cancel(primary, fallback)))
+
+agent = BaseAgent("Reviewer", "Quality Assurance", primary, "You review drafts.", cache=False, timeout=TIMEOUT)
+attempt("streamed agent call", lambda: "".join(agent.stream("Review this draft")))
+
+# Every pool thread held by an abandoned call: the stalled client's request timeout frees them,
+# and the queued call's deadline starts once a thread picks it up
+stalled = StubChatModel(model="stub-stalled", latency=SLOW, timeout=REQUEST_TIMEOUT)
+attempt(f"sync, queued behind {HEDGE_MAX_WORKERS} stalled", lambda: saturate(stalled, fallback))
+
+probe = ContextProbe(model="stub-probe", latency=FAST)
+token = request_tag.set("run-42")
+hedged_invoke("Reviewer", probe, MESSAGES, TIMEOUT)
+request_tag.reset(token)
+print(f"  {'context seen by the pool thread':<34} {seen[0]!r}")
+
+print(f"\nTotals: {get_hedge_stats()}")
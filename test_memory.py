@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Check that agent memory stays bounded over thousands of calls (offline stub model)"""
+import gc
+import os
+import resource
+import tempfile
+import tracemalloc
+from config.models import ModelFactory
+from agents.base_agent import BaseAgent
+from agents.memory import AgentMemory
+
+CALLS = 5000
+REPORT_EVERY = 1000
+PROMPT_CHARS = 4000  # roughly a research document per call
+
+
+def rss_mb() -> float:
+    """Current resident set size; falls back to the peak where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(memory) -> list:
+    agent = BaseAgent("Bench", "Benchmark", ModelFactory.get_model("stub", response_tokens=400),
+                      "You are a benchmark agent.", cache=False)
+    agent.memory = memory
+    padding = "x" * PROMPT_CHARS
+    samples = []
+    for i in range(1, CALLS + 1):
+        agent.invoke(f"Call {i}: {padding}", context={"call": i})
+        if i % REPORT_EVERY == 0:
+            gc.collect()
+            samples.append((i, rss_mb()))
+    reads = {"len()": len, "first entry": lambda history: next(iter(history)), "list()": list}
+    history = {label: peak_kib(read, agent.get_memory()) for label, read in reads.items()}
+    agent.clear_memory()
+    return samples, history
+
+
+def peak_kib(read, history) -> float:
+    """Peak KiB allocated while read(history) runs"""
+    tracemalloc.start()
+    read(history)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+class UnboundedMemory(list):
+    """The old behaviour: every call kept in RAM"""
+    
+    def clear(self):
+        del self[:]
+
+
+print("Testing bounded agent memory...")
+print("=" * 50)
+print(f"{CALLS} calls, ~{PROMPT_CHARS // 1000} KB prompt each")
+
+with tempfile.TemporaryDirectory() as spill_dir:
+    results = {
+        "bounded": run(AgentMemory(spill_dir=spill_dir)),
+        "unbounded": run(UnboundedMemory())
+    }
+
+print(f"\n{'calls':>7} {'bounded MB':>11} {'unbounded MB':>13}")
+for (calls, bounded), (_, unbounded) in zip(results["bounded"][0], results["unbounded"][0]):
+    print(f"{calls:>7} {bounded:>11.1f} {unbounded:>13.1f}")
+
+growth = results["bounded"][0][-1][1] - results["bounded"][0][0][1]
+print(f"\nBounded RSS growth after the first {REPORT_EVERY} calls: {growth:+.1f} MB")
+
+# get_memory() hands back the bounded memory; only list() pulls the spilled history into RAM
+print("\nReading the bounded history back (peak KiB allocated):")
+for label, kib in results["bounded"][1].items():
+    print(f"  {label:<12} {kib:10.1f}")
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Check the shared Groq client across event loops, against a local fake Groq endpoint (no API key needed)"""
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("GROQ_API_KEY", "test")
+
+from config.models import ModelFactory
+
+LOOPS = 3
+CALLS_PER_LOOP = 4
+
+
+class FakeGroq(BaseHTTPRequestHandler):
+    """Answers every chat completion with "ok", keeping connections alive like the real API"""
+    protocol_version = "HTTP/1.1"
+    
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps({
+            "id": "fake", "object": "chat.completion", "created": 0, "model": "fake",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+
+async def calls(model) -> list:
+    return await asyncio.gather(*[model.ainvoke(f"Question {i}") for i in range(CALLS_PER_LOOP)])
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGroq)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+model = ModelFactory.get_groq(base_url=f"http://127.0.0.1:{server.server_port}", max_retries=0)
+
+print("Testing the shared Groq client across event loops...")
+print("=" * 50)
+for loop in range(1, LOOPS + 1):
+    start_time = time.perf_counter()
+    try:
+        replies = asyncio.run(calls(model))
+        outcome = f"{len(replies)} replies"
+    except Exception as e:
+        outcome = f"{type(e).__name__}: {e}"
+    print(f"asyncio.run #{loop}: {outcome} ({time.perf_counter() - start_time:.3f}s)")
+
+print(f"sync call after the loops: {model.invoke('Question').content!r}")
+print(f"pool stats: {ModelFactory.pool_stats()}")
+ModelFactory.clear_pool()
+print(f"after clear_pool: {ModelFactory.pool_stats()}")
+server.shutdown()
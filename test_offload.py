@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""Throughput of concurrent async runs with ToolManager analyses in-line vs in worker processes (stub model)"""
+import io
+from config.stub_model import make_stub_agents
+from tools.tool_manager import ToolManager
+from tools.offload import get_offload_stats
+from config.speed_settings import TOOL_OFFLOAD_WORKERS, TOOL_BATCH_SIZE
+from workflow import nodes
+from workflow.runner import WorkflowRunner
+
+TOPICS = 64
+CONCURRENCY = [1, 8, 64]
+LATENCY = 0.1  # simulated seconds per LLM call
+RESPONSE_TOKENS = 6000  # long documents make the analyses CPU-heavy
+RUN_CONFIG = {"max_iterations": 2}
+
+
+def make_runner() -> WorkflowRunner:
+    agents = make_stub_agents(latency=LATENCY, response_tokens=RESPONSE_TOKENS)
+    return WorkflowRunner(agents=agents, checkpoint=False, run_config=RUN_CONFIG)
+
+
+def measure(offload: bool, concurrency: int) -> dict:
+    nodes._tool_manager = ToolManager(retrieval_model="stub", offload=offload)
+    runner = make_runner()
+    topics = [f"Topic {i}" for i in range(TOPICS if concurrency > 1 else TOPICS // 8)]
+    stats = runner.run_batch(topics, io.StringIO(), concurrency=concurrency)
+    return stats
+
+
+if __name__ == "__main__":  # worker processes must not rerun the benchmark
+    print("Benchmarking tool offload...")
+    print("=" * 50)
+    print(f"{TOPICS} topics (8 at concurrency 1), {LATENCY}s per LLM call, {RESPONSE_TOKENS}-token documents; "
+          f"{TOOL_OFFLOAD_WORKERS} workers, batches of up to {TOOL_BATCH_SIZE}")
+    print(f"\n{'concurrency':>11} {'in-line runs/min':>17} {'offload runs/min':>17} {'p99 in-line':>12} {'p99 offload':>12}")
+    for concurrency in CONCURRENCY:
+        inline = measure(False, concurrency)
+        offload = measure(True, concurrency)
+        print(f"{concurrency:>11} {inline['topics_per_min']:>17.1f} {offload['topics_per_min']:>17.1f} "
+              f"{inline['latency_p99']:>12.3f} {offload['latency_p99']:>12.3f}")
+    stats = get_offload_stats()
+    print(f"\nOffloaded {stats['calls']} analyses in {stats['batches']} batches "
+          f"(mean batch {stats['mean_batch']})")
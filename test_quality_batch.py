@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Benchmark QualityScorer.evaluate_batch against looping over evaluate"""
+import random
+import time
+from tools.quality_metrics import QualityScorer
+
+DOCUMENTS = 10000
+WORDS = ("artificial intelligence healthcare machine learning models patient outcomes "
+         "diagnosis accuracy clinical data introduction applications benefits analysis "
+         "research evidence methods results conclusion systems").split()
+FACT_CHECKS = ["verified: claims accurate", "flagged: incorrect statistic", "no issues found"]
+REQUIRED_SECTIONS = ["introduction", "applications", "benefits"]
+METRICS = ["accuracy", "coherence", "completeness", "depth", "overall"]
+
+
+def make_document(rng: random.Random) -> str:
+    sentences = []
+    for _ in range(rng.randint(1, 60)):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(4, 30))]
+        sentences.append(" ".join(words).capitalize() + ".")
+    return " ".join(sentences)
+
+
+rng = random.Random(42)
+texts = [make_document(rng) for _ in range(DOCUMENTS)]
+facts = [rng.choice(FACT_CHECKS) for _ in range(DOCUMENTS)]
+
+print("Testing batch quality scoring...")
+print("=" * 50)
+print(f"{DOCUMENTS} documents, {sum(len(t.split()) for t in texts) // DOCUMENTS} words on average")
+
+start_time = time.perf_counter()
+looped = [QualityScorer.evaluate(text, fact, REQUIRED_SECTIONS) for text, fact in zip(texts, facts)]
+loop_time = time.perf_counter() - start_time
+
+start_time = time.perf_counter()
+batch = QualityScorer.evaluate_batch(texts, facts, REQUIRED_SECTIONS)
+batch_time = time.perf_counter() - start_time
+
+mismatches = sum(
+    1 for i, scores in enumerate(looped)
+    if any(abs(scores[metric] - batch[metric][i]) > 1e-9 for metric in METRICS)
+)
+
+print(f"\nLoop over evaluate: {loop_time:.3f}s ({DOCUMENTS / loop_time:,.0f} docs/sec)")
+print(f"evaluate_batch:     {batch_time:.3f}s ({DOCUMENTS / batch_time:,.0f} docs/sec)")
+print(f"Speedup: {loop_time / batch_time:.1f}x")
+print(f"Documents whose scores differ: {mismatches}")
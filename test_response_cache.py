@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Show the LLM response cache at work: misses then hits, streamed replay, TTL and LRU eviction (stub model)"""
+import time
+from config.models import ModelFactory
+from agents.base_agent import BaseAgent
+from agents.response_cache import ResponseCache
+from config.stub_model import make_stub_agents
+
+LATENCY = 0.2  # simulated seconds per LLM call
+TTL = 0.5
+MAX_ENTRIES = 3
+
+
+def make_agent(cache: ResponseCache) -> BaseAgent:
+    return BaseAgent("Researcher", "Research", ModelFactory.get_model("stub", latency=LATENCY),
+                     "You write research notes.", cache=cache)
+
+
+def timed(call):
+    start_time = time.perf_counter()
+    result = call()
+    return result, time.perf_counter() - start_time
+
+
+def lookups(cache: ResponseCache) -> str:
+    stats = cache.get_stats()
+    return f"hits {stats['hits']} misses {stats['misses']} entries {stats['entries']}"
+
+
+print("Testing response cache...")
+print("=" * 50)
+print(f"Stub latency {LATENCY}s, TTL {TTL}s, at most {MAX_ENTRIES} entries\n")
+
+cache = ResponseCache(":memory:", max_entries=MAX_ENTRIES, ttl=TTL)
+agent = make_agent(cache)
+
+first, cold = timed(lambda: agent.invoke("Topic A"))
+second, warm = timed(lambda: agent.invoke("Topic A"))
+print(f"invoke miss {cold:.3f}s, hit {warm:.3f}s, same reply: {first == second}   ({lookups(cache)})")
+
+streamed, cold = timed(lambda: list(agent.stream("Topic B")))
+replayed, warm = timed(lambda: list(agent.stream("Topic B")))
+print(f"stream miss {cold:.3f}s ({len(streamed)} chunks), replay {warm:.3f}s ({len(replayed)} chunks), "
+      f"same chunks: {streamed == replayed}   ({lookups(cache)})")
+
+time.sleep(TTL)
+_, expired = timed(lambda: agent.invoke("Topic A"))
+print(f"after the TTL: {expired:.3f}s, answered by the model again   ({lookups(cache)})")
+
+for topic in ["Topic C", "Topic D", "Topic E"]:
+    agent.invoke(topic)
+_, evicted = timed(lambda: agent.invoke("Topic A"))
+print(f"after {MAX_ENTRIES} newer topics: {evicted:.3f}s, least recently used entry evicted   ({lookups(cache)})")
+
+
+# The same prompt in JSON mode and in free-form mode must not share an entry
+cache = ResponseCache(":memory:", max_entries=MAX_ENTRIES, ttl=TTL)
+reviewer = make_stub_agents(latency=LATENCY, json_prose_tokens=20)["reviewer"]
+reviewer.cache = cache
+as_json = reviewer.invoke("Topic F")
+reviewer.output_schema = None  # as with ENABLE_STRUCTURED_OUTPUT = False
+as_prose, prose_time = timed(lambda: reviewer.invoke("Topic F"))
+print(f"JSON mode then free-form: {prose_time:.3f}s, prose not served from the JSON entry: "
+      f"{as_json != as_prose}   ({lookups(cache)})")
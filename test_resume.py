@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Show a failed run resuming from its last completed node, and who can list and resume it (stub model)"""
+import os
+import tempfile
+
+# A throwaway checkpoint file, set before the settings are imported
+os.environ["CHECKPOINT_PATH"] = os.path.join(tempfile.mkdtemp(), "checkpoints.sqlite")
+
+from config.stub_model import make_stub_agents
+from workflow.runner import WorkflowRunner
+
+TOPIC = "Effects of remote work on team productivity"
+
+
+def fail_once(agent):
+    """Make agent raise on its first call, as a provider outage would, then answer normally"""
+    invoke = agent.invoke
+    failed = []
+    
+    def flaky_invoke(*args, **kwargs):
+        if not failed:
+            failed.append(True)
+            raise RuntimeError(f"{agent.name} provider unavailable")
+        return invoke(*args, **kwargs)
+    
+    agent.invoke = flaky_invoke
+
+
+def calls(agents) -> dict:
+    return {role: len(agent.get_memory()) for role, agent in agents.items()}
+
+
+print("Testing checkpoints and resume...")
+print("=" * 50)
+
+agents = make_stub_agents(latency=0.0)
+fail_once(agents["editor"])
+runner = WorkflowRunner(agents=agents, checkpoint=True)
+
+print("\n1. Run fails at the editor")
+try:
+    runner.run(TOPIC, run_id="run-1", owner="alice")
+except RuntimeError as e:
+    print(f"  RuntimeError: {e}")
+run = runner.store.get("run-1")
+print(f"  status {run['status']}, error {run['error']!r}")
+before = calls(agents)
+print(f"  agent calls so far: {before}")
+
+print("\n2. Who can list it")
+for owner in ["alice", "bob", None]:
+    runs = runner.list_runs(owner=owner)
+    print(f"  owner={owner!s:<6} {[(r['run_id'], r['next']) for r in runs]}")
+
+print("\n3. While it resumes, it is not listed and cannot be resumed again")
+events = runner.stream_resume("run-1")
+first = next(events)
+print(f"  first event from {list(first)}")
+print(f"  listed for alice: {[r['run_id'] for r in runner.list_runs(owner='alice')]}")
+try:
+    runner.resume("run-1")
+except RuntimeError as e:
+    print(f"  second resume refused: {e}")
+
+print("\n4. Resume completes from the editor")
+for _ in events:
+    pass
+after = calls(agents)
+print(f"  agent calls during resume: { {role: after[role] - before[role] for role in after} }")
+print(f"  run record after completion: {runner.store.get('run-1')}")
+print(f"  listed for alice: {[r['run_id'] for r in runner.list_runs(owner='alice')]}")
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the near-duplicate retrieval cache on a batch of topic variants (stub model)"""
+import random
+import time
+from config.models import ModelFactory
+from tools.search import KnowledgeRetriever
+from tools.retrieval_cache import RetrievalCache
+
+STUB_LATENCY = 0.05  # seconds per simulated retrieval call
+SUBJECTS = ["healthcare", "finance", "education", "climate science", "drug discovery",
+            "supply chains", "cybersecurity", "agriculture", "law", "energy grids"]
+TEMPLATES = ["AI in {}", "AI in {} applications", "{} AI", "Artificial intelligence for {}",
+             "The impact of AI on {}", "Applications of AI in {}", "AI and {}", "Uses of AI in {}",
+             "AI trends in {}", "Generative AI for {}", "Machine learning in {}"]
+CACHED_TOPICS = 1000
+# (cached topic, later topic, same subject?)
+PAIRS = [
+    ("AI in Healthcare", "Healthcare AI applications", True),
+    ("Machine learning for drug discovery", "ML in drug discoveries", True),
+    ("AI for sustainable agriculture in Africa", "AI for sustainable agriculture in Asia", False),
+    ("AI for breast cancer screening", "AI for lung cancer screening", False),
+    ("Deep learning in radiology imaging", "Deep learning in cardiology imaging", False),
+]
+
+
+def retriever(cache: bool) -> KnowledgeRetriever:
+    instance = KnowledgeRetriever(index_dir="", cache=cache)
+    instance._model = ModelFactory.get_model("stub", latency=STUB_LATENCY, response_tokens=60)
+    return instance
+
+
+rng = random.Random(9)
+topics = [rng.choice(TEMPLATES).format(rng.choice(SUBJECTS)) for _ in range(200)]
+
+print("Benchmarking near-duplicate retrieval cache...")
+print("=" * 50)
+print(f"{len(topics)} topics, {len(set(topics))} distinct strings, {len(SUBJECTS)} subjects")
+
+for label, cache in [("no cache", False), ("near-duplicate cache", True)]:
+    instance = retriever(cache)
+    start_time = time.perf_counter()
+    for topic in topics:
+        instance.retrieve(topic)
+    print(f"\n{label:<22} {time.perf_counter() - start_time:6.2f}s")
+    if cache:
+        stats = instance.cache.get_stats()
+        print(f"  exact hits {stats['hits']}, near hits {stats['near_hits']}, misses {stats['misses']}, "
+              f"hit rate {stats['hit_rate']:.0%}")
+
+instance = retriever(True)
+for i in range(CACHED_TOPICS):
+    instance.cache.put(f"topic{i} research area{i % 97}", "cached")
+start_time = time.perf_counter()
+for i in range(1000):
+    instance.cache.get(f"area{i % 97} research topic{i}")
+lookup = (time.perf_counter() - start_time) / 1000
+print(f"\nLookup with {CACHED_TOPICS} cached topics: {lookup * 1e6:.0f} µs "
+      f"(hit rate {instance.cache.get_stats()['hit_rate']:.0%})")
+
+print("\nServed from the cache, by threshold:")
+print(f"  {'cached topic':<42} {'later topic':<40} {'0.6':<6} default")
+for cached, later, same in PAIRS:
+    served = []
+    for cache in [RetrievalCache(threshold=0.6), RetrievalCache()]:
+        cache.put(cached, "cached")
+        served.append(cache.get(later) is not None)
+    verdict = "" if served[1] == same else "  WRONG"
+    print(f"  {cached:<42} {later:<40} {str(served[0]):<6} {served[1]}{verdict}")
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Per-session memory and cold start of the Streamlit pages: agents per session vs the shared pool (stub model)"""
+import gc
+import time
+import tracemalloc
+from config.models import ModelFactory
+from agents.agent_factory import AgentFactory
+from agents.base_agent import set_session_memories, reset_session_memories
+from workflow.runner import WorkflowRunner
+from ui.shared import get_shared_agents, get_shared_runner
+
+SESSIONS = 20
+CHAT_TURNS = 3  # chat messages per session before it generates research
+RUN_CONFIG = {"max_iterations": 1}
+
+# The pages build their agents from the default distribution; keep the comparison offline
+_get_model = ModelFactory.get_model
+ModelFactory.get_model = staticmethod(lambda model_type="gemini", temperature=None, **options:
+                                      _get_model("stub", temperature, **options))
+
+
+def chat(agents, session: str):
+    for turn in range(CHAT_TURNS):
+        agents["researcher"].invoke(f"Session {session} question {turn}")
+
+
+def per_session_agents(session: str, sessions: list) -> float:
+    """Before: the chat page's agents plus a fresh runner for the research button"""
+    start_time = time.perf_counter()
+    agents = AgentFactory.create_agents()
+    runner = WorkflowRunner(checkpoint=False, run_config=RUN_CONFIG)
+    ready = time.perf_counter() - start_time
+    chat(agents, session)
+    runner.run(f"Topic {session}")
+    sessions.append((agents, runner))
+    return ready
+
+
+def shared_pool(session: str, sessions: list) -> float:
+    """After: agents and runner from the process-wide pool, memories kept per session"""
+    start_time = time.perf_counter()
+    agents = get_shared_agents()
+    runner = get_shared_runner()
+    ready = time.perf_counter() - start_time
+    memories = {}
+    token = set_session_memories(memories)
+    try:
+        chat(agents, session)
+        runner.run(f"Topic {session}", run_config=RUN_CONFIG)
+    finally:
+        reset_session_memories(token)
+    sessions.append(memories)
+    return ready
+
+
+def measure(open_session) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    sessions, ready = [], []
+    for session in range(SESSIONS):
+        # Distinct prompts per scenario so neither is served from the response cache
+        ready.append(open_session(f"{open_session.__name__}-{session}", sessions))
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return used / SESSIONS / 1024, ready[0], sum(ready[1:]) / (SESSIONS - 1)
+
+
+print("Measuring per-session memory...")
+print("=" * 50)
+print(f"{SESSIONS} sessions, {CHAT_TURNS} chat turns and one research run each")
+
+for label, open_session in [("Agents per session", per_session_agents), ("Shared agent pool", shared_pool)]:
+    per_session, first, later = measure(open_session)
+    print(f"\n{label}:")
+    print(f"  memory per session:   {per_session:8.1f} KiB")
+    print(f"  first session ready:  {first * 1000:8.1f} ms")
+    print(f"  later sessions ready: {later * 1000:8.1f} ms")
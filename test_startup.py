@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Test cold-import time of workflow.runner (python -X importtime report)"""
+import os
+import subprocess
+import sys
+
+TARGET = "workflow.runner"
+TRACKED = ["langgraph.graph", "langchain_core.runnables", "langchain_core.messages",
+           "langchain_google_genai", "langchain_groq"]
+RUNS = 3
+
+
+def import_report():
+    # Fresh interpreter per run so nothing is already imported
+    env = dict(os.environ, GOOGLE_API_KEY="", GROQ_API_KEY="")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         f"import sys, {TARGET}; print(','.join(sorted(sys.modules)))"],
+        capture_output=True, text=True, env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    cumulative = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, total_us, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(total_us)
+    return cumulative, set(completed.stdout.strip().split(","))
+
+
+print("Testing startup time...")
+print("=" * 50)
+
+totals = []
+for _ in range(RUNS):
+    cumulative, modules = import_report()
+    totals.append(cumulative.get(TARGET, 0) / 1000)
+
+print(f"import {TARGET}: best {min(totals):.0f} ms, worst {max(totals):.0f} ms over {RUNS} cold runs")
+print("\nTracked packages (cumulative ms, last run):")
+for package in TRACKED:
+    status = f"{cumulative[package] / 1000:.0f} ms" if package in cumulative else "not imported"
+    print(f"  {package:<24} {status}")
+
+eager = [package for package in ["langchain_google_genai", "langchain_groq"] if package in modules]
+print(f"\nProvider SDKs imported at startup: {', '.join(eager) if eager else 'none'}")
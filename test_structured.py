@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""Measure schema-constrained outputs: completion tokens and parse failures of the JSON agents (stub model)"""
+import json
+import time
+from config.stub_model import make_stub_agents
+from agents.structured import parse_structured
+from workflow.runner import WorkflowRunner
+
+TOPICS = 10
+PROSE_TOKENS = 80  # words a chat model wraps around its JSON outside JSON mode
+TOKEN_RATE = 400  # simulated tokens per second
+RUN_CONFIG = {"max_iterations": 2, "early_exit_margin": None}
+CHECKS = {"review": "review_feedback", "fact_check": "fact_check_results", "citation_check": "citation_results"}
+# Off-schema replies the review parser has to tolerate
+AWKWARD_REPLIES = [
+    '{"score": 0.8, "issues": 3, "suggestions": []}',
+    '{"score": "0.7", "issues": true, "suggestions": "Cite the 2021 survey"}',
+    'Here is my review: {"score": 1.4, "issues": [{"line": 2}], "suggestions": null}',
+    '{"score": 0.5, "issues": ["Too short"',
+    'The draft looks fine.',
+]
+
+
+def make_agents(structured: bool):
+    agents = make_stub_agents(token_rate=TOKEN_RATE, json_prose_tokens=PROSE_TOKENS)
+    for agent in agents.values():
+        if not structured:
+            agent.output_schema = None  # free-form replies, parsed with json.loads as before
+    return agents
+
+
+def legacy_parses(reply: str) -> bool:
+    try:
+        json.loads(reply)
+        return True
+    except ValueError:
+        return False
+
+
+def measure(structured: bool) -> dict:
+    runner = WorkflowRunner(agents=make_agents(structured), checkpoint=False, run_config=RUN_CONFIG)
+    schemas = {"review": runner.agents["reviewer"].OUTPUT_SCHEMA,
+               "fact_check": runner.agents["fact_checker"].OUTPUT_SCHEMA,
+               "citation_check": runner.agents["citation_validator"].OUTPUT_SCHEMA}
+    totals = {"tokens": 0, "calls": 0, "legacy_failures": 0, "tolerant_failures": 0}
+    start_time = time.perf_counter()
+    for i in range(TOPICS):
+        for update in runner.stream(f"Topic {i}"):
+            for node, values in update.items():
+                for field, text_field in CHECKS.items():
+                    if text_field not in values:
+                        continue
+                    reply = values[text_field]
+                    totals["calls"] += 1
+                    totals["tokens"] += sum(m["completion_tokens"] for m in values["metrics"])
+                    totals["legacy_failures"] += not legacy_parses(reply)
+                    totals["tolerant_failures"] += parse_structured(reply, schemas[field]) is None
+    totals["seconds"] = time.perf_counter() - start_time
+    return totals
+
+
+print("Benchmarking structured outputs...")
+print("=" * 50)
+print(f"{TOPICS} topics x {RUN_CONFIG['max_iterations']} rounds; {PROSE_TOKENS} words of prose around "
+      f"free-form JSON; {TOKEN_RATE} tokens/s")
+
+for label, structured in [("Free-form replies", False), ("JSON mode + schema", True)]:
+    totals = measure(structured)
+    print(f"\n{label}:")
+    print(f"  checker calls:           {totals['calls']}")
+    print(f"  completion tokens/call:  {totals['tokens'] / totals['calls']:.1f}")
+    print(f"  json.loads failures:     {totals['legacy_failures']} "
+          f"({totals['legacy_failures'] / totals['calls']:.0%}, each a retry or a lost score)")
+    print(f"  tolerant parse failures: {totals['tolerant_failures']}")
+    print(f"  total time:              {totals['seconds']:.2f}s")
+
+print("\nParsing awkward replies (review schema):")
+schema = make_agents(True)["reviewer"].OUTPUT_SCHEMA
+for reply in AWKWARD_REPLIES:
+    print(f"  {reply[:60]:<62} -> {parse_structured(reply, schema)}")
+
+# A provider refusing JSON replies (Groq answers 400 json_validate_failed) must not fail the run
+print("\nProvider refusing half the JSON-mode replies:")
+for echo, label in [(True, "rejected reply sent back"), (False, "nothing sent back")]:
+    agents = make_stub_agents(json_reject_rate=0.5, json_reject_echo=echo)
+    runner = WorkflowRunner(agents=agents, checkpoint=False, run_config=RUN_CONFIG)
+    parsed = failed = 0
+    for i in range(TOPICS):
+        try:
+            result = runner.run(f"Topic {i}")
+        except Exception:
+            failed += 1
+            continue
+        parsed += all(result[field] for field in CHECKS)
+    print(f"  {label:<26} {TOPICS - failed}/{TOPICS} runs completed, {parsed} with every check parsed")
@@ -1,41 +1,136 @@
+import re
 from typing import List, Dict
 
-class BiasDetector:
-    def __init__(self):
-        self.bias_keywords = [
-            "always", "never", "obviously", "clearly", "everyone knows",
-            "undoubtedly", "certainly", "absolutely", "definitely"
+DEFAULT_LEXICONS = {
+    "bias": [
+        "always", "never", "obviously", "clearly", "everyone knows",
+        "undoubtedly", "certainly", "absolutely", "definitely"
+    ],
+    "contradiction": [
+        "however", "but", "although", "despite", "nevertheless"
+    ]
+}
+
+def _trie_pattern(terms: List[str]) -> str:
+    """Regex alternation for terms, factored by common prefix so it scales to thousands"""
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    
+    def build(node: Dict) -> str:
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + build(child)
+            for char, child in sorted(node.items()) if char
         ]
-        self.contradiction_markers = [
-            "however", "but", "although", "despite", "nevertheless"
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            pattern = f"(?:{pattern})?"
+        return pattern
+    
+    return build(trie)
+
+class BiasDetector:
+    """Flags biased wording and contradiction markers with one pass over the text.
+    
+    Lexicons map a name to its terms; all terms of all lexicons are compiled
+    into a single word-bounded, case-insensitive regex, so "never" no longer
+    matches inside "nevertheless".
+    """
+    
+    def __init__(self, lexicons: Dict[str, List[str]] = None):
+        self.lexicons = {name: list(terms) for name, terms in (lexicons or DEFAULT_LEXICONS).items()}
+        self._compile()
+    
+    @property
+    def bias_keywords(self) -> List[str]:
+        return self.lexicons.get("bias", [])
+    
+    @property
+    def contradiction_markers(self) -> List[str]:
+        return self.lexicons.get("contradiction", [])
+    
+    def add_lexicon(self, name: str, terms: List[str]):
+        """Add terms to a lexicon (created if new) and recompile the matcher"""
+        self.lexicons.setdefault(name, []).extend(terms)
+        self._compile()
+    
+    def _compile(self):
+        self._lexicon_of = {}  # normalized term -> (lexicon, order within lexicon)
+        for name, terms in self.lexicons.items():
+            for index, term in enumerate(terms):
+                self._lexicon_of.setdefault(" ".join(term.lower().split()), (name, index))
+        terms = self._lexicon_of.keys()
+        pattern = rf"(?<!\w)({_trie_pattern(terms) if terms else '(?!)'})(?!\w)"
+        self._pattern = re.compile(pattern)
+        # For text whose lowercase form changes length, so offsets must come from the original
+        self._pattern_ignorecase = re.compile(pattern, re.IGNORECASE)
+    
+    def scan(self, text: str) -> List[tuple]:
+        """Single pass over text: (lexicon, order, term, sentence index, offset) per hit"""
+        text_lower = text.lower()
+        if len(text_lower) == len(text):
+            matches = self._pattern.finditer(text_lower)
+        else:
+            matches = self._pattern_ignorecase.finditer(text)
+        lexicon_of = self._lexicon_of
+        count = text.count
+        hits = []
+        sentence = 0
+        last = 0
+        for match in matches:
+            start = match.start()
+            sentence += count(".", last, start)
+            last = start
+            term = match.group(1)
+            if term not in lexicon_of:  # different case or spacing than the lexicon entry
+                term = " ".join(term.lower().split())
+            name, order = lexicon_of[term]
+            hits.append((name, order, term, sentence, start))
+        return hits
+    
+    @staticmethod
+    def _sentence(text: str, offset: int) -> str:
+        start = text.rfind(".", 0, offset) + 1
+        end = text.find(".", offset)
+        return text[start:end if end >= 0 else len(text)].strip()
+    
+    def _biases(self, hits: List[tuple]) -> List[str]:
+        found = {(order, term) for name, order, term, _, _ in hits if name == "bias"}
+        return [f"Potential bias: '{term}'" for _, term in sorted(found)]
+    
+    def _contradictions(self, text: str, hits: List[tuple]) -> List[Dict]:
+        found = {}
+        for name, order, term, sentence, offset in hits:
+            if name == "contradiction":
+                found.setdefault((sentence, order, term), offset)
+        return [
+            {"sentence": self._sentence(text, offset), "marker": term, "position": sentence}
+            for (sentence, _, term), offset in sorted(found.items())
         ]
     
     def detect_bias(self, text: str) -> List[str]:
-        found_biases = []
-        text_lower = text.lower()
-        for keyword in self.bias_keywords:
-            if keyword in text_lower:
-                found_biases.append(f"Potential bias: '{keyword}'")
-        return found_biases
+        return self._biases(self.scan(text))
     
     def detect_contradictions(self, text: str) -> List[Dict]:
-        sentences = text.split('.')
-        contradictions = []
-        
-        for i, sentence in enumerate(sentences):
-            for marker in self.contradiction_markers:
-                if marker in sentence.lower():
-                    contradictions.append({
-                        "sentence": sentence.strip(),
-                        "marker": marker,
-                        "position": i
-                    })
-        return contradictions
+        return self._contradictions(text, self.scan(text))
     
     def analyze(self, text: str) -> Dict:
+        hits = self.scan(text)
+        biases = self._biases(hits)
+        contradictions = self._contradictions(text, hits)
+        matches = {}
+        for name, _, term, _, _ in hits:
+            matches.setdefault(name, {})
+            matches[name][term] = matches[name].get(term, 0) + 1
         return {
-            "biases": self.detect_bias(text),
-            "contradictions": self.detect_contradictions(text),
-            "bias_count": len(self.detect_bias(text)),
-            "contradiction_count": len(self.detect_contradictions(text))
+            "biases": biases,
+            "contradictions": contradictions,
+            "bias_count": len(biases),
+            "contradiction_count": len(contradictions),
+            "matches": matches
         }
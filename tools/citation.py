@@ -1,32 +1,213 @@
+import json
+import os
 import re
-from typing import List, Dict
+import threading
+from collections import OrderedDict
+from itertools import chain
+from typing import List, Dict, Tuple
+
+from config.speed_settings import CITATION_CACHE_SIZE, CITATION_GRAPH_MAX_EDGES
+
+# Numeric [1], author-year (Smith 2020) and (Smith et al. 2020)
+_CITATION_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'\[(\d+)\]',
+    r'\(([A-Za-z]+\s+\d{4})\)',
+    r'\(([A-Za-z]+\s+et\s+al\.\s+\d{4})\)'
+))
+# The same three as one alternation, for citations in text order within a sentence
+_CITATION_PATTERN = re.compile("|".join(pattern.pattern for pattern in _CITATION_PATTERNS))
+_PARAGRAPH_PATTERN = re.compile(r'\n\s*\n')
+_SENTENCE_PATTERN = re.compile(r'(?<=[.!?])(?<!\bal\.)\s+')
+_SPACE_BEFORE_PUNCTUATION = re.compile(r'\s+(?=[.,;:!?])')
+_CLAIM_SEPARATOR = "\x00"
+
+def _claim(sentence: str) -> str:
+    """Sentence with its citation markers removed and whitespace normalized"""
+    return _SPACE_BEFORE_PUNCTUATION.sub("", " ".join(_CITATION_PATTERN.sub("", sentence).split()))
 
 class CitationTracker:
-    def __init__(self):
+    """Citation extraction and a claim/source provenance graph.
+    
+    Text is processed per paragraph and each paragraph's results are cached
+    by its content, so a new editor iteration only re-scans the paragraphs
+    that changed; the last document's scans are kept too, so extracting and
+    tracking the same text splits it once. The graph keeps indexes by source
+    and by claim and holds at most max_edges edges, dropping the least
+    recently tracked. With a path every new edge is appended to a JSONL file
+    that is compacted to the live edges once it reaches twice max_edges
+    lines, and reloaded on construction.
+    """
+    
+    def __init__(self, path: str = None, cache_size: int = CITATION_CACHE_SIZE,
+                 max_edges: int = CITATION_GRAPH_MAX_EDGES):
         self.citations = {}
         self.citation_count = 0
+        self.path = path
+        self.cache_size = cache_size
+        self.max_edges = max_edges
+        self._by_source = {}  # source -> {citation id: None}, in insertion order
+        self._by_claim = {}  # claim -> {citation id: None}
+        self._edges = OrderedDict()  # (claim, source) -> citation id, least recently tracked first
+        self.evictions = 0
+        self._paragraphs = OrderedDict()  # paragraph text -> _scan result, least recently used first
+        self._last = ("", [])  # (text, scans) of the last document seen
+        self._lock = threading.Lock()
+        self._log = None
+        self._log_lines = 0
+        if path:
+            self._load(path)
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._log = open(path, "a", encoding="utf-8")
+            if self._log_lines >= 2 * self.max_edges:
+                self._compact()
+    
+    def _load(self, path: str):
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    edge = json.loads(line)
+                    self._add(edge["claim"], edge["source"])
+                    self._log_lines += 1
+    
+    def _compact(self):
+        """Rewrite the log as the edges held in memory, so evicted edges stop taking disk and reload time"""
+        self._log.close()
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for claim, source in self._edges:
+                f.write(json.dumps({"claim": claim, "source": source}) + "\n")
+        os.replace(temp_path, self.path)
+        self._log = open(self.path, "a", encoding="utf-8")
+        self._log_lines = len(self._edges)
+    
+    @staticmethod
+    def _scan(paragraph: str) -> list:
+        """[citations per pattern, (claim, source) edges, citation ids once tracked]"""
+        groups = tuple(pattern.findall(paragraph) for pattern in _CITATION_PATTERNS)
+        edges = []
+        if any(groups):
+            cited = []
+            for sentence in _SENTENCE_PATTERN.split(paragraph):
+                sources = [m.group(m.lastindex) for m in _CITATION_PATTERN.finditer(sentence)]
+                if sources:
+                    cited.append((sentence, sources))
+            if _CLAIM_SEPARATOR in paragraph:
+                claims = [_claim(sentence) for sentence, _ in cited]
+            else:
+                # One _claim pass over the cited sentences joined by a separator _claim leaves alone
+                claims = _claim(_CLAIM_SEPARATOR.join(sentence for sentence, _ in cited)).split(_CLAIM_SEPARATOR)
+            for claim, (_, sources) in zip(claims, cited):
+                claim = claim.strip()
+                edges.extend((claim, source) for source in sources if claim)
+        return [groups, edges, None]
+    
+    def _paragraphs_of(self, text: str) -> list:
+        """Scan results for each paragraph of text; only paragraphs not seen before are scanned"""
+        last_text, last_scans = self._last
+        if text == last_text:
+            return last_scans
+        paragraphs = _PARAGRAPH_PATTERN.split(text)
+        with self._lock:
+            cache = self._paragraphs
+            results = [cache.get(paragraph) for paragraph in paragraphs]
+        missing = {p: self._scan(p) for p, result in zip(paragraphs, results) if result is None}
+        with self._lock:
+            for paragraph, result in missing.items():
+                cache[paragraph] = result
+            if len(cache) > self.cache_size:
+                # Only eviction order matters: refresh this document's paragraphs, then drop the oldest
+                for paragraph in paragraphs:
+                    cache.move_to_end(paragraph)
+                while len(cache) > self.cache_size:
+                    cache.popitem(last=False)
+        scans = [result if result is not None else missing[p] for p, result in zip(paragraphs, results)]
+        self._last = (text, scans)
+        return scans
     
     def extract_citations(self, text: str) -> List[str]:
-        patterns = [
-            r'\[(\d+)\]',
-            r'\(([A-Za-z]+\s+\d{4})\)',
-            r'\(([A-Za-z]+\s+et\s+al\.\s+\d{4})\)'
-        ]
-        citations = []
-        for pattern in patterns:
-            citations.extend(re.findall(pattern, text))
-        return citations
+        """All citations, numeric first, then author-year, then et al., each in text order"""
+        scans = self._paragraphs_of(text)
+        return list(chain.from_iterable(
+            scan[0][group] for group in range(len(_CITATION_PATTERNS)) for scan in scans
+        ))
     
     def validate_format(self, citation: str) -> bool:
         return len(citation) > 0
     
-    def track_provenance(self, claim: str, source: str):
+    def _add(self, claim: str, source: str) -> Tuple[int, bool]:
+        if (claim, source) in self._edges:
+            self._edges.move_to_end((claim, source))
+            return self._edges[(claim, source)], False
         self.citation_count += 1
         self.citations[self.citation_count] = {
             "claim": claim,
             "source": source
         }
-        return self.citation_count
+        self._edges[(claim, source)] = self.citation_count
+        self._by_source.setdefault(source, {})[self.citation_count] = None
+        self._by_claim.setdefault(claim, {})[self.citation_count] = None
+        while len(self._edges) > self.max_edges:
+            self._evict()
+        return self.citation_count, True
+    
+    def _evict(self):
+        (claim, source), citation_id = self._edges.popitem(last=False)
+        del self.citations[citation_id]
+        self.evictions += 1
+        for index, key in ((self._by_source, source), (self._by_claim, claim)):
+            del index[key][citation_id]
+            if not index[key]:
+                del index[key]
+    
+    def _track(self, edges: List[Tuple[str, str]]) -> List[int]:
+        ids = []
+        with self._lock:
+            for claim, source in edges:
+                citation_id, new = self._add(claim, source)
+                if new and self._log is not None:
+                    self._log.write(json.dumps({"claim": claim, "source": source}) + "\n")
+                    self._log_lines += 1
+                ids.append(citation_id)
+            if self._log is not None:
+                if self._log_lines >= 2 * self.max_edges:
+                    self._compact()
+                else:
+                    self._log.flush()
+        return ids
+    
+    def track_provenance(self, claim: str, source: str):
+        """Record that claim cites source; an already known pair keeps its id"""
+        return self._track([(claim, source)])[0]
+    
+    def track_document(self, text: str) -> List[int]:
+        """Link every cited sentence of text to its sources; returns the citation ids"""
+        scans = self._paragraphs_of(text)
+        for scan in scans:
+            # Re-track a paragraph whose edges were evicted since it was last seen
+            if scan[2] is None or (self.evictions and any(i not in self.citations for i in scan[2])):
+                scan[2] = self._track(scan[1])
+        return list(chain.from_iterable(scan[2] for scan in scans))
+    
+    def claims_for(self, source: str) -> List[str]:
+        with self._lock:
+            return [self.citations[i]["claim"] for i in self._by_source.get(source, [])]
+    
+    def sources_for(self, claim: str) -> List[str]:
+        with self._lock:
+            ids = self._by_claim.get(claim) or self._by_claim.get(_claim(claim), [])
+            return [self.citations[i]["source"] for i in ids]
+    
+    def get_citation_graph(self, ids: List[int] = None) -> Dict:
+        """{id: {"claim", "source"}} for ids (e.g. one document's, from track_document), else every edge"""
+        if ids is None:
+            return self.citations
+        with self._lock:
+            return {i: self.citations[i] for i in ids if i in self.citations}
     
-    def get_citation_graph(self) -> Dict:
-        return self.citations
+    def close(self):
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
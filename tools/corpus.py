@@ -0,0 +1,155 @@
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from config.speed_settings import CORPUS_PASSAGE_WORDS, BM25_K1, BM25_B
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+CORPUS_EXTENSIONS = (".txt", ".md")
+_FILES = {
+    "offsets": "postings_offsets.npy",  # token id -> start in ids/weights, length vocab + 1
+    "ids": "postings_ids.npy",  # passage ids, grouped by token
+    "weights": "postings_weights.npy",  # BM25 weight of each (token, passage)
+    "text": "passages.bin",  # UTF-8 passage text, concatenated
+    "text_offsets": "passage_offsets.npy",  # passage id -> byte range in passages.bin
+    "sources": "passage_sources.npy",  # passage id -> document id
+}
+
+def _passages(text: str, max_words: int) -> Iterator[str]:
+    """Paragraph-aligned passages of at most max_words words"""
+    current = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        words = paragraph.split()
+        if current and len(current) + len(words) > max_words:
+            yield " ".join(current)
+            current = []
+        while len(words) > max_words:
+            yield " ".join(words[:max_words])
+            words = words[max_words:]
+        current.extend(words)
+    if current:
+        yield " ".join(current)
+
+def _documents(source_dir: str) -> Iterator[Tuple[str, str]]:
+    for root, _, files in sorted(os.walk(source_dir)):
+        for name in sorted(files):
+            if name.lower().endswith(CORPUS_EXTENSIONS):
+                path = os.path.join(root, name)
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    yield os.path.relpath(path, source_dir), f.read()
+
+def build_corpus_index(source_dir: str, index_dir: str, max_words: int = CORPUS_PASSAGE_WORDS,
+                       k1: float = BM25_K1, b: float = BM25_B) -> Dict:
+    """Index every .txt/.md file under source_dir into index_dir; returns the index metadata"""
+    documents = []
+    sources = []
+    text_offsets = [0]
+    vocabulary = {}
+    postings = []  # per token: list of (passage id, tf)
+    lengths = []
+    
+    os.makedirs(index_dir, exist_ok=True)
+    with open(os.path.join(index_dir, _FILES["text"]), "wb") as text_file:
+        for document, text in _documents(source_dir):
+            documents.append(document)
+            for passage in _passages(text, max_words):
+                passage_id = len(lengths)
+                tokens = _TOKEN_PATTERN.findall(passage.lower())
+                for token, tf in Counter(tokens).items():
+                    token_id = vocabulary.setdefault(token, len(vocabulary))
+                    if token_id == len(postings):
+                        postings.append([])
+                    postings[token_id].append((passage_id, tf))
+                lengths.append(len(tokens))
+                sources.append(len(documents) - 1)
+                encoded = passage.encode("utf-8")
+                text_file.write(encoded)
+                text_offsets.append(text_offsets[-1] + len(encoded))
+    
+    n = len(lengths)
+    lengths = np.array(lengths, dtype=np.float64)
+    average_length = lengths.mean() if n else 0.0
+    offsets = np.zeros(len(postings) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(entries) for entries in postings])
+    ids = np.empty(offsets[-1], dtype=np.int32)
+    weights = np.empty(offsets[-1], dtype=np.float32)
+    for token_id, entries in enumerate(postings):
+        start, end = offsets[token_id], offsets[token_id + 1]
+        passage_ids = np.array([entry[0] for entry in entries], dtype=np.int32)
+        tfs = np.array([entry[1] for entry in entries], dtype=np.float64)
+        idf = math.log(1 + (n - len(entries) + 0.5) / (len(entries) + 0.5))
+        norm = k1 * (1 - b + b * lengths[passage_ids] / average_length)
+        ids[start:end] = passage_ids
+        weights[start:end] = idf * tfs * (k1 + 1) / (tfs + norm)
+    
+    np.save(os.path.join(index_dir, _FILES["offsets"]), offsets)
+    np.save(os.path.join(index_dir, _FILES["ids"]), ids)
+    np.save(os.path.join(index_dir, _FILES["weights"]), weights)
+    np.save(os.path.join(index_dir, _FILES["text_offsets"]), np.array(text_offsets, dtype=np.int64))
+    np.save(os.path.join(index_dir, _FILES["sources"]), np.array(sources, dtype=np.int32))
+    meta = {"documents": len(documents), "passages": n, "tokens": len(vocabulary),
+            "max_words": max_words, "k1": k1, "b": b}
+    with open(os.path.join(index_dir, "index.json"), "w", encoding="utf-8") as f:
+        json.dump({**meta, "document_names": documents, "vocabulary": vocabulary}, f)
+    return meta
+
+class CorpusIndex:
+    """Read side of build_corpus_index: memory-mapped arrays, top-k BM25 passage lookup"""
+    
+    def __init__(self, index_dir: str):
+        with open(os.path.join(index_dir, "index.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.vocabulary = meta.pop("vocabulary")
+        self.documents = meta.pop("document_names")
+        self.meta = meta
+        arrays = {name: np.load(os.path.join(index_dir, file), mmap_mode="r")
+                  for name, file in _FILES.items() if name != "text"}
+        self._offsets = arrays["offsets"]
+        self._ids = arrays["ids"]
+        self._weights = arrays["weights"]
+        self._text_offsets = arrays["text_offsets"]
+        self._sources = arrays["sources"]
+        text_path = os.path.join(index_dir, _FILES["text"])
+        self._text = np.memmap(text_path, dtype=np.uint8, mode="r") if os.path.getsize(text_path) else b""
+    
+    def passage(self, passage_id: int) -> str:
+        start, end = self._text_offsets[passage_id], self._text_offsets[passage_id + 1]
+        return bytes(self._text[start:end]).decode("utf-8")
+    
+    def search(self, query: str, k: int = 3) -> List[Dict]:
+        """Top-k passages by BM25 score; only the query terms' postings are read"""
+        token_ids = {self.vocabulary[t] for t in _TOKEN_PATTERN.findall(query.lower()) if t in self.vocabulary}
+        if not token_ids:
+            return []
+        ids = np.concatenate([self._ids[self._offsets[t]:self._offsets[t + 1]] for t in token_ids])
+        weights = np.concatenate([self._weights[self._offsets[t]:self._offsets[t + 1]] for t in token_ids])
+        candidates, inverse = np.unique(ids, return_inverse=True)
+        scores = np.bincount(inverse, weights=weights)
+        top = np.argpartition(-scores, k)[:k] if len(scores) > k else np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            {
+                "passage": self.passage(int(candidates[i])),
+                "source": self.documents[int(self._sources[candidates[i]])],
+                "score": round(float(scores[i]), 4)
+            }
+            for i in top
+        ]
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_corpus_index(index_dir: str):
+    """Shared CorpusIndex for index_dir, or None if no index has been built there"""
+    with _indexes_lock:
+        if index_dir not in _indexes:
+            if not os.path.exists(os.path.join(index_dir, "index.json")):
+                return None
+            _indexes[index_dir] = CorpusIndex(index_dir)
+        return _indexes[index_dir]
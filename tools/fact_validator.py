@@ -1,6 +1,88 @@
+import hashlib
+import math
 import re
+import threading
+from collections import Counter, OrderedDict
 from typing import List, Dict
 
+import numpy as np
+
+from config.speed_settings import REFERENCE_INDEX_CACHE_SIZE, BM25_K1, BM25_B
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+class ReferenceIndex:
+    """Inverted index over one reference text: postings with BM25 weights per passage.
+    
+    Passages are the reference's sentences. Build once and reuse for every
+    claim checked against the same reference (see get_reference_index).
+    """
+    
+    def __init__(self, text: str, k1: float = BM25_K1, b: float = BM25_B):
+        self.passages = [s.strip() for s in text.split('.') if s.strip()]
+        # Whitespace tokens, as the boolean cross_reference check has always used
+        self.vocabulary = set(text.lower().split())
+        
+        passage_tokens = [_TOKEN_PATTERN.findall(p.lower()) for p in self.passages]
+        lengths = np.array([len(tokens) for tokens in passage_tokens], dtype=float)
+        average_length = lengths.mean() if len(lengths) else 0.0
+        
+        postings = {}
+        for passage_id, tokens in enumerate(passage_tokens):
+            for token, tf in Counter(tokens).items():
+                postings.setdefault(token, ([], []))
+                postings[token][0].append(passage_id)
+                postings[token][1].append(tf)
+        
+        self.postings = {}  # token -> (passage ids, BM25 weights)
+        n = len(self.passages)
+        for token, (ids, tfs) in postings.items():
+            ids = np.array(ids)
+            tfs = np.array(tfs, dtype=float)
+            idf = math.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            norm = k1 * (1 - b + b * lengths[ids] / average_length)
+            self.postings[token] = (ids, idf * tfs * (k1 + 1) / (tfs + norm))
+    
+    def supports(self, claim: str) -> bool:
+        """The original cross_reference test: over 30% of the claim's words appear in the reference"""
+        claim_words = set(claim.lower().split())
+        return len(claim_words & self.vocabulary) > len(claim_words) * 0.3
+    
+    def search(self, query: str, k: int = 3) -> List[Dict]:
+        """Top-k passages for query by BM25 score, best first"""
+        scores = np.zeros(len(self.passages))
+        for token in set(_TOKEN_PATTERN.findall(query.lower())):
+            if token in self.postings:
+                ids, weights = self.postings[token]
+                scores[ids] += weights
+        matched = np.flatnonzero(scores)
+        if not len(matched):
+            return []
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k)[:k]]
+        top = matched[np.argsort(-scores[matched], kind="stable")]
+        return [
+            {"passage": self.passages[i], "passage_id": int(i), "score": round(float(scores[i]), 4)}
+            for i in top
+        ]
+
+_indexes = OrderedDict()
+_indexes_lock = threading.Lock()
+
+def get_reference_index(text: str) -> ReferenceIndex:
+    """Index for a reference text, shared by every claim, iteration and run that uses it"""
+    key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    with _indexes_lock:
+        if key in _indexes:
+            _indexes.move_to_end(key)
+            return _indexes[key]
+    index = ReferenceIndex(text)
+    with _indexes_lock:
+        _indexes[key] = index
+        while len(_indexes) > REFERENCE_INDEX_CACHE_SIZE:
+            _indexes.popitem(last=False)
+    return index
+
 class FactValidator:
     def extract_claims(self, text: str) -> List[str]:
         sentences = [s.strip() for s in text.split('.') if s.strip()]
@@ -8,19 +90,23 @@ class FactValidator:
         return claims
     
     def cross_reference(self, claim: str, context: str) -> bool:
-        claim_words = set(claim.lower().split())
-        context_words = set(context.lower().split())
-        overlap = len(claim_words & context_words)
-        return overlap > len(claim_words) * 0.3
+        return get_reference_index(context).supports(claim)
+    
+    def match_passages(self, claim: str, context: str, k: int = 3) -> List[Dict]:
+        """Reference passages supporting claim, with BM25 scores"""
+        return get_reference_index(context).search(claim, k)
     
     def validate_claims(self, text: str, reference_text: str = "") -> Dict:
         claims = self.extract_claims(text)
         validated = []
         flagged = []
+        evidence = []
+        index = get_reference_index(reference_text) if reference_text else None
         
         for claim in claims:
-            if reference_text and self.cross_reference(claim, reference_text):
+            if index is not None and index.supports(claim):
                 validated.append(claim)
+                evidence.append({"claim": claim, "passages": index.search(claim)})
             else:
                 if len(claim.split()) > 15:
                     flagged.append(claim)
@@ -29,5 +115,6 @@ class FactValidator:
             "total_claims": len(claims),
             "validated": validated,
             "flagged": flagged,
+            "evidence": evidence,
             "confidence": len(validated) / len(claims) if claims else 0
         }
@@ -0,0 +1,140 @@
+import atexit
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from config.speed_settings import TOOL_OFFLOAD_WORKERS, TOOL_BATCH_SIZE, TOOL_BATCH_WINDOW
+
+_analyzers = None  # per worker process, built by _init_worker
+
+def _init_worker():
+    global _analyzers
+    from tools.quality_metrics import QualityScorer
+    from tools.bias_detector import BiasDetector
+    from tools.fact_validator import FactValidator
+    _analyzers = {
+        "quality": QualityScorer().evaluate,
+        "bias": BiasDetector().analyze,
+        "facts": FactValidator().validate_claims
+    }
+
+def _run_batch(batch: List[tuple]) -> List[tuple]:
+    """Worker side: (ok, result or exception) for each (kind, args) call"""
+    results = []
+    for kind, args in batch:
+        try:
+            results.append((True, _analyzers[kind](*args)))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+class AnalysisPool:
+    """Runs ToolManager's text analyses in worker processes, micro-batched.
+    
+    submit() queues a call and returns a Future at once. Calls that arrive
+    within batch_window seconds of the first (up to batch_size of them)
+    travel to a worker as one task, so concurrent runs share the pickling
+    round trip and the graph threads never hold the GIL for the analysis.
+    """
+    KINDS = ("quality", "bias", "facts")
+    
+    def __init__(self, workers: int = TOOL_OFFLOAD_WORKERS, batch_size: int = TOOL_BATCH_SIZE,
+                 batch_window: float = TOOL_BATCH_WINDOW):
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        self._pending: List[tuple] = []  # (kind, args, future)
+        self._ready = threading.Condition()
+        self._closed = False
+        self._stats = {"calls": 0, "batches": 0, "failures": 0}
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="analysis-pool", daemon=True)
+        self._dispatcher.start()
+    
+    def submit(self, kind: str, *args) -> Future:
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown analysis: {kind}")
+        future = Future()
+        with self._ready:
+            if self._closed:
+                raise RuntimeError("Analysis pool is closed")
+            self._pending.append((kind, args, future))
+            self._stats["calls"] += 1
+            self._ready.notify()
+        return future
+    
+    def _dispatch_loop(self):
+        while True:
+            with self._ready:
+                while not self._pending and not self._closed:
+                    self._ready.wait()
+                if not self._pending:
+                    return
+                # Give concurrent callers a moment to join the batch
+                deadline = time.monotonic() + self.batch_window
+                while len(self._pending) < self.batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._ready.wait(remaining)
+                batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+                self._stats["batches"] += 1
+            self._send(batch)
+    
+    def _send(self, batch: List[tuple]):
+        futures = [future for _, _, future in batch]
+        try:
+            task = self._executor.submit(_run_batch, [(kind, args) for kind, args, _ in batch])
+        except Exception as e:
+            self._fail(futures, e)
+            return
+        
+        def on_done(task):
+            try:
+                results = task.result()
+            except Exception as e:  # a worker died or the pool shut down
+                self._fail(futures, e)
+                return
+            for future, (ok, value) in zip(futures, results):
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+        
+        task.add_done_callback(on_done)
+    
+    def _fail(self, futures: List[Future], error: Exception):
+        with self._ready:
+            self._stats["failures"] += len(futures)
+        for future in futures:
+            future.set_exception(error)
+    
+    def get_stats(self) -> Dict:
+        with self._ready:
+            stats = dict(self._stats)
+        stats["mean_batch"] = round(stats["calls"] / stats["batches"], 2) if stats["batches"] else 0.0
+        return stats
+    
+    def close(self):
+        """Send what is queued, then stop the workers"""
+        with self._ready:
+            self._closed = True
+            self._ready.notify()
+        self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+
+_pool: Optional[AnalysisPool] = None
+_pool_lock = threading.Lock()
+
+def get_analysis_pool() -> AnalysisPool:
+    """Process-wide pool, started on first use and stopped at exit"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = AnalysisPool()
+            atexit.register(_pool.close)
+        return _pool
+
+def get_offload_stats() -> Dict:
+    """Calls and batches sent to worker processes; {} if the pool never started"""
+    return _pool.get_stats() if _pool is not None else {}
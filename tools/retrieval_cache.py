@@ -0,0 +1,147 @@
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+import numpy as np
+
+from config.speed_settings import (
+    RETRIEVAL_CACHE_THRESHOLD, RETRIEVAL_CACHE_MAX_ENTRIES, RETRIEVAL_CACHE_TTL,
+    RETRIEVAL_CACHE_PERMUTATIONS
+)
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "a an and are as at by for from in into is of on or the to with about how what why "
+    "use uses using application applications impact role".split()
+)
+_PHRASES = {"artificial intelligence": "ai", "machine learning": "ml", "large language model": "llm"}
+_PHRASE_PATTERN = re.compile(r"\b(" + "|".join(_PHRASES) + r")s?\b")
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+def topic_shingles(topic: str) -> Set[str]:
+    """Normalized word set of a topic: lowercase, common phrases abbreviated, stopwords dropped, plurals folded"""
+    topic = _PHRASE_PATTERN.sub(lambda m: _PHRASES[m.group(1)], topic.lower())
+    shingles = set()
+    for token in _TOKEN_PATTERN.findall(topic):
+        if token in _STOPWORDS:
+            continue
+        if len(token) > 4 and token.endswith("ies"):
+            token = token[:-3] + "y"
+        elif len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        shingles.add(token)
+    return shingles
+
+def _lsh_shape(permutations: int, threshold: float) -> Tuple[int, int]:
+    """(bands, rows) whose S-curve midpoint (1/bands)^(1/rows) sits closest to threshold"""
+    shapes = [(permutations // rows, rows) for rows in range(1, permutations + 1) if permutations % rows == 0]
+    return min(shapes, key=lambda shape: abs((1 / shape[0]) ** (1 / shape[1]) - threshold))
+
+class RetrievalCache:
+    """In-memory retrieval results served for near-duplicate topics.
+    
+    Topics are reduced to word shingles. At threshold 1.0 only a topic with
+    the same shingles is served. Below it, a MinHash signature split into LSH
+    bands finds candidate entries without scanning the cache, and a candidate
+    is served when its exact Jaccard similarity reaches the threshold.
+    Entries are evicted least recently used and after the TTL.
+    """
+    
+    def __init__(self, threshold: float = RETRIEVAL_CACHE_THRESHOLD, max_entries: int = RETRIEVAL_CACHE_MAX_ENTRIES,
+                 ttl: float = RETRIEVAL_CACHE_TTL, permutations: int = RETRIEVAL_CACHE_PERMUTATIONS):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.bands, self.rows = _lsh_shape(permutations, threshold)
+        rng = np.random.default_rng(1)
+        self._a = rng.integers(1, int(_PRIME), permutations, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), permutations, dtype=np.uint64)
+        self._entries = OrderedDict()  # normalized key -> (shingles, band keys, value, created)
+        self._buckets = [{} for _ in range(self.bands)]  # band -> band key -> normalized keys
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "near_hits": 0, "misses": 0, "evictions": 0}
+    
+    def _signature(self, shingles: Set[str]) -> np.ndarray:
+        hashes = np.array(
+            [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingles],
+            dtype=np.uint64
+        )
+        with np.errstate(over="ignore"):
+            permuted = (np.outer(hashes, self._a) + self._b) % _PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+    
+    def _band_keys(self, shingles: Set[str]) -> Tuple[bytes, ...]:
+        signature = self._signature(shingles)
+        return tuple(signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands))
+    
+    def _remove(self, key: str):
+        _, band_keys, _, _ = self._entries.pop(key)
+        for band, band_key in enumerate(band_keys):
+            bucket = self._buckets[band][band_key]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[band][band_key]
+    
+    def _expired(self, key: str, now: float) -> bool:
+        if self.ttl and now - self._entries[key][3] > self.ttl:
+            self._remove(key)
+            self.stats["evictions"] += 1
+            return True
+        return False
+    
+    def get(self, topic: str) -> Optional[str]:
+        """Cached result for topic or a near-duplicate of it, else None"""
+        shingles = topic_shingles(topic)
+        key = " ".join(sorted(shingles))
+        now = time.time()
+        with self._lock:
+            if key in self._entries and not self._expired(key, now):
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._entries[key][2]
+            if shingles and self.threshold < 1:
+                best, best_similarity = None, self.threshold
+                for band, band_key in enumerate(self._band_keys(shingles)):
+                    for candidate in self._buckets[band].get(band_key, ()):
+                        other = self._entries[candidate][0]
+                        similarity = len(shingles & other) / len(shingles | other)
+                        if similarity >= best_similarity:
+                            best, best_similarity = candidate, similarity
+                if best is not None and not self._expired(best, now):
+                    self._entries.move_to_end(best)
+                    self.stats["near_hits"] += 1
+                    return self._entries[best][2]
+            self.stats["misses"] += 1
+            return None
+    
+    def put(self, topic: str, value: str):
+        shingles = topic_shingles(topic)
+        key = " ".join(sorted(shingles))
+        band_keys = self._band_keys(shingles) if shingles else ()
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (shingles, band_keys, value, time.time())
+            for band, band_key in enumerate(band_keys):
+                self._buckets[band].setdefault(band_key, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.stats["evictions"] += 1
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["near_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["near_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._buckets = [{} for _ in range(self.bands)]
+            self.stats = {"hits": 0, "near_hits": 0, "misses": 0, "evictions": 0}
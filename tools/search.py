@@ -1,11 +1,55 @@
 from config.models import ModelFactory
+from config.speed_settings import CORPUS_INDEX_DIR, CORPUS_TOP_K, ENABLE_RETRIEVAL_CACHE
+from tools.corpus import get_corpus_index
+from tools.retrieval_cache import RetrievalCache
 from langchain_core.messages import HumanMessage, SystemMessage
+from typing import List, Dict
+
+def format_passages(passages: List[Dict]) -> str:
+    return "\n\n".join(f"[{p['source']}] {p['passage']}" for p in passages)
 
 class KnowledgeRetriever:
-    def __init__(self, model_type="gemini"):
-        self.model = ModelFactory.get_model(model_type)
+    """Passages from the local corpus index when one is built, otherwise the LLM"""
+    
+    def __init__(self, model_type="gemini", index_dir=CORPUS_INDEX_DIR, cache=ENABLE_RETRIEVAL_CACHE):
+        self.model_type = model_type
+        self.index_dir = index_dir
+        self.cache = RetrievalCache() if cache else None
+        self._model = None
+    
+    @property
+    def model(self):
+        # Built on first retrieval so constructing a ToolManager stays offline
+        if self._model is None:
+            self._model = ModelFactory.get_model(self.model_type)
+        return self._model
+    
+    @property
+    def corpus(self):
+        return get_corpus_index(self.index_dir)
+    
+    def search(self, topic: str, k: int = CORPUS_TOP_K) -> List[Dict]:
+        """Top-k local passages for topic; empty when no corpus index is built"""
+        corpus = self.corpus
+        return corpus.search(topic, k) if corpus is not None else []
     
     def retrieve(self, topic: str) -> str:
+        """Knowledge for topic; near-duplicates of an earlier topic reuse its result"""
+        if self.cache is not None:
+            cached = self.cache.get(topic)
+            if cached is not None:
+                return cached
+        
+        result = self._retrieve(topic)
+        if self.cache is not None:
+            self.cache.put(topic, result)
+        return result
+    
+    def _retrieve(self, topic: str) -> str:
+        passages = self.search(topic)
+        if passages:
+            return format_passages(passages)
+        
         messages = [
             SystemMessage(content="You are a knowledge retrieval system. Provide factual, comprehensive information on the given topic."),
             HumanMessage(content=f"Provide key facts and context about: {topic}")
@@ -3,31 +3,66 @@ from tools.citation import CitationTracker
 from tools.quality_metrics import QualityScorer
 from tools.bias_detector import BiasDetector
 from tools.fact_validator import FactValidator
+from tools.offload import get_analysis_pool
+from config.speed_settings import CITATION_GRAPH_PATH, ENABLE_TOOL_OFFLOAD
+import asyncio
 
 class ToolManager:
-    def __init__(self, retrieval_model="gemini"):
+    def __init__(self, retrieval_model="gemini", offload: bool = ENABLE_TOOL_OFFLOAD):
+        """offload runs quality, bias and fact analyses in the shared AnalysisPool.
+        
+        Citation tracking stays in-process: it updates this manager's graph.
+        """
         self.retriever = KnowledgeRetriever(retrieval_model)
-        self.citation_tracker = CitationTracker()
+        self.citation_tracker = CitationTracker(CITATION_GRAPH_PATH or None)
         self.quality_scorer = QualityScorer()
         self.bias_detector = BiasDetector()
         self.fact_validator = FactValidator()
+        self.pool = get_analysis_pool() if offload else None
+    
+    def _run(self, kind: str, local, *args):
+        if self.pool is None:
+            return local(*args)
+        return self.pool.submit(kind, *args).result()
+    
+    async def _arun(self, kind: str, local, *args):
+        if self.pool is None:
+            return local(*args)
+        return await asyncio.wrap_future(self.pool.submit(kind, *args))
     
     def retrieve_knowledge(self, topic: str) -> str:
         return self.retriever.retrieve(topic)
     
+    def get_retrieval_stats(self) -> dict:
+        cache = self.retriever.cache
+        return cache.get_stats() if cache is not None else {}
+    
     def validate_citations(self, text: str) -> dict:
         citations = self.citation_tracker.extract_citations(text)
+        ids = self.citation_tracker.track_document(text)
         return {
             "citations_found": len(citations),
             "citations": citations,
-            "citation_graph": self.citation_tracker.get_citation_graph()
+            "citation_graph": self.citation_tracker.get_citation_graph(ids)  # this document's edges only
         }
     
     def evaluate_quality(self, text: str, fact_check_results: str, required_sections: list) -> dict:
-        return self.quality_scorer.evaluate(text, fact_check_results, required_sections)
+        return self._run("quality", self.quality_scorer.evaluate, text, fact_check_results, required_sections)
+    
+    async def aevaluate_quality(self, text: str, fact_check_results: str, required_sections: list) -> dict:
+        return await self._arun("quality", self.quality_scorer.evaluate, text, fact_check_results, required_sections)
+    
+    def evaluate_quality_batch(self, texts: list, fact_check_results, required_sections: list) -> dict:
+        return self.quality_scorer.evaluate_batch(texts, fact_check_results, required_sections)
     
     def detect_bias(self, text: str) -> dict:
-        return self.bias_detector.analyze(text)
+        return self._run("bias", self.bias_detector.analyze, text)
+    
+    async def adetect_bias(self, text: str) -> dict:
+        return await self._arun("bias", self.bias_detector.analyze, text)
     
     def validate_facts(self, text: str, reference: str = "") -> dict:
-        return self.fact_validator.validate_claims(text, reference)
+        return self._run("facts", self.fact_validator.validate_claims, text, reference)
+    
+    async def avalidate_facts(self, text: str, reference: str = "") -> dict:
+        return await self._arun("facts", self.fact_validator.validate_claims, text, reference)
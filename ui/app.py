@@ -3,6 +3,7 @@ import sys
 import os
 import json
 import time
+import uuid
 from datetime import datetime
 
 # Add parent directory to path
@@ -11,7 +12,14 @@ if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 try:
-    from workflow.runner import WorkflowRunner
+    from ui.shared import get_shared_runner, session_events, session_id
+    from agents.response_cache import get_response_cache
+    from config.models import ModelFactory
+    from agents.hedging import get_hedge_stats
+    from agents.cascade import get_cascade_stats
+    from workflow.metrics import summarize_metrics
+    from workflow.checkpoints import get_run_store
+    from config.speed_settings import ENABLE_CHECKPOINTS
     from config import settings
 except ImportError:
     st.error("Module import error. Please ensure all dependencies are installed.")
@@ -44,7 +52,7 @@ with st.sidebar:
     # Speed Mode
     speed_mode = st.toggle("⚡ Fast Mode", value=True, disabled=st.session_state.workflow_running)
     if speed_mode:
-        st.caption("⚡ Using faster models and reduced iterations")
+        st.caption("⚡ Fast models first for review and checks, reduced iterations")
     
     # Model Distribution
     model_dist = st.selectbox(
@@ -92,10 +100,8 @@ with st.sidebar:
         disabled=st.session_state.workflow_running
     )
     
-    # Update settings
-    settings.MAX_ITERATIONS = max_iterations
-    settings.CONVERGENCE_THRESHOLD = convergence_threshold
-    settings.TEMPERATURE = temperature
+    # Passed to this session's runs rather than written to the shared settings module
+    run_config = {"max_iterations": max_iterations, "convergence_threshold": convergence_threshold}
     
     st.divider()
     
@@ -112,6 +118,60 @@ with st.sidebar:
     
     st.divider()
     
+    # Response Cache
+    response_cache = get_response_cache()
+    if response_cache:
+        cache_stats = response_cache.get_stats()
+        st.markdown("**Response Cache:**")
+        st.caption(
+            f"{cache_stats['hits']} hits / {cache_stats['misses']} misses "
+            f"({cache_stats['hit_rate']:.0%}) • {cache_stats['tokens_saved']} tokens, "
+            f"{cache_stats['latency_saved']:.1f}s saved"
+        )
+        st.divider()
+    
+    # Resumable Runs
+    resume_run = None
+    resume_btn = False
+    resumable_runs = get_run_store().list_runs(owner=session_id()) if ENABLE_CHECKPOINTS else []
+    if resumable_runs:
+        st.markdown("**↩️ Resumable Runs:**")
+        resume_run = st.selectbox(
+            "Unfinished runs",
+            resumable_runs,
+            format_func=lambda run: f"{run['topic']} • {run['status']} • "
+                                    f"{datetime.fromtimestamp(run['updated_at']).strftime('%m-%d %H:%M')}",
+            disabled=st.session_state.workflow_running
+        )
+        if resume_run['error']:
+            st.caption(f"Error: {resume_run['error'][:120]}")
+        resume_btn = st.button(
+            "↩️ Resume Run",
+            use_container_width=True,
+            disabled=st.session_state.workflow_running
+        )
+        st.divider()
+    
+    # Model Client Pool
+    pool_stats = ModelFactory.pool_stats()
+    st.markdown("**Model Clients:**")
+    st.caption(
+        f"{pool_stats['clients']} live clients • "
+        f"{sum(pool_stats['live_connections'].values())} pooled connections"
+    )
+    hedge_stats = get_hedge_stats()
+    st.caption(
+        f"Hedged {hedge_stats['hedges_fired']}/{hedge_stats['calls']} calls • "
+        f"{hedge_stats['hedges_won']} won • {hedge_stats['timeouts']} timeouts"
+    )
+    cascade_stats = get_cascade_stats()
+    if cascade_stats["attempts"]:
+        st.caption(
+            f"Fast model kept {cascade_stats['attempts'] - cascade_stats['escalations']}/{cascade_stats['attempts']} "
+            f"checks • escalated {cascade_stats['escalation_rate']:.0%} • ~{cascade_stats['latency_saved']:.1f}s saved"
+        )
+    st.divider()
+    
     # Process Logs
     if st.session_state.process_logs:
         st.subheader("📋 Process Logs")
@@ -175,10 +235,14 @@ if pause_btn:
     st.info(f"⏸️ Workflow {status}")
     time.sleep(0.5)
 
-if start_btn and topic:
+if resume_btn and resume_run:
+    topic = resume_run['topic']
+
+if (start_btn and topic) or resume_btn:
     st.session_state.workflow_running = True
     st.session_state.process_logs = []
-    st.session_state.process_logs.append(f"[{datetime.now().strftime('%H:%M:%S')}] Starting research on: {topic}")
+    action = "Resuming" if resume_btn else "Starting"
+    st.session_state.process_logs.append(f"[{datetime.now().strftime('%H:%M:%S')}] {action} research on: {topic}")
     st.divider()
     
     # Create tabs for different views
@@ -193,7 +257,8 @@ if start_btn and topic:
         st.session_state.process_logs.append(f"[{datetime.now().strftime('%H:%M:%S')}] Initializing agents...")
         progress_bar.progress(10)
         
-        runner = WorkflowRunner(distribution)
+        # Agents and graph are shared across sessions; run_config and agent memory are this session's
+        runner = get_shared_runner(distribution, temperature, speed_mode)
         
         status_text.text("🚀 Running multi-agent research pipeline...")
         st.session_state.process_logs.append(f"[{datetime.now().strftime('%H:%M:%S')}] Pipeline started")
@@ -216,6 +281,10 @@ if start_btn and topic:
             
             st.divider()
             workflow_viz = st.empty()
+            
+            st.divider()
+            st.markdown("**⏱️ Node Timing & Token Usage**")
+            metrics_table = st.empty()
         
         # Agent dialogue container
         with tab2:
@@ -257,9 +326,10 @@ if start_btn and topic:
             with col2:
                 st.markdown("""
                 **Edges (Flow):**
-                - Sequential: Research → Review → Fact Check → Citation → Editor
+                - Fan-out: Research → Review | Fact Check | Citation (parallel)
+                - Join: Review + Fact Check + Citation → Editor
                 - Conditional: Editor → Decision
-                - Loop: Decision → Review (if not converged)
+                - Loop: Decision → Review Stage (if not converged)
                 - Exit: Decision → Finalize (if converged)
                 """)
             
@@ -267,11 +337,22 @@ if start_btn and topic:
         
         # Stream workflow execution
         agent_messages = []
+        node_metrics = []
         current_iteration = 0
         current_quality = 0.0
         final_result = None
+        live_text = {}  # node -> text its agent has streamed so far
+        last_render = 0.0
+        i = 0
+        
+        # Checkpointed under a run id so a failed or stopped run can be resumed
+        if resume_btn:
+            events = runner.stream_resume(resume_run['run_id'], tokens=True)
+        else:
+            events = runner.stream(topic, tokens=True, run_id=uuid.uuid4().hex, run_config=run_config,
+                                   owner=session_id())
         
-        for i, output in enumerate(runner.stream(topic)):
+        for kind, output in session_events(events):
             if not st.session_state.workflow_running:
                 st.warning("Workflow stopped by user")
                 break
@@ -281,10 +362,21 @@ if start_btn and topic:
                 if not st.session_state.workflow_running:
                     break
             
+            if kind == "tokens":
+                live_text[output['node']] = live_text.get(output['node'], "") + output['text']
+                # Redraw at most ~10 times a second rather than once per token
+                if time.time() - last_render > 0.1:
+                    live_response.markdown(f"**✍️ {output['agent']} ({output['node']}) is writing...**\n\n"
+                                           f"{live_text[output['node']]}")
+                    last_render = time.time()
+                continue
+            
             progress = min(30 + (i * 10), 90)
             progress_bar.progress(progress)
+            i += 1
             
             for node_name, node_output in output.items():
+                live_text.pop(node_name, None)
                 st.session_state.process_logs.append(f"[{datetime.now().strftime('%H:%M:%S')}] Node: {node_name}")
                 
                 # Show live status
@@ -328,6 +420,29 @@ if start_btn and topic:
                     {stage_map.get(node_name, '⚙️ Processing...')}
                     """)
                     
+                    # Per-node timing: LLM latency vs local tool time and tokens
+                    if node_output.get('metrics'):
+                        node_metrics.extend(node_output['metrics'])
+                        metrics_table.dataframe(
+                            [
+                                {
+                                    "Node": row["node"],
+                                    "Runs": row["runs"],
+                                    "Total (s)": row["duration"],
+                                    "LLM (s)": row["llm_latency"],
+                                    "LLM Calls Summed (s)": row["llm_call_time"],
+                                    "Tools (s)": row["tool_time"],
+                                    "LLM Calls": row["llm_calls"],
+                                    "Cached": row["cached_calls"],
+                                    "Prompt Tokens": row["prompt_tokens"],
+                                    "Completion Tokens": row["completion_tokens"]
+                                }
+                                for row in summarize_metrics(node_metrics)
+                            ],
+                            use_container_width=True,
+                            hide_index=True
+                        )
+                    
                     # Show latest response preview
                     if 'agent_messages' in node_output and node_output['agent_messages']:
                         latest_msg = node_output['agent_messages'][-1]
@@ -458,6 +573,7 @@ PROCESS LOGS
                             "iterations": result.get('iteration', 0),
                             "final_document": result.get('final_document', ''),
                             "agent_messages": result.get('agent_messages', []),
+                            "metrics": node_metrics,
                             "process_logs": st.session_state.process_logs
                         }, indent=2)
                         
@@ -475,6 +591,8 @@ PROCESS LOGS
         st.session_state.workflow_running = False
         st.session_state.process_logs.append(f"[{datetime.now().strftime('%H:%M:%S')}] ERROR: {str(e)}")
         st.error(f"Error: {str(e)}")
+        if ENABLE_CHECKPOINTS:
+            st.info("↩️ Completed steps were saved. Resume this run from the sidebar.")
         st.exception(e)
 
 elif start_btn and not topic:
@@ -6,7 +6,7 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
-from agents.agent_factory import AgentFactory
+from ui.shared import get_shared_agents, session_scope
 
 st.set_page_config(page_title="Chat with Agents", layout="wide")
 
@@ -15,8 +15,9 @@ st.title("💬 Chat with Research Agents")
 # Initialize session state
 if 'chat_history' not in st.session_state:
     st.session_state.chat_history = []
-if 'agents' not in st.session_state:
-    st.session_state.agents = AgentFactory.create_agents()
+
+# Model clients are shared by all sessions; each session keeps its own agent memory
+agents = get_shared_agents()
 
 # Sidebar - Agent selection
 with st.sidebar:
@@ -54,9 +55,9 @@ if prompt := st.chat_input("Ask the agent anything..."):
         st.markdown(prompt)
     
     # Get agent response
-    agent = st.session_state.agents[agent_choice]
+    agent = agents[agent_choice]
     with st.chat_message("assistant"):
-        with st.spinner(f"{agent_choice} is thinking..."):
+        with st.spinner(f"{agent_choice} is thinking..."), session_scope():
             response = agent.invoke(prompt)
             st.markdown(response)
     
@@ -7,8 +7,7 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
-from agents.agent_factory import AgentFactory
-from workflow.runner import WorkflowRunner
+from ui.shared import get_shared_agents, get_shared_runner, session_scope
 
 st.set_page_config(page_title="Research Chat", layout="wide")
 
@@ -22,8 +21,9 @@ if 'research_topic' not in st.session_state:
     st.session_state.research_topic = None
 if 'chat_history' not in st.session_state:
     st.session_state.chat_history = []
-if 'agents' not in st.session_state:
-    st.session_state.agents = AgentFactory.create_agents()
+
+# Model clients are shared by all sessions; each session keeps its own agent memory
+agents = get_shared_agents()
 
 # Sidebar
 with st.sidebar:
@@ -35,9 +35,8 @@ with st.sidebar:
     
     if st.button("🔬 Generate Research", type="primary", use_container_width=True):
         if topic:
-            with st.spinner("Generating research..."):
-                runner = WorkflowRunner()
-                result = runner.run(topic)
+            with st.spinner("Generating research..."), session_scope():
+                result = get_shared_runner().run(topic)
                 st.session_state.research_document = result.get('final_document', '')
                 st.session_state.research_topic = topic
                 st.session_state.chat_history = []
@@ -122,7 +121,7 @@ else:
             st.markdown(prompt)
         
         # Get agent response with research context
-        agent = st.session_state.agents[agent_choice]
+        agent = agents[agent_choice]
         
         # Create context-aware prompt
         context_prompt = f"""Research Document:
@@ -133,7 +132,7 @@ User Question: {prompt}
 Provide a helpful response based on the research document above."""
         
         with st.chat_message("assistant"):
-            with st.spinner(f"{agent_choice} is analyzing..."):
+            with st.spinner(f"{agent_choice} is analyzing..."), session_scope():
                 response = agent.invoke(context_prompt)
                 st.markdown(response)
         
@@ -0,0 +1,54 @@
+import uuid
+from contextlib import contextmanager
+from typing import Dict
+
+import streamlit as st
+
+from agents.agent_factory import AgentFactory
+from agents.base_agent import set_session_memories, reset_session_memories
+from workflow.runner import WorkflowRunner
+from config.speed_settings import ENABLE_CASCADE, SHARED_AGENT_CONFIGS
+
+@st.cache_resource(max_entries=SHARED_AGENT_CONFIGS, show_spinner=False)
+def get_shared_agents(model_distribution: Dict = None, temperature: float = None, cascade: bool = ENABLE_CASCADE):
+    """Agents shared by every session of this server process, one set per configuration"""
+    return AgentFactory.create_agents(model_distribution, temperature, cascade)
+
+@st.cache_resource(max_entries=SHARED_AGENT_CONFIGS, show_spinner=False)
+def get_shared_runner(model_distribution: Dict = None, temperature: float = None, cascade: bool = ENABLE_CASCADE):
+    """Runner over the shared agents; pass per-session parameters as run(..., run_config=...)"""
+    return WorkflowRunner(agents=get_shared_agents(model_distribution, temperature, cascade))
+
+def session_id() -> str:
+    """Id of this browser session; owns the runs it starts so others can't list or resume them"""
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    return st.session_state.session_id
+
+def session_memories() -> Dict:
+    """This browser session's agent memories, kept apart from the shared agents"""
+    if "agent_memories" not in st.session_state:
+        st.session_state.agent_memories = {}
+    return st.session_state.agent_memories
+
+@contextmanager
+def session_scope():
+    """Record shared agents' calls made inside the block in this session's memories"""
+    token = set_session_memories(session_memories())
+    try:
+        yield
+    finally:
+        reset_session_memories(token)
+
+def session_events(events):
+    """Iterate a runner's stream with this session's memories active while each event is produced"""
+    memories = session_memories()
+    while True:
+        token = set_session_memories(memories)
+        try:
+            event = next(events)
+        except StopIteration:
+            return
+        finally:
+            reset_session_memories(token)
+        yield event
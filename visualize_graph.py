@@ -46,14 +46,16 @@ This is a LangGraph StateGraph implementation with:
    - finalize: Prepares final document
 
 3. EDGES:
-   - Sequential: research → review → fact_check → citation → editor
+   - Fan-out: research → review | fact_check | citation (concurrent)
+   - Join: review + fact_check + citation → editor
    - Conditional: editor → decision (should_continue function)
-   - Loop: decision → review (if quality < threshold)
+   - Loop: decision → review stage (if quality < threshold)
    - Exit: decision → finalize (if converged)
 
 4. CONVERGENCE CRITERIA:
    - quality_score >= CONVERGENCE_THRESHOLD (0.7)
    - OR iteration >= MAX_ITERATIONS (2)
+   - OR local quality score >= threshold + EARLY_EXIT_MARGIN (0.1)
 
 5. EXECUTION:
    - workflow.invoke(state) - Run complete workflow
@@ -0,0 +1,84 @@
+import json
+import random
+from typing import Dict, Iterable, Iterator, Tuple, Union
+
+def iter_topics(source: Union[str, Iterable]) -> Iterator[Tuple[str, str]]:
+    """Yield (topic_id, topic) pairs lazily from a file path or an iterable.
+    
+    Files ending in .jsonl are read as one JSON object per line using the
+    "topic" (or "title") field; any other file is read as one topic per line.
+    Iterables may hold plain strings or dicts in the same JSON shape.
+    A dict with neither field yields None as its topic, and a .jsonl line
+    that is not valid JSON yields a ValueError, so the caller can record the
+    failure and carry on with the next line.
+    """
+    if isinstance(source, str):
+        with open(source, encoding="utf-8") as f:
+            is_jsonl = source.endswith(".jsonl")
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                if not is_jsonl:
+                    yield _topic_pair(line, line_number)
+                    continue
+                try:
+                    item = json.loads(line)
+                except ValueError as e:
+                    yield str(line_number), ValueError(f"Line {line_number} is not valid JSON: {e}")
+                    continue
+                yield _topic_pair(item, line_number)
+    else:
+        for index, item in enumerate(source, 1):
+            yield _topic_pair(item, index)
+
+def _topic_pair(item, index: int) -> Tuple[str, str]:
+    if isinstance(item, dict):
+        topic = item.get("topic") or item.get("title")
+        topic_id = item.get("id") or item.get("request_id") or str(index)
+        return str(topic_id), topic
+    return str(index), str(item)
+
+class LatencyStats:
+    """Running latency summary with a fixed-size reservoir for percentiles"""
+    
+    def __init__(self, reservoir_size: int = 10000):
+        self.reservoir_size = reservoir_size
+        self.samples = []
+        self.count = 0
+        self.failed = 0
+        self.total = 0.0
+        self.max = 0.0  # kept apart from the reservoir, which may have dropped the slowest
+    
+    def add(self, latency: float, failed: bool = False):
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+        if failed:
+            self.failed += 1
+        if len(self.samples) < self.reservoir_size:
+            self.samples.append(latency)
+        else:
+            slot = random.randrange(self.count)
+            if slot < self.reservoir_size:
+                self.samples[slot] = latency
+    
+    def percentile(self, p: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(int(round(p / 100 * (len(ordered) - 1))), len(ordered) - 1)
+        return ordered[index]
+    
+    def summary(self, elapsed: float) -> Dict:
+        return {
+            "completed": self.count - self.failed,
+            "failed": self.failed,
+            "elapsed": round(elapsed, 2),
+            "topics_per_min": round(self.count / elapsed * 60, 2) if elapsed else 0.0,
+            "latency_mean": round(self.total / self.count, 3) if self.count else 0.0,
+            "latency_p50": round(self.percentile(50), 3),
+            "latency_p90": round(self.percentile(90), 3),
+            "latency_p99": round(self.percentile(99), 3),
+            "latency_max": round(self.max, 3)
+        }
@@ -0,0 +1,141 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from config.speed_settings import CHECKPOINT_PATH, CHECKPOINT_TTL
+
+_COLUMNS = "run_id, topic, status, error, owner, created_at, updated_at"
+
+class RunStore:
+    """Durable LangGraph checkpoints plus an index of unfinished runs, in one SQLite file.
+    
+    Runs are keyed by run id (the LangGraph thread_id). A run's checkpoints
+    are dropped once it completes, so only resumable runs take up space.
+    Each run records the owner (e.g. a UI session) that started it, and runs
+    executing in this process are held so they can't be listed or resumed twice.
+    """
+    
+    def __init__(self, path: str = CHECKPOINT_PATH, ttl: float = CHECKPOINT_TTL):
+        # Imported here so importing the workflow doesn't pay for the SQLite saver
+        from langgraph.checkpoint.sqlite import SqliteSaver
+        
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        # The saver serializes its own connection; the run index gets a separate one
+        self.saver = SqliteSaver(sqlite3.connect(path, check_same_thread=False))
+        self.saver.setup()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.Lock()
+        self._active = set()  # run ids executing in this process
+        with self._lock:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    topic TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    error TEXT,
+                    owner TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            # Files written before runs had owners
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(runs)")]
+            if "owner" not in columns:
+                self._conn.execute("ALTER TABLE runs ADD COLUMN owner TEXT")
+            self._conn.commit()
+        self.prune()
+    
+    def start(self, run_id: str, topic: str, owner: Optional[str] = None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO runs (run_id, topic, status, error, owner, created_at, updated_at) "
+                "VALUES (?, ?, 'running', NULL, ?, ?, ?)",
+                (run_id, topic, owner, now, now)
+            )
+            self._conn.commit()
+            self._active.add(run_id)
+    
+    def acquire(self, run_id: str) -> bool:
+        """Hold an existing run for resuming; False if it is already executing in this process"""
+        with self._lock:
+            if run_id in self._active:
+                return False
+            self._active.add(run_id)
+            return True
+    
+    def release(self, run_id: str):
+        """Let a run that stopped executing be listed and resumed again"""
+        with self._lock:
+            self._active.discard(run_id)
+    
+    def mark(self, run_id: str, status: str, error: Optional[str] = None):
+        """Record why a run stopped (failed, stopped, running again on resume)"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE runs SET status = ?, error = ?, updated_at = ? WHERE run_id = ?",
+                (status, error, time.time(), run_id)
+            )
+            self._conn.commit()
+    
+    def get(self, run_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM runs WHERE run_id = ?",
+                (run_id,)
+            ).fetchone()
+        return self._row(row) if row else None
+    
+    def list_runs(self, limit: int = 20, owner: Optional[str] = None) -> List[Dict]:
+        """Unfinished runs not executing in this process, most recently updated first.
+        
+        With owner, only the runs that owner started; otherwise every owner's.
+        """
+        with self._lock:
+            active = list(self._active)
+            query = f"SELECT {_COLUMNS} FROM runs WHERE run_id NOT IN ({', '.join('?' * len(active))})"
+            params = active
+            if owner is not None:
+                query += " AND owner = ?"
+                params = active + [owner]
+            rows = self._conn.execute(
+                query + " ORDER BY updated_at DESC LIMIT ?", params + [limit]
+            ).fetchall()
+        return [self._row(row) for row in rows]
+    
+    def delete(self, run_id: str):
+        """Forget a run and its checkpoints (called when it completes)"""
+        self.saver.delete_thread(run_id)
+        with self._lock:
+            self._conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+            self._conn.commit()
+    
+    def prune(self):
+        """Drop runs nobody resumed within the TTL"""
+        with self._lock:
+            expired = [row[0] for row in self._conn.execute(
+                "SELECT run_id FROM runs WHERE updated_at < ?", (time.time() - self.ttl,)
+            )]
+        for run_id in expired:
+            self.delete(run_id)
+    
+    @staticmethod
+    def _row(row) -> Dict:
+        return dict(zip(_COLUMNS.split(", "), row))
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_run_store() -> RunStore:
+    """Process-wide run store shared by every runner and Streamlit session"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = RunStore()
+        return _store
@@ -1,48 +1,88 @@
+from functools import partial
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 from workflow.state import ResearchState
+from workflow.metrics import timed_node, atimed_node
+from workflow.streaming import token_streaming, atoken_streaming
 from workflow.nodes import (
     research_node, review_node, fact_check_node, 
-    citation_node, editor_node, finalize_node
+    citation_node, editor_node, finalize_node,
+    aresearch_node, areview_node, afact_check_node,
+    acitation_node, aeditor_node, afinalize_node
 )
-from config.settings import MAX_ITERATIONS, CONVERGENCE_THRESHOLD
+from workflow.run_config import get_run_config
+from config.speed_settings import ENABLE_PARALLEL
+
+# Nodes that only read research_content and can run as one superstep
+REVIEW_STAGE = ["review", "fact_check", "citation"]
 
 def should_continue(state: ResearchState) -> str:
-    if state["iteration"] >= MAX_ITERATIONS:
+    config = get_run_config(state)
+    if state["iteration"] >= config["max_iterations"]:
+        return "finalize"
+    if state.get("quality_score", 0) >= config["convergence_threshold"]:
         return "finalize"
-    if state.get("quality_score", 0) >= CONVERGENCE_THRESHOLD:
+    # The local scorer already rates the edit well clear of the threshold: skip another LLM round
+    margin = config["early_exit_margin"]
+    if margin is not None and state.get("local_score", 0) >= config["convergence_threshold"] + margin:
         return "finalize"
     return "continue"
 
-def create_research_workflow(agents):
+def route_after_editor(state: ResearchState):
+    if should_continue(state) == "finalize":
+        return "finalize"
+    return REVIEW_STAGE
+
+def _node(name, func, afunc, agents):
+    # Sync and async variants so the graph runs under invoke/stream and ainvoke/astream,
+    # each timed into state["metrics"] and able to stream agent tokens
+    return RunnableLambda(
+        partial(timed_node(name, token_streaming(name, func)), agents=agents),
+        afunc=partial(atimed_node(name, atoken_streaming(name, afunc)), agents=agents)
+    )
+
+def create_research_workflow(agents, parallel=ENABLE_PARALLEL, checkpointer=None):
     workflow = StateGraph(ResearchState)
     
     # Add nodes
-    workflow.add_node("research", lambda s: research_node(s, agents))
-    workflow.add_node("review", lambda s: review_node(s, agents))
-    workflow.add_node("fact_check", lambda s: fact_check_node(s, agents))
-    workflow.add_node("citation", lambda s: citation_node(s, agents))
-    workflow.add_node("editor", lambda s: editor_node(s, agents))
-    workflow.add_node("finalize", lambda s: finalize_node(s, agents))
+    workflow.add_node("research", _node("research", research_node, aresearch_node, agents))
+    workflow.add_node("review", _node("review", review_node, areview_node, agents))
+    workflow.add_node("fact_check", _node("fact_check", fact_check_node, afact_check_node, agents))
+    workflow.add_node("citation", _node("citation", citation_node, acitation_node, agents))
+    workflow.add_node("editor", _node("editor", editor_node, aeditor_node, agents))
+    workflow.add_node("finalize", _node("finalize", finalize_node, afinalize_node, agents))
     
     # Set entry point
     workflow.set_entry_point("research")
     
-    # Add edges
-    workflow.add_edge("research", "review")
-    workflow.add_edge("review", "fact_check")
-    workflow.add_edge("fact_check", "citation")
-    workflow.add_edge("citation", "editor")
-    
-    # Conditional routing
-    workflow.add_conditional_edges(
-        "editor",
-        should_continue,
-        {
-            "continue": "review",
-            "finalize": "finalize"
-        }
-    )
+    if parallel:
+        # Fan out to the review stage, join before the editor
+        for node in REVIEW_STAGE:
+            workflow.add_edge("research", node)
+        workflow.add_edge(REVIEW_STAGE, "editor")
+        
+        workflow.add_conditional_edges(
+            "editor",
+            route_after_editor,
+            REVIEW_STAGE + ["finalize"]
+        )
+    else:
+        # Add edges
+        workflow.add_edge("research", "review")
+        workflow.add_edge("review", "fact_check")
+        workflow.add_edge("fact_check", "citation")
+        workflow.add_edge("citation", "editor")
+        
+        # Conditional routing
+        workflow.add_conditional_edges(
+            "editor",
+            should_continue,
+            {
+                "continue": "review",
+                "finalize": "finalize"
+            }
+        )
     
     workflow.add_edge("finalize", END)
     
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
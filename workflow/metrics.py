@@ -0,0 +1,109 @@
+import contextvars
+import threading
+import time
+from functools import wraps
+from typing import Dict, List
+
+# Metrics of the node currently executing in this thread or task
+_current_node = contextvars.ContextVar("current_node_metrics", default=None)
+# A node may fan its calls out to threads that share one metrics dict
+_lock = threading.Lock()
+
+def record_llm_call(latency: float, prompt_tokens: int = 0, completion_tokens: int = 0, cached: bool = False):
+    """Attribute one LLM call to the running node; a no-op outside the workflow"""
+    metrics = _current_node.get()
+    if metrics is None:
+        return
+    end = time.time()
+    with _lock:
+        metrics["llm_calls"] += 1
+        metrics["llm_call_time"] += latency
+        if latency:
+            metrics["_llm_intervals"].append((end - latency, end))
+        metrics["prompt_tokens"] += prompt_tokens
+        metrics["completion_tokens"] += completion_tokens
+        if cached:
+            metrics["cached_calls"] += 1
+
+def _start(name: str, state) -> Dict:
+    return {
+        "node": name,
+        "iteration": state.get("iteration", 0),
+        "start": time.time(),
+        "end": 0.0,
+        "duration": 0.0,
+        "llm_latency": 0.0,  # wall time with at least one LLM call in flight
+        "llm_call_time": 0.0,  # summed call latencies; exceeds llm_latency when calls overlap
+        "_llm_intervals": [],
+        "tool_time": 0.0,
+        "llm_calls": 0,
+        "cached_calls": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0
+    }
+
+def _busy_time(intervals: List[tuple]) -> float:
+    """Length of the union of (start, end) intervals"""
+    total, covered_until = 0.0, float("-inf")
+    for start, end in sorted(intervals):
+        if end > covered_until:
+            total += end - max(start, covered_until)
+            covered_until = end
+    return total
+
+def _finish(metrics: Dict, started: float, update: Dict) -> Dict:
+    metrics["end"] = time.time()
+    metrics["duration"] = round(time.perf_counter() - started, 4)
+    metrics["llm_latency"] = round(min(_busy_time(metrics.pop("_llm_intervals")), metrics["duration"]), 4)
+    metrics["llm_call_time"] = round(metrics["llm_call_time"], 4)
+    metrics["tool_time"] = round(max(metrics["duration"] - metrics["llm_latency"], 0.0), 4)
+    update = dict(update)
+    update["metrics"] = [metrics]
+    return update
+
+def timed_node(name: str, func):
+    """Wrap a node so its timing and token usage land in state['metrics']"""
+    @wraps(func)
+    def wrapper(state, *args, **kwargs):
+        metrics = _start(name, state)
+        token = _current_node.set(metrics)
+        started = time.perf_counter()
+        try:
+            update = func(state, *args, **kwargs)
+        finally:
+            _current_node.reset(token)
+        return _finish(metrics, started, update)
+    return wrapper
+
+def atimed_node(name: str, afunc):
+    @wraps(afunc)
+    async def wrapper(state, *args, **kwargs):
+        metrics = _start(name, state)
+        token = _current_node.set(metrics)
+        started = time.perf_counter()
+        try:
+            update = await afunc(state, *args, **kwargs)
+        finally:
+            _current_node.reset(token)
+        return _finish(metrics, started, update)
+    return wrapper
+
+def summarize_metrics(metrics: List[Dict]) -> List[Dict]:
+    """Totals per node across iterations, slowest node first"""
+    totals = {}
+    for entry in metrics:
+        row = totals.setdefault(entry["node"], {
+            "node": entry["node"], "runs": 0, "duration": 0.0, "llm_latency": 0.0,
+            "llm_call_time": 0.0, "tool_time": 0.0, "llm_calls": 0, "cached_calls": 0,
+            "prompt_tokens": 0, "completion_tokens": 0
+        })
+        row["runs"] += 1
+        for key in ["duration", "llm_latency", "tool_time", "llm_calls", "cached_calls",
+                    "prompt_tokens", "completion_tokens"]:
+            row[key] += entry[key]
+        # Runs checkpointed before llm_call_time existed only have the summed latency
+        row["llm_call_time"] += entry.get("llm_call_time", entry["llm_latency"])
+    for row in totals.values():
+        for key in ["duration", "llm_latency", "llm_call_time", "tool_time"]:
+            row[key] = round(row[key], 3)
+    return sorted(totals.values(), key=lambda row: row["duration"], reverse=True)
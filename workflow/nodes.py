@@ -1,84 +1,238 @@
 from workflow.state import ResearchState
+from config.settings import RESEARCH_SECTIONS
+from config.speed_settings import PROMPT_BUDGETS, FEEDBACK_BUDGET, CORPUS_IN_RESEARCH
+from workflow.sections import split_sections, join_sections, sections_to_edit
+from workflow.prompt_budget import fit_text
+from workflow.run_config import get_run_config
 from tools.tool_manager import ToolManager
-import json
+from tools.search import format_passages
+from agents.structured import parse_structured
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
+import threading
 
-# Initialize with Gemini for knowledge retrieval
-tool_manager = ToolManager(retrieval_model="gemini")
+_tool_manager = None
+_tool_manager_lock = threading.Lock()
 
-def research_node(state: ResearchState, agents) -> ResearchState:
-    researcher = agents["researcher"]
-    prompt = f"Research topic: {state['topic']}\n\nGenerate concise research content with key findings."
-    content = researcher.invoke(prompt)
-    
+def get_tool_manager() -> ToolManager:
+    """Shared tool manager, created on first use rather than at import time"""
+    global _tool_manager
+    with _tool_manager_lock:
+        if _tool_manager is None:
+            # Initialize with Gemini for knowledge retrieval
+            _tool_manager = ToolManager(retrieval_model="gemini")
+    return _tool_manager
+
+def _context(agents, name: str, text: str, budget: int = None) -> str:
+    """text trimmed to the agent's token budget for its model"""
+    model = getattr(agents[name], "model", None)
+    return fit_text(text, budget or PROMPT_BUDGETS[name], model)
+
+def _parsed(agents, name: str, reply: str) -> dict:
+    """The agent's reply as its schema's fields; {} if it has no schema or no JSON object"""
+    schema = getattr(agents[name], "output_schema", None)
+    return (parse_structured(reply, schema) or {}) if schema else {}
+
+def _references(state: ResearchState) -> str:
+    """Local corpus passages for the topic; empty without a built index"""
+    if not CORPUS_IN_RESEARCH:
+        return ""
+    return format_passages(get_tool_manager().retriever.search(state['topic']))
+
+def _research_prompt(state: ResearchState, agents, references: str) -> str:
+    headings = ", ".join(name.title() for name in RESEARCH_SECTIONS)
+    prompt = (f"Research topic: {state['topic']}\n\nGenerate concise research content with key findings."
+              f"\nUse these section headings: {headings}.")
+    if references:
+        prompt += f"\n\nDraw on these reference passages:\n{_context(agents, 'researcher', references)}"
+    return prompt
+
+def _research_update(content: str, references: str) -> ResearchState:
     return {
         "research_content": content,
+        "sections": split_sections(content),
+        "references": references,
         "agent_messages": [{"agent": "researcher", "content": content}]
     }
 
-def review_node(state: ResearchState, agents) -> ResearchState:
-    reviewer = agents["reviewer"]
-    quality_metrics = tool_manager.evaluate_quality(
-        state['research_content'], 
+def research_node(state: ResearchState, agents) -> ResearchState:
+    references = _references(state)
+    content = agents["researcher"].invoke(_research_prompt(state, agents, references))
+    return _research_update(content, references)
+
+async def aresearch_node(state: ResearchState, agents) -> ResearchState:
+    references = _references(state)
+    content = await agents["researcher"].ainvoke(_research_prompt(state, agents, references))
+    return _research_update(content, references)
+
+def _review_metrics_args(state: ResearchState, text: str = None) -> tuple:
+    return (
+        state['research_content'] if text is None else text,
         state.get('fact_check_results', ''),
         ['introduction', 'findings', 'conclusion']
     )
-    
-    prompt = f"Review: {state['research_content'][:500]}\n\nProvide brief feedback and score (0-1)."
-    feedback = reviewer.invoke(prompt)
-    
-    try:
-        feedback_json = json.loads(feedback)
-        score = feedback_json.get("score", quality_metrics['overall'])
-    except:
-        score = quality_metrics['overall']
+
+def _review_metrics(state: ResearchState, text: str = None) -> dict:
+    return get_tool_manager().evaluate_quality(*_review_metrics_args(state, text))
+
+async def _areview_metrics(state: ResearchState, text: str = None) -> dict:
+    return await get_tool_manager().aevaluate_quality(*_review_metrics_args(state, text))
+
+def _review_prompt(state: ResearchState, agents) -> str:
+    return f"Review: {_context(agents, 'reviewer', state['research_content'])}\n\nProvide brief feedback and score (0-1). Name the sections that need changes."
+
+def _review_update(agents, feedback: str, quality_metrics: dict) -> ResearchState:
+    review = _parsed(agents, "reviewer", feedback)
+    score = review.get("score")
     
     return {
         "review_feedback": feedback,
-        "quality_score": score,
+        "review": review,
+        "quality_score": quality_metrics['overall'] if score is None else score,
         "agent_messages": [{"agent": "reviewer", "content": feedback}]
     }
 
-def fact_check_node(state: ResearchState, agents) -> ResearchState:
-    fact_checker = agents["fact_checker"]
-    fact_validation = tool_manager.validate_facts(state['research_content'])
-    
-    prompt = f"Fact-check: {state['research_content'][:400]}\n\nQuick validation."
-    results = fact_checker.invoke(prompt)
-    
+def review_node(state: ResearchState, agents) -> ResearchState:
+    quality_metrics = _review_metrics(state)
+    feedback = agents["reviewer"].invoke(_review_prompt(state, agents))
+    return _review_update(agents, feedback, quality_metrics)
+
+async def areview_node(state: ResearchState, agents) -> ResearchState:
+    # The analysis may run in a worker process; overlap it with the LLM call
+    quality_metrics, feedback = await asyncio.gather(
+        _areview_metrics(state), agents["reviewer"].ainvoke(_review_prompt(state, agents))
+    )
+    return _review_update(agents, feedback, quality_metrics)
+
+def _fact_check_prompt(state: ResearchState, agents) -> str:
+    return f"Fact-check: {_context(agents, 'fact_checker', state['research_content'])}\n\nQuick validation."
+
+def _fact_check_update(agents, results: str) -> ResearchState:
     return {
         "fact_check_results": results,
+        "fact_check": _parsed(agents, "fact_checker", results),
         "agent_messages": [{"agent": "fact_checker", "content": results}]
     }
 
-def citation_node(state: ResearchState, agents) -> ResearchState:
-    citation_validator = agents["citation_validator"]
-    citation_analysis = tool_manager.validate_citations(state['research_content'])
-    
-    prompt = f"Check citations: {state['research_content'][:400]}\n\nBrief validation."
-    results = citation_validator.invoke(prompt)
-    
+def fact_check_node(state: ResearchState, agents) -> ResearchState:
+    fact_validation = get_tool_manager().validate_facts(state['research_content'], state.get('references', ''))
+    results = agents["fact_checker"].invoke(_fact_check_prompt(state, agents))
+    return _fact_check_update(agents, results)
+
+async def afact_check_node(state: ResearchState, agents) -> ResearchState:
+    fact_validation, results = await asyncio.gather(
+        get_tool_manager().avalidate_facts(state['research_content'], state.get('references', '')),
+        agents["fact_checker"].ainvoke(_fact_check_prompt(state, agents))
+    )
+    return _fact_check_update(agents, results)
+
+def _citation_prompt(state: ResearchState, agents) -> str:
+    return f"Check citations: {_context(agents, 'citation_validator', state['research_content'])}\n\nBrief validation."
+
+def _citation_update(agents, results: str) -> ResearchState:
     return {
         "citation_results": results,
+        "citation_check": _parsed(agents, "citation_validator", results),
         "agent_messages": [{"agent": "citation_validator", "content": results}]
     }
 
-def editor_node(state: ResearchState, agents) -> ResearchState:
-    editor = agents["editor"]
-    prompt = f"""Refine: {state['research_content'][:500]}
+def citation_node(state: ResearchState, agents) -> ResearchState:
+    citation_analysis = get_tool_manager().validate_citations(state['research_content'])
+    results = agents["citation_validator"].invoke(_citation_prompt(state, agents))
+    return _citation_update(agents, results)
 
-Feedback: {state['review_feedback'][:200]}
+async def acitation_node(state: ResearchState, agents) -> ResearchState:
+    citation_analysis = get_tool_manager().validate_citations(state['research_content'])
+    results = await agents["citation_validator"].ainvoke(_citation_prompt(state, agents))
+    return _citation_update(agents, results)
+
+def _editor_prompt(state: ResearchState, agents) -> str:
+    return f"""Refine: {_context(agents, 'editor', state['research_content'])}
+
+Feedback: {_context(agents, 'editor', state['review_feedback'], FEEDBACK_BUDGET)}
 
 Produce improved version."""
-    
-    refined = editor.invoke(prompt)
-    
+
+def _section_prompt(state: ResearchState, agents, name: str, body: str) -> str:
+    return f"""Refine the {name.title()} section of research on: {state['topic']}
+
+{_context(agents, 'editor', body)}
+
+Feedback: {_context(agents, 'editor', state['review_feedback'], FEEDBACK_BUDGET)}
+
+Produce an improved version of this section only."""
+
+def _section_text(name: str, refined: str) -> str:
+    # Drop a heading the editor may have repeated back
+    return split_sections(refined).get(name) or refined.strip()
+
+def _editor_update(state: ResearchState, refined: str, sections: dict = None) -> ResearchState:
     return {
         "research_content": refined,
+        "sections": split_sections(refined) if sections is None else sections,
         "iteration": state["iteration"] + 1,
         "agent_messages": [{"agent": "editor", "content": refined}]
     }
 
+def _scores_locally(state: ResearchState) -> bool:
+    """Whether the editor scores its output for the local-score early exit"""
+    return get_run_config(state)["early_exit_margin"] is not None
+
+def _splice(state: ResearchState, targets, revised) -> ResearchState:
+    sections = dict(state["sections"])
+    for name, refined in zip(targets, revised):
+        sections[name] = _section_text(name, refined)
+    return _editor_update(state, join_sections(sections), sections)
+
+def editor_node(state: ResearchState, agents) -> ResearchState:
+    """Rewrite only the sections named in the feedback, or the whole document if none are"""
+    update = _edit(state, agents)
+    if _scores_locally(state):
+        update["local_score"] = _review_metrics(state, update["research_content"])["overall"]
+    return update
+
+def _edit(state: ResearchState, agents) -> ResearchState:
+    sections = state.get("sections") or {}
+    targets = sections_to_edit(state["review_feedback"], sections)
+    if not targets:
+        refined = agents["editor"].invoke(_editor_prompt(state, agents))
+        return _editor_update(state, refined)
+    
+    editor = agents["editor"]
+    with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+        # A context copy per call keeps metrics attributed to this node
+        futures = [
+            pool.submit(contextvars.copy_context().run, editor.invoke,
+                        _section_prompt(state, agents, name, sections[name]))
+            for name in targets
+        ]
+        revised = [future.result() for future in futures]
+    return _splice(state, targets, revised)
+
+async def aeditor_node(state: ResearchState, agents) -> ResearchState:
+    update = await _aedit(state, agents)
+    if _scores_locally(state):
+        update["local_score"] = (await _areview_metrics(state, update["research_content"]))["overall"]
+    return update
+
+async def _aedit(state: ResearchState, agents) -> ResearchState:
+    sections = state.get("sections") or {}
+    targets = sections_to_edit(state["review_feedback"], sections)
+    if not targets:
+        refined = await agents["editor"].ainvoke(_editor_prompt(state, agents))
+        return _editor_update(state, refined)
+    
+    revised = await asyncio.gather(*[
+        agents["editor"].ainvoke(_section_prompt(state, agents, name, sections[name]))
+        for name in targets
+    ])
+    return _splice(state, targets, revised)
+
 def finalize_node(state: ResearchState, agents) -> ResearchState:
     return {
         "final_document": state["research_content"]
     }
+
+async def afinalize_node(state: ResearchState, agents) -> ResearchState:
+    return finalize_node(state, agents)
@@ -0,0 +1,147 @@
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List
+
+from config.speed_settings import (
+    CHARS_PER_TOKEN, PROMPT_CHUNK_TOKENS, TOKEN_COUNT_CACHE_SIZE, FIT_CACHE_SIZE
+)
+from workflow.sections import PREAMBLE, split_sections
+
+try:
+    import tiktoken  # optional: exact counts for tiktoken-compatible vocabularies
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except ImportError:
+    _encoding = None
+
+_counts = OrderedDict()
+_counts_lock = threading.Lock()
+_splitters = {}
+_SEPARATORS = ["\n\n", "\n", ". ", " ", ""]
+
+def model_family(model) -> str:
+    """Tokenizer family of a chat model: gemini, llama or default"""
+    if model is None:
+        return "default"
+    name = f"{type(model).__name__} {getattr(model, 'model', '') or getattr(model, 'model_name', '')}".lower()
+    if "gemini" in name or "google" in name:
+        return "gemini"
+    if "llama" in name or "groq" in name or "mixtral" in name:
+        return "llama"
+    return "default"
+
+def _estimate(text: str, family: str) -> int:
+    if _encoding is not None and family != "gemini":
+        return len(_encoding.encode(text))
+    return max(math.ceil(len(text) / CHARS_PER_TOKEN.get(family, CHARS_PER_TOKEN["default"])),
+               len(text.split()))
+
+def count_tokens(text: str, model=None) -> int:
+    """Token count of text for the model's tokenizer, cached by text hash"""
+    return _count(text, model_family(model))
+
+def _count(text: str, family: str) -> int:
+    if not text:
+        return 0
+    key = (family, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest())
+    with _counts_lock:
+        if key in _counts:
+            _counts.move_to_end(key)
+            return _counts[key]
+    tokens = _estimate(text, family)
+    with _counts_lock:
+        _counts[key] = tokens
+        if len(_counts) > TOKEN_COUNT_CACHE_SIZE:
+            _counts.popitem(last=False)
+    return tokens
+
+def _chunks(text: str, family: str, size: int) -> List[str]:
+    """Paragraph/sentence-aligned chunks of at most size tokens"""
+    splitter = _splitters.get((family, size))
+    if splitter is None:
+        # Imported here: the splitter package is slow to import and rarely needed
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=size,
+            chunk_overlap=0,
+            length_function=lambda chunk: _count(chunk, family),
+            separators=_SEPARATORS,
+            keep_separator="end",
+            strip_whitespace=False
+        )
+        _splitters[(family, size)] = splitter
+    return splitter.split_text(text)
+
+def _head(text: str, family: str, tokens: int) -> str:
+    """Leading part of text with at least tokens tokens, cut where the splitter first splits text.
+    
+    Its chunks are text's chunks except the last, which may be shorter, so
+    taking up to tokens minus one chunk size gives the same chunks as text.
+    """
+    separator = next((s for s in _SEPARATORS[:-1] if s in text), None)
+    end = 0
+    while separator is not None:
+        end = text.find(separator, end)
+        if end < 0:
+            break
+        end += len(separator)
+        if _estimate(text[:end], family) >= tokens:
+            return text[:end]
+    return text
+
+def _take(chunks: List[str], budget: int, family: str) -> List[str]:
+    taken = []
+    for chunk in chunks:
+        tokens = _count(chunk, family)
+        if tokens > budget:
+            break
+        taken.append(chunk)
+        budget -= tokens
+    return taken
+
+def fit_text(text: str, budget: int, model=None) -> str:
+    """Shrink text to at most budget tokens without cutting sentences.
+    
+    Text that fits is returned unchanged. Otherwise the budget is shared
+    between sections (small sections are kept whole, the rest is split among
+    the larger ones) and each section keeps its leading chunks.
+    """
+    return _fit(text, budget, model_family(model))
+
+@lru_cache(maxsize=FIT_CACHE_SIZE)
+def _fit(text: str, budget: int, family: str) -> str:
+    if _count(text, family) <= budget:
+        return text
+    sections = split_sections(text) or {PREAMBLE: text}
+    
+    headings = {name: "" if name == PREAMBLE else f"## {name.title()}\n" for name in sections}
+    remaining = budget - sum(_count(heading, family) for heading in headings.values())
+    sizes = {name: _count(body, family) for name, body in sections.items()}
+    shares = {}
+    # Water-filling: sections under the fair share are kept whole
+    open_sections = sorted(sections, key=sizes.get)
+    while open_sections:
+        fair = max(remaining, 0) // len(open_sections)
+        name = open_sections[0]
+        if sizes[name] > fair:
+            for name in open_sections:
+                shares[name] = fair
+            break
+        shares[name] = sizes[name]
+        remaining -= sizes[name]
+        open_sections.pop(0)
+    
+    parts = []
+    for name, body in sections.items():
+        if sizes[name] <= shares[name]:
+            kept = body
+        else:
+            size = max(min(PROMPT_CHUNK_TOKENS, shares[name]), 1)
+            # Only the leading chunks are kept, so the rest of a long section isn't split
+            head = _head(body, family, shares[name] + 2 * size)
+            kept = "".join(_take(_chunks(head, family, size), shares[name], family)).strip()
+        if kept:
+            parts.append(headings[name] + kept)
+    return "\n\n".join(parts)
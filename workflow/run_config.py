@@ -0,0 +1,23 @@
+from typing import Dict
+from config import settings
+from config.speed_settings import EARLY_EXIT_MARGIN
+
+_DEFAULT = object()
+
+def make_run_config(max_iterations: int = None, convergence_threshold: float = None,
+                    early_exit_margin=_DEFAULT) -> Dict:
+    """Parameters of one research run, stored in its state as run_config.
+    
+    Unset values come from config.settings when the run starts; an
+    early_exit_margin of None turns the local-score early exit off.
+    """
+    return {
+        "max_iterations": settings.MAX_ITERATIONS if max_iterations is None else max_iterations,
+        "convergence_threshold": (settings.CONVERGENCE_THRESHOLD if convergence_threshold is None
+                                  else convergence_threshold),
+        "early_exit_margin": EARLY_EXIT_MARGIN if early_exit_margin is _DEFAULT else early_exit_margin
+    }
+
+def get_run_config(state) -> Dict:
+    """The run's config; runs checkpointed before run_config existed get the defaults"""
+    return {**make_run_config(), **(state.get("run_config") or {})}
@@ -1,39 +1,223 @@
+import asyncio
+import json
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List
 from workflow.graph import create_research_workflow
+from workflow.batch import LatencyStats, iter_topics
+from workflow.streaming import STREAM_TOKENS
+from workflow.checkpoints import get_run_store
+from workflow.run_config import make_run_config
 from agents.agent_factory import AgentFactory
+from config.speed_settings import MAX_CONCURRENCY, BATCH_CONCURRENCY, ENABLE_CHECKPOINTS, ENABLE_CASCADE
 
 class WorkflowRunner:
-    def __init__(self, model_distribution=None):
-        self.agents = AgentFactory.create_agents(model_distribution)
-        self.workflow = create_research_workflow(self.agents)
+    def __init__(self, model_distribution=None, agents=None, checkpoint: bool = ENABLE_CHECKPOINTS,
+                 temperature: float = None, run_config: Dict = None, cascade: bool = ENABLE_CASCADE):
+        """run_config overrides make_run_config() for every run started by this runner"""
+        if agents is None:
+            agents = AgentFactory.create_agents(model_distribution, temperature, cascade)
+        self.agents = agents
+        self.run_config = make_run_config(**(run_config or {}))
+        self.store = get_run_store() if checkpoint else None
+        self.workflow = create_research_workflow(
+            self.agents, checkpointer=self.store.saver if self.store else None
+        )
+        # The SQLite saver is sync-only; async and batch runs use an uncheckpointed graph
+        self.aworkflow = create_research_workflow(self.agents) if self.store else self.workflow
+        self.config = {"max_concurrency": MAX_CONCURRENCY}
     
-    def run(self, topic: str):
-        initial_state = {
+    def _state(self, topic: str, run_config: Dict = None) -> dict:
+        """Initial state; run_config overrides this runner's config for one run"""
+        return self._initial_state(topic, {**self.run_config, **run_config} if run_config else self.run_config)
+    
+    @staticmethod
+    def _initial_state(topic: str, run_config: Dict = None) -> dict:
+        return {
             "topic": topic,
             "research_content": "",
+            "sections": {},
+            "references": "",
             "review_feedback": "",
             "fact_check_results": "",
             "citation_results": "",
+            "review": {},
+            "fact_check": {},
+            "citation_check": {},
             "quality_score": 0.0,
+            "local_score": 0.0,
+            "run_config": run_config or make_run_config(),
             "iteration": 0,
             "agent_messages": [],
-            "final_document": ""
+            "final_document": "",
+            "metrics": []
         }
+    
+    def _run_config(self, run_id: str = None, tokens: bool = False) -> dict:
+        configurable = {}
+        if run_id and self.store:
+            configurable["thread_id"] = run_id
+        if tokens:
+            configurable[STREAM_TOKENS] = True
+        return {**self.config, "configurable": configurable}
+    
+    def _start(self, topic: str, run_id: str = None, owner: str = None) -> str:
+        run_id = run_id or uuid.uuid4().hex
+        if self.store:
+            self.store.start(run_id, topic, owner)
+        return run_id
+    
+    def _resuming(self, run_id: str):
+        if self.store is None:
+            raise RuntimeError("Checkpointing is disabled for this runner")
+        if self.store.get(run_id) is None:
+            raise KeyError(f"No resumable run with id {run_id}")
+        if not self.store.acquire(run_id):
+            raise RuntimeError(f"Run {run_id} is already running")
+        self.store.mark(run_id, "running")
+    
+    @contextmanager
+    def _tracking(self, run_id: str):
+        """Drop a finished run's checkpoints; record why an unfinished one stopped"""
+        if self.store is None:
+            yield
+            return
+        status, error = "stopped", None
+        try:
+            yield
+            status = "completed"
+        except Exception as e:
+            status, error = "failed", str(e)
+            raise
+        finally:
+            if status == "completed":
+                self.store.delete(run_id)
+            else:
+                self.store.mark(run_id, status, error)
+            self.store.release(run_id)
+    
+    def _stream(self, state, run_id: str, tokens: bool):
+        with self._tracking(run_id):
+            if not tokens:
+                for output in self.workflow.stream(state, self._run_config(run_id)):
+                    yield output
+                return
+            for mode, output in self.workflow.stream(state, self._run_config(run_id, tokens=True),
+                                                     stream_mode=["updates", "custom"]):
+                yield ("tokens" if mode == "custom" else mode), output
+    
+    def run(self, topic: str, run_id: str = None, run_config: Dict = None, owner: str = None):
+        run_id = self._start(topic, run_id, owner)
+        with self._tracking(run_id):
+            result = self.workflow.invoke(self._state(topic, run_config), self._run_config(run_id))
+        return result
+    
+    def stream(self, topic: str, tokens: bool = False, run_id: str = None, run_config: Dict = None,
+               owner: str = None):
+        """Yield {node: update} after each node.
         
-        result = self.workflow.invoke(initial_state)
+        With tokens=True, yield (kind, payload) pairs instead: ("tokens",
+        {"node", "agent", "text"}) for every chunk an agent produces and
+        ("updates", {node: update}) when a node completes. Pass run_id to
+        be able to resume() the run if it fails or is stopped, run_config
+        to override the runner's config for this run only, and owner (e.g.
+        a session id) to have list_runs(owner=...) show it to that owner only.
+        """
+        run_id = self._start(topic, run_id, owner)
+        yield from self._stream(self._state(topic, run_config), run_id, tokens)
+    
+    def resume(self, run_id: str):
+        """Continue a failed or stopped run from its last completed node"""
+        self._resuming(run_id)
+        with self._tracking(run_id):
+            result = self.workflow.invoke(None, self._run_config(run_id))
         return result
     
-    def stream(self, topic: str):
-        initial_state = {
-            "topic": topic,
-            "research_content": "",
-            "review_feedback": "",
-            "fact_check_results": "",
-            "citation_results": "",
-            "quality_score": 0.0,
-            "iteration": 0,
-            "agent_messages": [],
-            "final_document": ""
-        }
+    def stream_resume(self, run_id: str, tokens: bool = False):
+        self._resuming(run_id)
+        yield from self._stream(None, run_id, tokens)
+    
+    def list_runs(self, limit: int = 20, owner: str = None) -> List[Dict]:
+        """Unfinished runs that resume() can continue, most recent first; owner's runs only if given"""
+        if self.store is None:
+            return []
+        runs = []
+        for run in self.store.list_runs(limit, owner):
+            snapshot = self.workflow.get_state({"configurable": {"thread_id": run["run_id"]}})
+            if snapshot.next:
+                run["next"] = list(snapshot.next)
+                run["iteration"] = snapshot.values.get("iteration", 0)
+                runs.append(run)
+        return runs
+    
+    async def arun(self, topic: str, run_config: Dict = None):
+        result = await self.aworkflow.ainvoke(self._state(topic, run_config), self.config)
+        return result
+    
+    async def astream(self, topic: str, tokens: bool = False, run_config: Dict = None):
+        state = self._state(topic, run_config)
+        if not tokens:
+            async for output in self.aworkflow.astream(state, self.config):
+                yield output
+            return
+        async for mode, output in self.aworkflow.astream(state, self._run_config(tokens=True),
+                                                         stream_mode=["updates", "custom"]):
+            yield ("tokens" if mode == "custom" else mode), output
+    
+    def run_batch(self, topics, sink, concurrency: int = BATCH_CONCURRENCY) -> dict:
+        """Run many topics and write one JSONL record per topic as it finishes.
+        
+        topics is a file path or iterable accepted by iter_topics; sink is a
+        path or a writable text file. Returns throughput and latency stats.
+        """
+        return asyncio.run(self.arun_batch(topics, sink, concurrency))
+    
+    async def arun_batch(self, topics, sink, concurrency: int = BATCH_CONCURRENCY) -> dict:
+        out = open(sink, "w", encoding="utf-8") if isinstance(sink, str) else sink
+        stats = LatencyStats()
+        start_time = time.time()
+        
+        async def run_one(topic_id: str, topic: str):
+            topic_start = time.time()
+            record = {"id": topic_id, "topic": topic if isinstance(topic, str) else None}
+            try:
+                if isinstance(topic, Exception):  # an unreadable line from iter_topics
+                    raise topic
+                if not topic:
+                    raise ValueError("Record has no topic or title")
+                result = await self.arun(topic)
+                record.update({
+                    "final_document": result.get("final_document", ""),
+                    "quality_score": result.get("quality_score", 0.0),
+                    "agent_messages": result.get("agent_messages", []),
+                    "metrics": result.get("metrics", [])
+                })
+                failed = False
+            except Exception as e:
+                record["error"] = str(e)
+                failed = True
+            record["latency"] = round(time.time() - topic_start, 3)
+            stats.add(record["latency"], failed)
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            # Results live only in the sink; don't let agent memory grow with the batch
+            for agent in self.agents.values():
+                agent.clear_memory()
+        
+        # Pull the next topic only when a slot frees up so memory stays flat
+        pending = set()
+        try:
+            for topic_id, topic in iter_topics(topics):
+                if len(pending) >= concurrency:
+                    _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                pending.add(asyncio.create_task(run_one(topic_id, topic)))
+            if pending:
+                await asyncio.wait(pending)
+        finally:
+            for task in pending:
+                task.cancel()
+            if out is not sink:
+                out.close()
         
-        for output in self.workflow.stream(initial_state):
-            yield output
+        return stats.summary(time.time() - start_time)
@@ -0,0 +1,65 @@
+import re
+from typing import Dict, List
+from config.settings import RESEARCH_SECTIONS
+
+PREAMBLE = "preamble"  # text before the first recognised heading
+
+def _heading_section(line: str, names: List[str]):
+    """Section name a heading line introduces, or None for body text"""
+    stripped = line.strip()
+    if not stripped or len(stripped) > 80:
+        return None
+    is_heading = (
+        stripped.startswith("#")
+        or (stripped.startswith("**") and stripped.endswith("**"))
+        or (stripped.endswith(":") and len(stripped.split()) <= 6)
+    )
+    if not is_heading:
+        return None
+    lowered = stripped.lower()
+    for name in names:
+        if re.search(rf"\b{re.escape(name.rstrip('s'))}", lowered):
+            return name
+    return None
+
+def split_sections(text: str, names: List[str] = RESEARCH_SECTIONS) -> Dict[str, str]:
+    """Split text into {section: body} using its headings, in document order.
+    
+    Returns an empty dict when no heading matches a known section, so callers
+    can fall back to treating the text as a single document.
+    """
+    sections = {}
+    current = PREAMBLE
+    lines = {PREAMBLE: []}
+    for line in text.splitlines():
+        name = _heading_section(line, names)
+        if name is not None:
+            current = name
+            lines.setdefault(name, [])
+            continue
+        lines[current].append(line)
+    
+    if len(lines) == 1:
+        return {}
+    for name, body in lines.items():
+        body = "\n".join(body).strip()
+        if body or name != PREAMBLE:
+            sections[name] = body
+    return sections
+
+def join_sections(sections: Dict[str, str]) -> str:
+    parts = []
+    for name, body in sections.items():
+        if name == PREAMBLE:
+            parts.append(body)
+        else:
+            parts.append(f"## {name.title()}\n{body}")
+    return "\n\n".join(parts)
+
+def sections_to_edit(feedback: str, sections: Dict[str, str]) -> List[str]:
+    """Sections the feedback names explicitly, in document order"""
+    feedback_lower = feedback.lower()
+    return [
+        name for name in sections
+        if name != PREAMBLE and re.search(rf"\b{re.escape(name.rstrip('s'))}", feedback_lower)
+    ]
@@ -1,13 +1,38 @@
-from typing import TypedDict, List, Dict, Annotated
+from typing import TypedDict, List, Dict, Annotated, Optional
 import operator
 
+# Parsed replies of the JSON agents (see agents.structured); {} until the agent has run.
+# A score the reply didn't give is None.
+class ReviewResult(TypedDict, total=False):
+    score: Optional[float]
+    issues: List[str]
+    suggestions: List[str]
+
+class FactCheckResult(TypedDict, total=False):
+    confidence: Optional[float]
+    verified: List[str]
+    flagged: List[str]
+
+class CitationResult(TypedDict, total=False):
+    score: Optional[float]
+    missing_citations: List[str]
+    invalid_formats: List[str]
+
 class ResearchState(TypedDict):
     topic: str
     research_content: str
+    sections: Dict[str, str]  # research_content split by RESEARCH_SECTIONS
+    references: str  # local corpus passages given to the researcher
     review_feedback: str
     fact_check_results: str
     citation_results: str
+    review: ReviewResult
+    fact_check: FactCheckResult
+    citation_check: CitationResult
     quality_score: float
+    local_score: float  # QualityScorer overall of research_content after the last edit
+    run_config: Dict  # per-run parameters, see workflow.run_config
     iteration: int
     agent_messages: Annotated[List[Dict], operator.add]
     final_document: str
+    metrics: Annotated[List[Dict], operator.add]
@@ -0,0 +1,40 @@
+from functools import wraps
+
+from langgraph.config import get_config, get_stream_writer
+from agents.base_agent import set_token_listener, reset_token_listener
+
+STREAM_TOKENS = "stream_tokens"  # configurable flag set by WorkflowRunner.stream(tokens=True)
+
+def _listener(name: str):
+    """Token listener for the running node, or None when nobody is streaming tokens"""
+    if not get_config().get("configurable", {}).get(STREAM_TOKENS):
+        return None
+    writer = get_stream_writer()
+    return lambda agent, text: writer({"node": name, "agent": agent, "text": text})
+
+def token_streaming(name: str, func):
+    """Let agent calls inside the node emit their chunks on the custom stream"""
+    @wraps(func)
+    def wrapper(state, *args, **kwargs):
+        listener = _listener(name)
+        if listener is None:
+            return func(state, *args, **kwargs)
+        token = set_token_listener(listener)
+        try:
+            return func(state, *args, **kwargs)
+        finally:
+            reset_token_listener(token)
+    return wrapper
+
+def atoken_streaming(name: str, afunc):
+    @wraps(afunc)
+    async def wrapper(state, *args, **kwargs):
+        listener = _listener(name)
+        if listener is None:
+            return await afunc(state, *args, **kwargs)
+        token = set_token_listener(listener)
+        try:
+            return await afunc(state, *args, **kwargs)
+        finally:
+            reset_token_listener(token)
+    return wrapper
@@ -6,11 +6,15 @@ def get_mermaid_diagram():
 graph TD
     START([START]) --> Research[🔍 Research Node<br/>Researcher Agent]
     Research --> Review[📝 Review Node<br/>Reviewer Agent]
-    Review --> FactCheck[✅ Fact Check Node<br/>Fact Checker Agent]
-    FactCheck --> Citation[📚 Citation Node<br/>Citation Validator]
-    Citation --> Editor[✏️ Editor Node<br/>Editor Agent]
+    Research --> FactCheck[✅ Fact Check Node<br/>Fact Checker Agent]
+    Research --> Citation[📚 Citation Node<br/>Citation Validator]
+    Review --> Editor[✏️ Editor Node<br/>Editor Agent]
+    FactCheck --> Editor
+    Citation --> Editor
     Editor --> Decision{Quality Check}
     Decision -->|Score < Threshold<br/>OR<br/>Iteration < Max| Review
+    Decision -->|Score < Threshold<br/>OR<br/>Iteration < Max| FactCheck
+    Decision -->|Score < Threshold<br/>OR<br/>Iteration < Max| Citation
     Decision -->|Score ≥ Threshold<br/>AND<br/>Iteration ≥ Max| Finalize[🎯 Finalize Node]
     Finalize --> END([END])
     
@@ -41,21 +45,15 @@ def get_ascii_diagram():
                     │  Researcher Agent  │
                     └─────────┬──────────┘
                               │
-                    ┌─────────▼──────────┐
-                    │  📝 REVIEW NODE    │
-                    │  Reviewer Agent    │
-                    └─────────┬──────────┘
-                              │
-                    ┌─────────▼──────────┐
-                    │  ✅ FACT CHECK     │
-                    │  Fact Checker      │
-                    └─────────┬──────────┘
-                              │
-                    ┌─────────▼──────────┐
-                    │  📚 CITATION NODE  │
-                    │  Citation Validator│
-                    └─────────┬──────────┘
-                              │
+          ┌───────────────────┼───────────────────┐
+          │                   │                   │
+┌─────────▼────────┐ ┌────────▼─────────┐ ┌───────▼──────────┐
+│  📝 REVIEW NODE  │ │  ✅ FACT CHECK   │ │ 📚 CITATION NODE │
+│  Reviewer Agent  │ │  Fact Checker    │ │Citation Validator│
+└─────────┬────────┘ └────────┬─────────┘ └───────┬──────────┘
+          │                   │                   │
+          └───────────────────┼───────────────────┘
+                              │  (join)
                     ┌─────────▼──────────┐
                     │  ✏️ EDITOR NODE    │
                     │  Editor Agent      │
@@ -72,7 +70,7 @@ def get_ascii_diagram():
             └──────┬──────┘      └─────┬──────┘
                    │                   │
                    │                   │
-                   └──────► REVIEW ◄───┘
+                   └─► REVIEW STAGE ◄──┘
                               │
                     ┌─────────▼──────────┐
                     │  🎯 FINALIZE NODE  │
@@ -83,7 +81,8 @@ def get_ascii_diagram():
                          └─────────┘
 
 ╔════════════════════════════════════════════════════════════════╗
-║  Iterative Loop: Editor → Review (until convergence)          ║
+║  Parallel Stage: Review ∥ Fact Check ∥ Citation → Editor      ║
+║  Iterative Loop: Editor → Review Stage (until convergence)    ║
 ║  Convergence: quality_score ≥ threshold OR iteration ≥ max    ║
 ╚════════════════════════════════════════════════════════════════╝
 """